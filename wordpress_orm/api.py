@@ -1,12 +1,21 @@
 
 import logging
+import functools
+import threading
+import concurrent.futures
 from contextlib import contextmanager
 
 import requests
 
 from .entities import post, user, media, category, comment, page, tag
+from .entities.wordpress_entity import MAX_PER_PAGE, WPEntityProxy
 from . import exc #, logger
-from .cache import WPORMCache, WPORMCacheObjectNotFoundError
+from .cache import WPORMCache, WPORMCacheObjectNotFoundError, WPORMValuePool, WPORMResponseCache
+from .query import QuerySet
+from .local import WPORMLocalIndex
+from .sync import WPORMSync
+from .tuning import WPORMPageTuner
+from . import explain as explaining
 
 from .entities import Category
 from .entities import Comment
@@ -24,6 +33,18 @@ from .entities import User
 #package_name = __name__.split(".")[0]
 logger = logging.getLogger(__name__.split(".")[0]) # package name
 
+# key = entity class name, value = name of the API factory method for its request
+request_factory_names = {
+	"Category" : "CategoryRequest",
+	"Comment"  : "CommentRequest",
+	"Media"    : "MediaRequest",
+	"Page"     : "PageRequest",
+	"Post"     : "PostRequest",
+	"Tag"      : "TagRequest",
+	"User"     : "UserRequest"
+}
+
+
 @contextmanager
 def wp_session(api=None):
 	api.session = requests.Session()
@@ -49,6 +70,57 @@ class API:
 
 		self.wordpress_object_cache = WPORMCache() # dict() # key = class name, value = object
 
+		# pages of query results read through paginated collections (e.g. 'user.posts')
+		self.response_cache = WPORMResponseCache()
+
+		# maximum number of requests made in parallel (e.g. by 'prefetch'); 1 = no parallel requests
+		self.max_workers = 8
+
+		# If True, bulk reads ('get_all', 'get_all_by_date') without 'per_page' set choose the page size
+		# and the number of parallel requests for each endpoint from the throughput measured by 'page_tuner'.
+		self.adaptive_paging = False
+		self.page_tuner = WPORMPageTuner(self)
+
+		# active 'explain' plans and 'request_budget' budgets of each thread ('scope.recorders', see 'recording'),
+		# each is given every request made in the thread (and in the threads it starts with 'run_concurrently')
+		self._scope = threading.local()
+
+		# entities being fetched by 'fetch_by_ids', so that concurrent lookups of the same entity make one request
+		# key = (class name, WordPress ID), value = concurrent.futures.Future
+		self._in_flight = dict()
+		self._in_flight_lock = threading.Lock()
+
+		# Count queries (e.g. 'get(count=True)') use HEAD requests, which download no body at all;
+		# set to True if the site (and any proxy or cache in front of it) answers HEAD requests.
+		self.head_requests_for_counts = False
+
+		# IDs of entities found by slug for request filters (e.g. 'categories=["news"]'),
+		# key = (class name, slug), value = WordPress ID (str); kept when the entity cache is cleared,
+		# updated by 'sync' (see 'update_slug_ids')
+		self.slug_ids = dict()
+
+		# complete snapshots of posts or pages (see 'preload'); queries they can answer make no requests
+		self.local_index = WPORMLocalIndex()
+		self.local_queries = True
+
+		# If True, 'search' answered from a snapshot matches words by prefix (e.g. "chee" finds "cheese") and
+		# orderby="relevance" ranks the results with BM25; otherwise local results are those WordPress returns.
+		self.ranked_search = False
+
+		# IDs and modification dates seen by 'sync'
+		self.synchronizer = WPORMSync(self)
+
+		# Relation properties (e.g. 'post.author') return proxies for entities not in the cache, fetched only when used.
+		self.lazy_relations = True
+
+		# Repeated field values (e.g. 'status') are shared between entities; set to None to disable (see 'WPORMValuePool').
+		self.value_pool = WPORMValuePool()
+
+		# Rendered HTML fields longer than 'lazy_html_max_size' characters are not kept in cached
+		# entities; they are fetched again only if accessed. 'None' keeps every field.
+		self.lazy_html_fields = ["content", "excerpt", "title"]
+		self.lazy_html_max_size = None
+
 		#
 		# individual caches
 		# each class has two key that can be accessed (i.e. appears twice in dictionary)
@@ -82,6 +154,104 @@ class API:
 		else:
 			raise Exception("Unknown or unsupported authentication method.")
 
+	def http_request(self, method, url, params=None, data=None, stream=False):
+		'''
+		Sends a request to WordPress and returns the response ('requests.Response'); HTTP errors are not raised.
+
+		Every request the package makes goes through this method, in the session if one is open (see 'Session'),
+		and is reported to the active 'explain' and 'request_budget' scopes first.
+
+		method : "GET", "HEAD" or "POST"
+		stream : BOOL, if True, the response body is not downloaded until it is read
+		'''
+		self.record_request(method, url, params)
+		session = requests if self.session is None else self.session
+		if method == "HEAD":
+			return session.head(url=url, params=params, auth=self.auth())
+		elif method == "POST":
+			return session.post(url=url, data=data, params=params, auth=self.auth())
+		return session.get(url=url, params=params, auth=self.auth(), stream=stream)
+
+	def record_request(self, method, url, params=None, source=explaining.NETWORK):
+		'''
+		Reports a request to the active 'explain' and 'request_budget' scopes (nothing is done if there are none).
+
+		source : explain.NETWORK for a request sent to WordPress, otherwise the cache that answered it (e.g. explain.RESPONSE_CACHE)
+		'''
+		recorders = self.active_recorders()
+		if len(recorders) == 0:
+			return
+		record = explaining.RequestRecord(method, url, dict(params or dict()), source, explaining.trigger())
+		for recorder in recorders:
+			recorder.record(record) # a budget raises 'RequestBudgetExceeded' here, before the request is sent
+
+	def active_recorders(self):
+		'''
+		Returns the recorders (see 'recording') active in the current thread, innermost last.
+		'''
+		return getattr(self._scope, "recorders", ())
+
+	@contextmanager
+	def recording(self, recorder):
+		'''
+		Context manager that reports every request made in the block to the recorder (an object with a 'record(record)' method).
+
+		Only the requests of the current thread are reported, and those of the threads it starts with 'run_concurrently'
+		while the block runs; requests made at the same time by other threads (e.g. serving other web requests) are not.
+		'''
+		previous = self.active_recorders()
+		self._scope.recorders = previous + (recorder,)
+		try:
+			yield recorder
+		finally:
+			self._scope.recorders = previous
+
+	def _call_in_scope(self, recorders, trigger, function):
+		'''
+		Calls the function in a thread started by 'run_concurrently', with the recorders and trigger (see 'explain.trigger') of the thread that started it.
+		'''
+		previous = self.active_recorders()
+		self._scope.recorders = recorders
+		try:
+			return explaining.call_with_trigger(trigger, function)
+		finally:
+			self._scope.recorders = previous
+
+	def explain(self, function=None):
+		'''
+		Records the requests made by a block of code, to find where (and why) requests are made.
+
+		Returns the 'QueryPlan' of the requests made by calling 'function' (without arguments; its return
+		value is in 'plan.result'), or, if no function is given, a context manager yielding the plan:
+
+			with api.explain() as plan:
+				titles = [(post.s.title, post.author.s.name) for post in api.posts[0:20]]
+			print(plan)                # one line per request
+			print(plan.triggers())     # e.g. {None: 1, 'Post.author': 1, 'User.s.name': 1}
+
+		Each record holds the method, URL and parameters of the request, its source ('explain.NETWORK'
+		if it was sent to WordPress, otherwise the cache that answered it), and the entity property whose
+		use led to it (e.g. "Post.author"). Requests made in other threads are not included, except those started by the block with 'run_concurrently'.
+		'''
+		plan = explaining.QueryPlan()
+		if function is None:
+			return self.recording(plan)
+		with self.recording(plan):
+			plan.result = function()
+		return plan
+
+	def request_budget(self, limit, raise_error=True):
+		'''
+		Returns a context manager that limits the number of requests sent to WordPress in the block.
+
+		The request that would exceed the limit raises 'exc.RequestBudgetExceeded' instead of being sent,
+		or, if 'raise_error' is False, is sent and a warning is logged (once). Answers from the caches
+		don't count. The context manager yields the 'RequestBudget', 'budget.used' is the number of requests sent.
+
+		limit : largest number of requests allowed
+		'''
+		return self.recording(explaining.RequestBudget(limit, raise_error=raise_error))
+
 	@contextmanager
 	def Session(self):
 		'''
@@ -99,6 +269,385 @@ class API:
 
 		self.session = old_session			# restore original session (if there was one)
 
+	def request_for_class(self, class_object):
+		'''
+		Returns a new request object (e.g. 'PostRequest') that fetches entities of the given class (or a custom subclass of one).
+		'''
+		for cls in class_object.__mro__:
+			if cls.__name__ in request_factory_names:
+				return getattr(self, request_factory_names[cls.__name__])()
+		raise ValueError("No request type is known for the class '{0}'.".format(class_object.__name__))
+
+	def fetch_by_ids(self, class_object, ids):
+		'''
+		Returns a dictionary (key = WordPress ID as int, value = entity) of the entities of the given class with the provided IDs.
+		
+		Entities found in the cache are used as they are. All others are fetched together with
+		'include=id1,id2,...' requests of up to 100 IDs each (instead of one request per entity),
+		run in parallel, and are added to the cache. IDs not found in WordPress are absent from the result.
+		
+		class_object : the entity class, e.g. 'Category'
+		ids          : list of WordPress IDs (int or str)
+		'''
+		return self._fetch_by_keys(class_object, [int(wpid) for wpid in ids], "id")
+
+	def fetch_by_slugs(self, class_object, slugs):
+		'''
+		Returns a dictionary (key = slug, value = entity) of the entities of the given class with the provided slugs.
+		
+		As 'fetch_by_ids', but entities not in the cache are fetched with 'slug=slug1,slug2,...' requests.
+		
+		class_object : the entity class, e.g. 'Tag'
+		slugs        : list of slugs
+		'''
+		return self._fetch_by_keys(class_object, [str(slug) for slug in slugs], "slug")
+
+	def ids_for_slugs(self, class_object, slugs):
+		'''
+		Returns a dictionary (key = slug, value = WordPress ID as str) of the entities of the given class with the provided slugs.
+
+		Slugs seen before are answered from 'slug_ids'; the others are fetched together (see 'fetch_by_slugs').
+		Slugs that match no entity are not in the returned dictionary.
+		'''
+		ids = dict()
+		missing = list()
+		for slug in slugs:
+			try:
+				ids[slug] = self.slug_ids[(class_object.__name__, slug)]
+			except KeyError:
+				missing.append(slug)
+		if len(missing) > 0:
+			for slug, entity in self.fetch_by_slugs(class_object, missing).items():
+				ids[slug] = self.slug_ids[(class_object.__name__, slug)] = str(entity.s.id)
+		return ids
+
+	def update_slug_ids(self, class_object, changed=None, deleted=None):
+		'''
+		Updates the IDs found by slug ('slug_ids') of the given class after entities were read again or deleted.
+
+		changed : list of entities read from the site; the old slugs of those found by slug are replaced by the current ones
+		deleted : list of WordPress IDs of deleted entities
+		'''
+		changed = {str(entity.s.id):entity for entity in changed or list()}
+		deleted = set(str(wpid) for wpid in deleted or list())
+		name = class_object.__name__
+		for key, wpid in list(self.slug_ids.items()):
+			if key[0] != name or (wpid not in changed and wpid not in deleted):
+				continue
+			del self.slug_ids[key]
+			slug = getattr(changed[wpid].s, "slug", None) if wpid in changed else None
+			if slug is not None:
+				self.slug_ids[(name, slug)] = wpid
+
+	def _fetch_by_keys(self, class_object, keys, field):
+		'''
+		Implementation of 'fetch_by_ids' (field = "id") and 'fetch_by_slugs' (field = "slug").
+		'''
+		found = dict()
+		missing = list()
+		for key in keys:
+			if key in found or key in missing:
+				continue
+			try:
+				found[key] = self.wordpress_object_cache.get(class_name=class_object.__name__, key=key)
+			except WPORMCacheObjectNotFoundError:
+				missing.append(key)
+		if len(found) > 0 and len(self.active_recorders()) > 0:
+			self.record_request("GET", self.request_for_class(class_object).url, {"include" if field == "id" else "slug":",".join(str(key) for key in found)},
+								source=explaining.ENTITY_CACHE)
+
+		# Entities another thread is already fetching are waited for rather than requested again ("single-flight").
+		owned = dict()   # key = ID or slug, value = Future this call resolves
+		waiting = dict() # key = ID or slug, value = Future resolved by another thread
+		with self._in_flight_lock:
+			for key in missing:
+				flight = (class_object.__name__, field, key)
+				if flight in self._in_flight:
+					waiting[key] = self._in_flight[flight]
+					continue
+				try:
+					# may have been added since the check above
+					found[key] = self.wordpress_object_cache.get(class_name=class_object.__name__, key=key)
+				except WPORMCacheObjectNotFoundError:
+					owned[key] = self._in_flight[flight] = concurrent.futures.Future()
+
+		def fetch_chunk(chunk):
+			request = self.request_for_class(class_object)
+			if field == "id":
+				request.include = chunk
+			else:
+				request.slug = ",".join(chunk)
+			request.per_page = MAX_PER_PAGE
+			# only embed the related objects that will be attached to the entities
+			return request.get(class_object=class_object, embed=list(class_object.embedded_relations) or False) or list()
+
+		to_fetch = list(owned.keys())
+		chunks = [to_fetch[start:start + MAX_PER_PAGE] for start in range(0, len(to_fetch), MAX_PER_PAGE)]
+		try:
+			for entities in self.run_concurrently([functools.partial(fetch_chunk, chunk) for chunk in chunks]):
+				for entity in entities:
+					found[getattr(entity.s, field)] = entity
+		except Exception as e:
+			for future in owned.values():
+				future.set_exception(e)
+			raise
+		finally:
+			with self._in_flight_lock:
+				for key in owned:
+					self._in_flight.pop((class_object.__name__, field, key), None)
+		for key, future in owned.items():
+			future.set_result(found.get(key, None))
+
+		for key, future in waiting.items():
+			entity = future.result()
+			if entity is not None:
+				found[key] = entity
+
+		if len(missing) > 0:
+			logger.debug("Fetched {0} of {1} {2} entities not in the cache.".format(len([x for x in missing if x in found]),
+																				   len(missing), class_object.__name__))
+		return found
+
+	def query(self, class_object):
+		'''
+		Returns a query of all entities of the given class (class: 'QuerySet'), e.g. 'api.query(Media).filter(media_type="image")'.
+		'''
+		return QuerySet(self, class_object)
+
+	def lookup(self, class_object, ids=None, slugs=None):
+		'''
+		Returns a list of the entities of the given class with the provided IDs or slugs, in the order requested.
+		
+		Cached entities are used first; the rest are fetched with requests of up to 100 IDs (or slugs)
+		each, run in parallel (see 'fetch_by_ids'). Entities not found in WordPress are left out.
+		
+		class_object : the entity class, e.g. 'Post'
+		ids          : list of WordPress IDs
+		slugs        : list of slugs
+		'''
+		if (ids is None) == (slugs is None):
+			raise Exception("Exactly one of 'ids' or 'slugs' must be specified.")
+		if ids is not None:
+			keys = [int(wpid) for wpid in ids]
+			found = self.fetch_by_ids(class_object, keys)
+		else:
+			keys = [str(slug) for slug in slugs]
+			found = self.fetch_by_slugs(class_object, keys)
+		not_found = [key for key in keys if key not in found]
+		if len(not_found) > 0:
+			logger.debug("{0} entities not found: {1}".format(class_object.__name__, not_found))
+		return [found[key] for key in keys if key in found]
+
+	def related(self, entity, relation):
+		'''
+		Returns the entity (or list of entities) related to the given entity, e.g. the author of a post.
+		
+		This is the resolver behind the relation properties (e.g. 'post.author', 'page.featured_media',
+		'media.post'). The related object already attached to the entity is returned if present. Otherwise
+		the cache is checked, and any entities not cached are fetched with 'fetch_by_ids' (all IDs of a
+		list relation in one request, and only once when requested from several threads at the same time).
+		The result is attached to the entity. Returns None if the entity has no related object (ID 0).
+		
+		If 'lazy_relations' is True, entities not in the cache are not fetched right away: a proxy
+		('WPEntityProxy') holding the ID is returned instead, which fetches the entity only when a
+		field other than the ID is accessed.
+		
+		entity   : the entity, e.g. a 'Post'
+		relation : name of the relation, any of those in the 'relations' dictionary of the entity class
+		'''
+		field, related_class, attribute = self._relation(entity, relation)
+		value = getattr(entity, attribute, None)
+		if value is not None:
+			return value
+
+		ids = getattr(entity.s, field)
+		if ids is None or (not isinstance(ids, list) and int(ids) == 0):
+			return None # WordPress uses 0 for "none"
+
+		if self.lazy_relations:
+			# return proxies for entities not in the cache, fetched (together) only when needed
+			related_list = list()
+			missing = list()
+			for wpid in (ids if isinstance(ids, list) else [ids]):
+				try:
+					related_list.append(self.wordpress_object_cache.get(class_name=related_class.__name__, key=wpid))
+				except WPORMCacheObjectNotFoundError:
+					related_list.append(int(wpid))
+					missing.append(int(wpid))
+			if len(missing) > 0:
+				related_list = [WPEntityProxy(self, related_class, x, batch=missing) if isinstance(x, int) else x for x in related_list]
+				return related_list if isinstance(ids, list) else related_list[0] # not attached, so 'prefetch' still fetches them
+
+		if isinstance(ids, list):
+			found = self.fetch_by_ids(related_class, ids)
+			value = list()
+			for wpid in ids:
+				if int(wpid) in found:
+					value.append(found[int(wpid)])
+				else:
+					logger.debug("Expected to find {0} ID={1} from {2} (ID={3}), but none found.".format(related_class.__name__, wpid,
+																									  type(entity).__name__, entity.s.id))
+		else:
+			value = self.fetch_by_ids(related_class, [ids]).get(int(ids), None)
+
+		setattr(entity, attribute, value)
+		return value
+
+	def counts(self, queries):
+		'''
+		Returns the number of entities matching each of several queries; the counts are requested in parallel.
+		
+		Each count is a minimal request that downloads no entity data (see 'get(count=True)').
+		
+		queries : dictionary, key = any name, value = 'QuerySet' (e.g. 'api.posts.filter(status="draft")') or an unused request object (e.g. 'PostRequest')
+		
+		Returns a dictionary with the same keys, value = number of entities.
+		'''
+		def count(query):
+			if isinstance(query, QuerySet):
+				return query.count()
+			return query.get(count=True)
+		names = list(queries.keys())
+		results = self.run_concurrently([functools.partial(count, queries[name]) for name in names])
+		return dict(zip(names, results))
+
+	def preload(self, class_object, status=None):
+		'''
+		Reads every entity of the given class and keeps them as a complete snapshot (see 'local_index').
+
+		While the snapshot is held, requests for the class whose filters can be evaluated locally
+		(e.g. 'categories', 'tags', 'author', 'after', 'before', 'search', 'orderby', with any page)
+		are answered from it without contacting WordPress; other requests are sent as usual.
+		The snapshot is not updated when the site changes; call 'preload' again (or
+		'local_index.discard(class_object)') to refresh it. Returns the list of entities.
+
+		class_object : the entity class, 'Post' or 'Page'
+		status       : list of statuses to read (default: ["publish"]); other statuses require authentication
+		'''
+		statuses = status or ["publish"]
+		self.local_index.discard(class_object) # read from WordPress, not the previous snapshot
+		request = self.request_for_class(class_object)
+		for s in statuses:
+			request.status = s
+		entities = request.get_all(class_object=class_object, embed=list(class_object.embedded_relations) or False)
+		self.local_index.set(class_object, entities, statuses=statuses)
+		logger.debug("Preloaded {0} {1} entities.".format(len(entities), class_object.__name__))
+		return entities
+
+	def sync(self, classes, full=False):
+		'''
+		Brings the entity cache up to date with the site for the given classes, e.g. 'api.sync([Post, Page, Media, Category, Tag, User])'.
+
+		The first call reads every entity of each class (the classes in parallel). Later calls only read
+		entities modified since the previous call (using 'modified_after'; categories, tags and users
+		have no modification date and are read in full) and drop deleted entities from the cache,
+		found by comparing the IDs on the site (read with '_fields=id') with those seen before.
+		Cached entities are updated in place. Snapshots of posts and pages (see 'preload') are
+		created by the first call and kept up to date.
+
+		Returns a dictionary, key = class name, value = {"changed":list of entities read, "deleted":list of IDs of deleted entities}.
+
+		classes : list of entity classes
+		full    : BOOL, if True, read every entity again
+		'''
+		return self.synchronizer.run(classes, full=full)
+
+	def run_concurrently(self, functions, max_workers=None):
+		'''
+		Calls each of the functions (which take no arguments) and returns a list of their results, in the same order.
+		
+		The calls are made in parallel threads, up to 'max_workers' at a time (default: 'api.max_workers').
+		'''
+		functions = list(functions)
+		max_workers = max_workers or self.max_workers
+		if len(functions) < 2 or max_workers < 2:
+			return [f() for f in functions]
+		recorders = self.active_recorders()
+		if len(recorders) > 0:
+			# requests made in the threads are recorded by the scopes of this thread, and attributed
+			# to the entity property that started them (see 'explain')
+			functions = [functools.partial(self._call_in_scope, recorders, explaining.trigger(), f) for f in functions]
+		with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(functions))) as executor:
+			futures = [executor.submit(f) for f in functions]
+			return [future.result() for future in futures]
+
+	def prefetch(self, entities, *relations):
+		'''
+		Fetches the related entities of every entity in a list at once, avoiding one request per entity (the "N+1" problem).
+		
+		The distinct IDs of each relation are collected across the whole list and fetched with
+		'include=' requests of up to 100 IDs, in parallel. The results are attached to the
+		entities (e.g. 'post.author' then makes no further request). Relations already loaded
+		on an entity are left alone.
+		
+		entities  : list of entities, e.g. posts returned from 'PostRequest.get()'
+		relations : names of the relations to fetch, any of those in the 'relations' dictionary
+		            of the entity class (e.g. "author", "featured_media", "categories", "tags"),
+		            or "comments" for posts
+		
+		Example: api.prefetch(posts, "author", "featured_media", "categories", "tags", "comments")
+		'''
+		entities = [e for e in entities if e is not None]
+
+		# relation proxies (e.g. 'comment.post', see 'related') are replaced by their entities, fetched together for each class
+		proxy_ids = dict()
+		for entity in entities:
+			if isinstance(entity, WPEntityProxy) and entity._entity is None:
+				proxy_ids.setdefault(entity.__class__, list()).append(entity.s.id)
+		self.run_concurrently([functools.partial(self.fetch_by_ids, class_object, ids) for class_object, ids in proxy_ids.items()])
+		entities = [e.resolve() if isinstance(e, WPEntityProxy) else e for e in entities]
+
+		if "comments" in relations:
+			for entity in entities:
+				if not hasattr(entity, "_comments"):
+					raise ValueError("The relation 'comments' can't be prefetched for '{0}' objects.".format(entity.__class__.__name__))
+
+		# collect the IDs to fetch for each related class
+		# key = related class, value = list of IDs
+		ids_by_class = dict()
+		for relation in relations:
+			if relation == "comments":
+				continue
+			for entity in entities:
+				field, related_class, attribute = self._relation(entity, relation)
+				if getattr(entity, attribute, None) is not None:
+					continue # already loaded
+				ids = getattr(entity.s, field)
+				if not isinstance(ids, list):
+					ids = [ids]
+				ids_by_class.setdefault(related_class, list()).extend([i for i in ids if i]) # 0 = none
+
+		tasks = [functools.partial(self.fetch_by_ids, related_class, ids) for related_class, ids in ids_by_class.items()]
+		if "comments" in relations:
+			# attaches the comments to the posts
+			tasks.append(functools.partial(self.CommentRequest().get_for_posts, [e for e in entities if e._comments is None]))
+		results = self.run_concurrently(tasks)
+
+		# attach the related entities
+		found_by_class = dict(zip(ids_by_class.keys(), results))
+		for relation in relations:
+			if relation == "comments":
+				continue
+			for entity in entities:
+				field, related_class, attribute = self._relation(entity, relation)
+				if getattr(entity, attribute, None) is not None:
+					continue
+				found = found_by_class.get(related_class, dict())
+				ids = getattr(entity.s, field)
+				if isinstance(ids, list):
+					setattr(entity, attribute, [found[int(i)] for i in ids if int(i) in found])
+				elif ids:
+					setattr(entity, attribute, found.get(int(ids), None))
+
+	def _relation(self, entity, relation):
+		'''
+		Returns the (schema field, related class, attribute) description of a relation of the entity's class.
+		'''
+		try:
+			return entity.__class__.relations[relation] # '__class__' is also the entity's class for a 'WPEntityProxy'
+		except (AttributeError, KeyError):
+			raise ValueError("The relation '{0}' is not defined for '{1}' objects.".format(relation, entity.__class__.__name__))
+
 	@property
 	def base_url(self):
 		return self._base_url
@@ -155,16 +704,29 @@ class API:
 			# more than one found
 			assert False, "Should not get here!"
 
+	@property
+	def posts(self):
+		'''
+		A query of all Post objects (class: 'QuerySet'), e.g. 'api.posts.filter(...)', or 'api.posts(ids=[...])' to get several by ID or slug.
+		'''
+		return QuerySet(self, Post)
+
 	def MediaRequest(self, **kwargs):
 		''' Factory method that returns a new MediaRequest attached to this API. '''
 		return media.MediaRequest(api=kwargs.pop('api', self), **kwargs)
 
-	def media(self, id=None, slug=None):
+	def media(self, id=None, slug=None, ids=None, slugs=None):
 		'''
 		Returns a Media object from the WordPress API with the provided ID.
 
-		id : WordPress ID
+		id    : WordPress ID
+		ids   : list of WordPress IDs, returns a list of Media objects in the order given (see 'lookup')
+		slugs : list of slugs, returns a list of Media objects in the order given
 		'''
+		if ids is not None or slugs is not None:
+			if id is not None or slug is not None:
+				raise Exception("Specify one of [id, slug] or one of [ids, slugs].")
+			return self.lookup(Media, ids=ids, slugs=slugs)
 		if len([x for x in [id, slug] if x is not None]) > 1:
 			raise Exception("Only one of [id, slug] can be specified at a time (both were specified).")
 		elif id is None and slug is None:
@@ -246,6 +808,13 @@ class API:
 			logger.debug(users)
 			assert False, "Should not get here! Request: {0}".format(ur.request.url)
 
+	@property
+	def users(self):
+		'''
+		A query of all User objects (class: 'QuerySet'), e.g. 'api.users.filter(...)', or 'api.users(ids=[...])' to get several by ID or slug.
+		'''
+		return QuerySet(self, User)
+
 	def UserRequest(self, **kwargs):
 		''' Factory method that returns a new UserRequest attached to this API. '''
 
@@ -291,6 +860,13 @@ class API:
 			# more than one found
 			assert False, "Should not get here!"
 
+	@property
+	def categories(self):
+		'''
+		A query of all Category objects (class: 'QuerySet'), e.g. 'api.categories.filter(...)', or 'api.categories(ids=[...])' to get several by ID or slug.
+		'''
+		return QuerySet(self, Category)
+
 	def CategoryRequest(self, **kwargs):
 		''' Factory method that returns a new CategoryRequest attached to this API. '''
 		return category.CategoryRequest(api=kwargs.pop('api', self), **kwargs)
@@ -328,6 +904,13 @@ class API:
 			# more than one found
 			assert False, "Should not get here!"
 
+	@property
+	def comments(self):
+		'''
+		A query of all Comment objects (class: 'QuerySet'), e.g. 'api.comments.filter(...)', or 'api.comments(ids=[...])' to get several by ID.
+		'''
+		return QuerySet(self, Comment)
+
 	def CommentRequest(self, **kwargs):
 		''' Factory method that returns a new CommentRequest attached to this API. '''
 		return comment.CommentRequest(api=kwargs.pop('api', self), **kwargs)
@@ -376,6 +959,13 @@ class API:
 			# more than one found
 			assert False, "Should not get here!"
 
+	@property
+	def pages(self):
+		'''
+		A query of all Page objects (class: 'QuerySet'), e.g. 'api.pages.filter(...)', or 'api.pages(ids=[...])' to get several by ID or slug.
+		'''
+		return QuerySet(self, Page)
+
 	def TagRequest(self, **kwargs):
 		''' Factory method that returns a new TagRequest attached to this API. '''
 		return tag.TagRequest(api=kwargs.pop('api', self), **kwargs)
@@ -420,3 +1010,10 @@ class API:
 		else:
 			# more than one found
 			assert False, "Should not get here!"
+
+	@property
+	def tags(self):
+		'''
+		A query of all Tag objects (class: 'QuerySet'), e.g. 'api.tags.filter(...)', or 'api.tags(ids=[...])' to get several by ID or slug.
+		'''
+		return QuerySet(self, Tag)
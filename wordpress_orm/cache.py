@@ -1,3 +1,5 @@
+import sys
+
 
 class WPORMCacheObjectNotFoundError(Exception):
 	pass
@@ -11,40 +13,177 @@ class WPORMCache:
 		Internal method to set up the cache from scratch.
 		'''
 		self.cache = dict()	
+		self.partial = set() # (class name, WordPress ID as str) of entities created from embedded objects, see 'set'
 
-	def get(self, class_name=None, key=None):
+	def get(self, class_name=None, key=None, partial=False):
 		'''
 		Method to retrieve wordpress-orm entity from cache; key can be WordPress 'id' or slug.
 		Keys that are not strings are coerced to type 'str' (i.e. an id of 4 or "4" is equivalent).
 		
 		class_name : class name as string
+		partial    : BOOL, if True, also return entities that only hold the fields of an embedded object (see 'set')
 		'''
 		if key is not None and isinstance(key, str) is False:
 			key = str(key)
-		if class_name not in self.cache:
-			self.cache[class_name] = dict()
 		try:
-			return self.cache[class_name][key] #.get(key, None) # return 'None' if key is not found
+			entity = self.cache.setdefault(class_name, dict())[key] # setdefault is atomic, see 'set' below #.get(key, None) # return 'None' if key is not found
 		except KeyError:
 			raise WPORMCacheObjectNotFoundError("Object of class '{0}' with key='{1}' not found".format(class_name, key))
+		if not partial and self.is_partial(class_name, entity.s.id):
+			raise WPORMCacheObjectNotFoundError("Only the embedded fields of the object of class '{0}' with key='{1}' are cached".format(class_name, key))
+		return entity
 	
-	def set(self, value=None, keys=list()):
+	def set(self, value=None, keys=list(), partial=False):
 		'''
 		Method to set values in the cache. Typically keys is a tuple or list containing the WordPress id and slug.
 		Keys that are not strings are coerced to type 'str' (i.e. an id of 4 or "4" is equivalent).
+
+		partial : BOOL, True if the entity was created from an embedded object, which has only some of the fields
+		          (those of the "embed" context); 'get' then only returns it if asked to, so a full record is read
+		          when the entity is looked up, and replaces the values of the partial entity (see 'WPRequest.refreshed_entity')
 		'''
 #		if key is not None and isinstance(key, str) is False:
 #			key = str(key)
 		class_name = type(value).__name__
-		if class_name not in self.cache:
-			self.cache[class_name] = dict()
+		# requests may run in parallel threads; setdefault won't replace a dictionary another thread just created
+		class_cache = self.cache.setdefault(class_name, dict())
 		for key in [k for k in keys if k is not None]: # safeguard against any key value that might be None
 			if isinstance(key, str) is False:
 				key = str(key)
-			self.cache[class_name][key] = value
+			class_cache[key] = value
+		if partial:
+			self.partial.add((class_name, str(value.s.id)))
+		else:
+			self.partial.discard((class_name, str(value.s.id)))
+
+	def is_partial(self, class_name, wpid):
+		'''
+		Returns True if the entity with the given WordPress ID was cached from an embedded object only (see 'set').
+		'''
+		return len(self.partial) > 0 and (class_name, str(wpid)) in self.partial
+
+	def discard(self, class_name=None, key=None):
+		'''
+		Removes the key from the cache. If the key is the WordPress 'id', the entity's slug is removed as well (and vice versa).
+		'''
+		class_cache = self.cache.get(class_name, dict())
+		entity = class_cache.pop(str(key), None)
+		if entity is None:
+			return
+		self.partial.discard((class_name, str(entity.s.id)))
+		for other_key in [getattr(entity.s, "id", None), getattr(entity.s, "slug", None)]:
+			if other_key is not None and class_cache.get(str(other_key), None) is entity:
+				class_cache.pop(str(other_key), None)
 
 	def clear(self):
 		'''
 		Clear all items from the cache.
 		'''
 		self.initialize()
+
+class WPORMValuePool:
+	'''
+	Pool of field values shared between entities to reduce the memory used by large caches.
+	
+	Many fields repeat the same few values across thousands of entities (e.g. 'status' is almost
+	always "publish"), yet each decoded record holds its own copy. Short strings in low-cardinality
+	fields are interned. Identical small lists (e.g. the same 'categories' IDs) can also be replaced
+	by a single shared list ('share_lists'); this is off by default because a shared list modified
+	in place (e.g. 'post.s.categories.append(3)') would change the field of every entity sharing it.
+	
+	(URL fields such as 'link' and 'guid' share a prefix, but each full value is unique,
+	so there is nothing to gain by pooling them.)
+	'''
+	# fields whose (string) values are interned
+	interned_fields = {"status", "type", "format", "comment_status", "ping_status", "template",
+					   "taxonomy", "media_type", "mime_type", "locale"}
+	
+	# fields whose (list) values are shared between entities
+	shared_list_fields = {"categories", "tags", "roles", "meta"}
+	
+	def __init__(self, max_string_length=64, max_list_length=32, max_lists=10000, share_lists=False):
+		'''
+		max_string_length : longest string value that will be interned
+		max_list_length   : longest list that will be shared
+		max_lists         : maximum number of distinct lists kept in the pool
+		share_lists       : BOOL, if True, share lists between entities; they must then be replaced, never modified in place
+		'''
+		self.max_string_length = max_string_length
+		self.max_list_length = max_list_length
+		self.max_lists = max_lists
+		self.share_lists = share_lists
+		self.initialize()
+	
+	def initialize(self):
+		'''
+		Internal method to set up the pool from scratch.
+		'''
+		self.lists = dict() # key = tuple of list values, value = shared list
+	
+	def share(self, field, value):
+		'''
+		Returns the shared instance equal to 'value' if the field is pooled, otherwise 'value' itself.
+		'''
+		if isinstance(value, str):
+			if field in self.interned_fields and len(value) <= self.max_string_length:
+				return sys.intern(value)
+		elif isinstance(value, list) and self.share_lists:
+			if field in self.shared_list_fields and len(value) <= self.max_list_length:
+				try:
+					key = tuple(value)
+					shared = self.lists.get(key, None)
+				except TypeError:
+					return value # contains unhashable values (e.g. dictionaries)
+				if shared is not None:
+					return shared
+				if len(self.lists) < self.max_lists:
+					self.lists[key] = value
+		return value
+	
+	def clear(self):
+		'''
+		Clear all shared lists from the pool.
+		'''
+		self.initialize()
+
+class WPORMResponseCache:
+	'''
+	Cache of pages of query results, shared by everything that reads the same query.
+	
+	Key = (URL, parameters) of the request, as returned by 'key', value = (list of entities, X-WP-Total).
+	Only the entities of a page are held (the entities themselves are in 'WPORMCache'). Cached
+	pages do not expire; call 'clear' to read the site again.
+	'''
+	def __init__(self):
+		self.initialize()
+	
+	def initialize(self):
+		'''
+		Internal method to set up the cache from scratch.
+		'''
+		self.pages = dict()
+	
+	@staticmethod
+	def key(url, parameters):
+		'''
+		Returns the cache key for a request URL and its parameters (dictionary); the order of the parameters does not matter.
+		'''
+		return (url, tuple(sorted((name, str(value)) for name, value in parameters.items())))
+	
+	def get(self, key):
+		'''
+		Returns the cached (entities, total) for the key, raises 'WPORMCacheObjectNotFoundError' if not present.
+		'''
+		try:
+			return self.pages[key]
+		except KeyError:
+			raise WPORMCacheObjectNotFoundError("No response cached for the request '{0}'".format(key))
+	
+	def set(self, key, entities, total):
+		self.pages[key] = (entities, total)
+	
+	def clear(self):
+		'''
+		Clear all cached pages.
+		'''
+		self.initialize()
@@ -0,0 +1,126 @@
+'''
+Request templates that are prepared once and executed many times.
+
+Creating a request object runs a validating setter for every parameter, and each 'get()'
+rebuilds the request parameters from them. When the same query shape is run over and over
+with only a few parameters changing (e.g. 'page' or 'search'), a 'CompiledRequest' keeps the
+prepared URL and parameters and only merges in the values that change for each call.
+'''
+
+import copy
+import json
+import logging
+
+import requests
+
+from . import exc
+from . import explain
+from .cache import WPORMCacheObjectNotFoundError
+
+logger = logging.getLogger(__name__.split(".")[0]) # package name
+
+def normalize_parameter(value):
+	'''
+	Returns a request parameter value as WordPress expects it, e.g. lists become comma separated strings.
+	'''
+	if isinstance(value, (list, tuple)):
+		return ",".join(str(v) for v in value)
+	if isinstance(value, bool):
+		return "true" if value else "false"
+	return str(value)
+
+class CompiledRequest:
+	'''
+	A request prepared once (see 'WPRequest.compile') that can be executed repeatedly with some parameters changed.
+
+	Example:
+		search = api.PostRequest(categories=[4]).compile()
+		for term in terms:
+			posts = search.execute(search=term, page=1)
+	'''
+	def __init__(self, request, class_object, embed):
+		'''
+		request      : the request object to use as template, its parameters already populated
+		class_object : the class of the entities to create
+		embed        : 'embed' argument the parameters were prepared with
+		'''
+		self.template = request
+		self.class_object = class_object
+		self.api = request.api
+		self.url = request.url
+		self.embed = embed
+		self.parameters = {name:normalize_parameter(value) for name, value in request.parameters.items()}
+		self.key = self.api.response_cache.key(self.url, self.parameters) # stable key of the base query
+
+	def __repr__(self):
+		return "<{0} of {1} objects at {2}, url='{3}', parameters={4}>".format(self.__class__.__name__, self.class_object.__name__,
+																			  hex(id(self)), self.url, self.parameters)
+
+	def parameters_for(self, **overrides):
+		'''
+		Returns the request parameters with the given values changed; a value of None removes the parameter.
+		'''
+		parameters = dict(self.parameters)
+		for name, value in overrides.items():
+			if value is None:
+				parameters.pop(name, None)
+			else:
+				parameters[name] = normalize_parameter(value)
+		return parameters
+
+	def variant(self, class_object=None, **overrides):
+		'''
+		Returns a new 'CompiledRequest' for the same query with the given parameters changed (see 'parameters_for').
+
+		class_object : the class of the entities to create, default: the class of this request (e.g. 'dict' to read records only)
+		'''
+		compiled = copy.copy(self)
+		if class_object is not None:
+			compiled.class_object = class_object
+		compiled.parameters = self.parameters_for(**overrides)
+		compiled.key = self.api.response_cache.key(self.url, compiled.parameters)
+		return compiled
+
+	def execute(self, cached=False, with_total=False, **overrides):
+		'''
+		Runs the request with the given parameters changed (e.g. 'page=2', 'include=[4, 7]', 'search="cheese"').
+
+		cached     : BOOL, if True, return the result from 'api.response_cache' if the same request was executed before (and cache it)
+		with_total : BOOL, if True, return a tuple (list of entities, X-WP-Total)
+
+		Returns the list of entities (an empty list if nothing was found).
+		'''
+		parameters = self.parameters_for(**overrides) if overrides else self.parameters
+		key = None
+		if cached:
+			key = self.api.response_cache.key(self.url, parameters)
+			try:
+				entities, total = self.api.response_cache.get(key)
+				self.api.record_request("GET", self.url, parameters, source=explain.RESPONSE_CACHE)
+				return (entities, total) if with_total else entities
+			except WPORMCacheObjectNotFoundError:
+				pass
+
+		# a shallow copy of the template holds the response; no setters or 'populate_request_parameters' are run
+		request = copy.copy(self.template)
+		request.parameters = parameters
+		request.response = None
+		request.total = None
+		request.total_pages = None
+		entities = request.answer_locally(self.class_object) # from a complete snapshot, see 'API.preload'
+		if entities is not None:
+			return (entities, request.total) if with_total else entities
+		try:
+			request.get_response()
+		except requests.exceptions.HTTPError:
+			if request.response.status_code == 400: # bad request
+				raise exc.BadRequest("400: Bad request. Error: \n{0}".format(json.dumps(request.response.json(), indent=4)))
+			elif request.response.status_code == 404: # not found
+				return (list(), None) if with_total else list()
+			raise Exception("Unhandled HTTP response, code {0}. Error: \n{1}\n".format(request.response.status_code, request.response.json()))
+		request.process_response_headers()
+		entities = request.entities_from_response(class_object=self.class_object)
+
+		if cached:
+			self.api.response_cache.set(key, entities, request.total)
+		return (entities, request.total) if with_total else entities
@@ -1,6 +1,6 @@
 
 from .category import Category
-from .comment import Comment
+from .comment import Comment, comment_tree
 from .media import Media
 from .page import Page
 #from .post_revision import PostRevision
@@ -12,6 +12,7 @@ from .wordpress_entity import WPEntity, WPRequest, context_values
 #from .post import PostRequest
 from ..import exc
 from ..cache import WPORMCacheObjectNotFoundError
+from ..paginated import PaginatedList
 
 logger = logging.getLogger(__name__.split(".")[0]) # package name
 
@@ -23,9 +24,6 @@ class Category(WPEntity):
 	def __init__(self, id=None, session=None, api=None):
 		super().__init__(api=api)
 		
-		# cache related objects
-		self._posts = None
-		
 	def __repr__(self):
 		return "<WP {0} object at {1} name='{2}'>".format(self.__class__.__name__, hex(id(self)), self.s.name)
 	
@@ -47,14 +45,17 @@ class Category(WPEntity):
 
 	def posts(self):
 		'''
-		Return a list of posts (type: Post) that have this category.
+		Return the posts (type: Post) that have this category, a lazy paginated collection (class: 'PaginatedList').
+		
+		Posts are only requested as they are accessed, e.g. 'len(category.posts())', 'category.posts()[:20]', or iterating over it.
+		Each call returns a new collection, which reads the site again.
 		'''
-		# maybe not cache this...?
-		if self._posts is None:
+		def post_request():
 			pr = self.api.PostRequest()
-			pr.categories.append(self)
-			self._posts = pr.get()
-		return self._posts
+			pr.categories = [self.s.id]
+			return pr
+		from .post import Post # the 'post' module imports this one
+		return PaginatedList(api=self.api, request_factory=post_request, class_object=Post)
 
 
 class CategoryRequest(WPRequest):
@@ -71,6 +72,7 @@ class CategoryRequest(WPRequest):
 		#
 		self._hide_empty = None
 		self._per_page = None
+		self._includes = list()
 		
 	@property
 	def parameter_names(self):
@@ -89,20 +91,25 @@ class CategoryRequest(WPRequest):
 			self.parameters["context"] = "view" # default value
 
 		for param in self.parameter_names:
-			if getattr(self, param, None):
-				self.parameters[param] = getattr(self, param)
+			value = getattr(self, param, None)
+			if value:
+				if isinstance(value, list):
+					# e.g. 'include' : list of IDs
+					value = ",".join(value)
+				self.parameters[param] = value
 
-	def get(self, class_object=Category, count=False, embed=True, links=True):
+	def get(self, class_object=Category, count=False, embed=True, links=True, stream=False):
 		'''
 		Returns a list of 'Category' objects that match the parameters set in this object.
 
 		class_object : the class of the objects to instantiate based on the response, used when implementing custom subclasses
 		count        : BOOL, return the number of entities matching this request, not the objects themselves
-		embed        : BOOL, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed,
-			           see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
-		links        : BOOL, if True, returns with response a map of links to other API resources
+		embed        : BOOL or list, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed;
+			           a list of link relations (e.g. ["author", "wp:featuredmedia"]) embeds only those, see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
+		links        : BOOL, if False, the map of links to other API resources ("_links") is omitted from the response
+		stream       : BOOL, if True, parse the response incrementally and return a generator that yields each 'Category' as soon as its record has been read
 		'''
-		super().get(class_object=class_object, count=count, embed=embed, links=links)
+		super().get(class_object=class_object, count=count, embed=embed, links=links, stream=stream)
 		
 		#if self.id:
 		#	self.url += "/{}".format(self.id)
@@ -110,7 +117,7 @@ class CategoryRequest(WPRequest):
 		self.populate_request_parameters()
 
 		try:
-			self.get_response(wpid=self.id)
+			self.get_response(wpid=self.id, stream=stream and not count)
 			logger.debug("URL='{}'".format(self.request.url))
 		except requests.exceptions.HTTPError:
 			logger.debug("Post response code: {}".format(self.response.status_code))
@@ -132,37 +139,34 @@ class CategoryRequest(WPRequest):
 			return self.total
 			#return len(pages_data)
 
-		categories_data = self.response.json()
+		return self.entities_from_response(class_object=class_object, stream=stream)
+
+	def entity_from_dictionary(self, d, class_object=Category):
+		'''
+		Returns the 'Category' for a single record of the response, creating it if it is not in the cache.
+		'''
+		# Before we continue, do we have this Category in the cache already?
+		try:
+			return self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
+		except WPORMCacheObjectNotFoundError:
+			pass
+
+		category = class_object.__new__(class_object) # default = Category()
+		category.__init__(api=self.api)
+		category.json = json.dumps(d)
 		
-		if isinstance(categories_data, dict):
-			# only one object was returned, make it a list
-			categories_data = [categories_data]
-			
-		categories = list()
-		for d in categories_data:
+		category.update_schema_from_dictionary(d)
 			
-			# Before we continue, do we have this Category in the cache already?
-			try:
-				logger.debug(d)
-				category = self.api.wordpress_object_cache.get(class_object.__name__, key=d["id"]) # default = Category()
-			except WPORMCacheObjectNotFoundError:
-				category = class_object.__new__(class_object) # default = Category()
-				category.__init__(api=self.api)
-				category.json = json.dumps(d)
-				
-				category.update_schema_from_dictionary(d)
-					
-				if "_embedded" in d:
-					logger.debug("TODO: implement _embedded content for Category object")
+		if "_embedded" in d:
+			self.process_embedded(category, d["_embedded"])
 	
-				# perform postprocessing for custom fields
-				category.postprocess_response()
-				
-				# add to cache
-				self.api.wordpress_object_cache.set(value=category, keys=(category.s.id, category.s.slug))
-			finally:
-				categories.append(category)
-		return categories
+		# perform postprocessing for custom fields
+		category.postprocess_response()
+		
+		# add to cache
+		self.api.wordpress_object_cache.set(value=category, keys=(category.s.id, category.s.slug))
+
+		return category
 
 	@property
 	def context(self):
@@ -210,7 +214,7 @@ class CategoryRequest(WPRequest):
 
 	@property
 	def orderby(self):
-		return self.api_params.get('orderby', None)
+		return self._orderby
 		
 	@orderby.setter
 	def orderby(self, value):
@@ -230,6 +234,28 @@ class CategoryRequest(WPRequest):
 								 'values: {} (or None).'.format(orderby_values))
 		return self._orderby
 
+	@property
+	def include(self):
+		return self._includes
+
+	@include.setter
+	def include(self, values):
+		'''
+		Limit result set to specified WordPress category IDs, provided as a list.
+		'''
+		if values is None:
+			self.parameters.pop("include", None)
+			self._includes = list()
+			return
+		elif not isinstance(values, list):
+			raise ValueError("Includes must be provided as a list (or append to the existing list).")
+
+		for include_id in values:
+			try:
+				self._includes.append(str(int(include_id)))
+			except (ValueError, TypeError):
+				raise ValueError("The WordPress ID (an integer, '{0}' given) must be provided to limit result to specific categories.".format(include_id))
+
 	@property
 	def hide_empty(self):
 		return self._hide_empty
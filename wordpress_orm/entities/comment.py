@@ -4,10 +4,12 @@ WordPress API reference: https://developer.wordpress.org/rest-api/reference/comm
 
 import json
 import logging
+import functools
 import requests
 
-from .wordpress_entity import WPEntity, WPRequest, context_values
+from .wordpress_entity import WPEntity, WPRequest, context_values, MAX_PER_PAGE
 from .post import Post
+from .user import User
 from ..import exc
 from ..cache import WPORMCacheObjectNotFoundError
 
@@ -25,7 +27,25 @@ class Comment(WPEntity):
 	
 		# cache related objects
 		self._author = None
+		self._post = None
+		self._parent = None
+		self._replies = None
 	
+	# relations that can be fetched for many comments at once with 'API.prefetch',
+	# key = relation name, value = (schema field with the related ID(s), related class, attribute caching the related object(s))
+	relations = {
+		"author" : ("author", User, "_author"),
+		"post"   : ("post", Post, "_post")
+		# "parent" is added below the class definition
+	}
+
+	# embedded content attached to the comment, key = link relation, value = relation name
+	embedded_relations = {
+		"author"      : "author",
+		"up"          : "post",
+		"in-reply-to" : "parent"
+	}
+
 	def __repr__(self):
 		if len(self.s.content) < 11:
 			truncated_content = self.s.content
@@ -53,19 +73,69 @@ class Comment(WPEntity):
 								 "author_user_agent", "content", "date_gmt", "parent", "post", "status", "meta"]
 		return self._post_fields
 
+	@property
 	def author(self):
 		'''
 		Return the WordPress User object that wrote this comment, if it was a WP User, None otherwise.
 		'''
-		if self._author is None:
-			ur = self.api.UserRequest()
-			ur.id = self.s.author # 'author' field is user ID
-			users = ur.get()
-			if len(users) > 0:
-				self._author = users[0]
+		return self.api.related(self, "author") # 'author' field is user ID, 0 if not a WP user
+
+	@property
+	def post(self):
+		'''
+		Returns the post (class: 'Post') this comment was made on.
+		'''
+		return self.api.related(self, "post")
+
+	@property
+	def parent(self):
+		'''
+		Returns the comment (class: 'Comment') this comment is a reply to, or None if it is not a reply.
+		'''
+		return self.api.related(self, "parent")
+
+	@property
+	def replies(self):
+		'''
+		Returns the list of comments that are direct replies to this comment (oldest first).
+		
+		This builds the comment tree of the comment's post (see 'comment_tree'), loading all of its comments if needed.
+		'''
+		if self._replies is None:
+			if self.post is None:
+				self._replies = list()
 			else:
-				self._author = None
-		return self._author
+				comment_tree(self.post.comments)
+		return self._replies
+
+Comment.relations["parent"] = ("parent", Comment, "_parent")
+
+def comment_tree(comments):
+	'''
+	Organizes a flat list of comments into threads; returns the top level comments (oldest first).
+	
+	The tree is built in a single pass over the list using an index of the comments by ID:
+	each comment's 'replies' is set to the list of its direct replies (oldest first) and its
+	'parent' to the comment it replies to. Replies whose parent is not in the list are
+	treated as top level comments.
+	
+	comments : list of 'Comment' objects, e.g. 'post.comments'
+	'''
+	comments = sorted(comments, key=lambda c: (c.s.date_gmt or "", c.s.id))
+	by_id = dict() # key = comment ID, value = comment
+	for comment in comments:
+		comment._replies = list()
+		by_id[comment.s.id] = comment
+
+	top_level = list()
+	for comment in comments:
+		parent = by_id.get(comment.s.parent, None) if comment.s.parent else None
+		if parent is None:
+			top_level.append(comment)
+		else:
+			comment._parent = parent
+			parent._replies.append(comment)
+	return top_level
 
 class CommentRequest(WPRequest):
 	'''
@@ -102,29 +172,44 @@ class CommentRequest(WPRequest):
 		'''
 		Populates 'self.parameters' to prepare for executing a request.
 		'''
+		self.resolve_slugs() # posts given by slug
+
 		if self.context:
 			self.parameters["context"] = self.context
 		else:
 			self.parameters["context"] = "view" # default value
 		
+		if self.page:
+			self.parameters["page"] = self.page
+
+		if self.per_page:
+			self.parameters["per_page"] = self.per_page
+
 		if self.password:
 			self.parameters["password"] = self.password
+
+		if self.order:
+			self.parameters["order"] = self.order
+
+		if self.orderby:
+			self.parameters["orderby"] = self.orderby
 			
 		if len(self.posts) > 0:
 			logger.debug("Posts: {0}".format(self.posts))
 			self.parameters["post"] = ",".join(self.posts) # post ID
 
-	def get(self, class_object=Comment, count=False, embed=True, links=True):
+	def get(self, class_object=Comment, count=False, embed=True, links=True, stream=False):
 		'''
 		Returns a list of 'Comment' objects that match the parameters set in this object.
 
 		class_object : the class of the objects to instantiate based on the response, used when implementing custom subclasses
 		count        : BOOL, return the number of entities matching this request, not the objects themselves
-		embed        : BOOL, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed,
-			           see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
-		links        : BOOL, if True, returns with response a map of links to other API resources
+		embed        : BOOL or list, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed;
+			           a list of link relations (e.g. ["author", "wp:featuredmedia"]) embeds only those, see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
+		links        : BOOL, if False, the map of links to other API resources ("_links") is omitted from the response
+		stream       : BOOL, if True, parse the response incrementally and return a generator that yields each 'Comment' as soon as its record has been read
 		'''
-		super().get(class_object=class_object, count=count, embed=embed, links=links)
+		super().get(class_object=class_object, count=count, embed=embed, links=links, stream=stream)
 		
 		#if self.id:
 		#	self.url += "/{}".format(self.id)
@@ -132,8 +217,8 @@ class CommentRequest(WPRequest):
 		self.populate_request_parameters()
 
 		try:
+			self.get_response(wpid=self.id, stream=stream and not count)
 			logger.debug("URL='{}'".format(self.request.url))
-			self.get_response(wpid=self.id)
 		except requests.exceptions.HTTPError:
 			logger.debug("Post response code: {}".format(self.response.status_code))
 			if self.response.status_code == 400: # bad request
@@ -152,39 +237,68 @@ class CommentRequest(WPRequest):
 			return self.total
 			#return len(pages_data)
 
-		comments_data = self.response.json()
+		return self.entities_from_response(class_object=class_object, stream=stream)
+
+	def get_for_posts(self, posts, class_object=Comment, embed=True, links=True):
+		'''
+		Returns all comments of the given posts as a dictionary (key = post ID, value = list of comments).
 		
-		if isinstance(comments_data, dict):
-			# only one object was returned, make it a list
-			comments_data = [comments_data]
-			
-		comments = list()
-		for d in comments_data:
+		Comments of up to 100 posts are requested together ('post=1,2,3,...'), and every page
+		of the results is read (in parallel, see 'get_all'). The comments of each 'Post' object
+		given are also attached to it, so 'post.comments' makes no further request.
+		Any other parameters set on this request (e.g. 'per_page') apply to all requests made.
+		
+		posts : list of 'Post' objects or post IDs
+		'''
+		post_ids = [p.s.id if isinstance(p, Post) else int(p) for p in posts]
 
-			# Before we continue, do we have this Comment in the cache already?
-			try:
-				comment = self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
-			except WPORMCacheObjectNotFoundError:
-				# create new object
-				comment = class_object.__new__(class_object) # default = Comment()
-				comment.__init__(api=self.api)
-				comment.json = json.dumps(d)
-				
-				comment.update_schema_from_dictionary(d)
-					
-				if "_embedded" in d:
-					logger.debug("TODO: implement _embedded content for Comment object")
+		def get_chunk(chunk):
+			cr = self.request_for_page(self.page)
+			cr.parameters.pop("post", None)
+			cr._posts = list()
+			cr.posts = chunk
+			return cr.get_all(class_object=class_object, embed=embed, links=links)
+
+		chunks = [post_ids[start:start + MAX_PER_PAGE] for start in range(0, len(post_ids), MAX_PER_PAGE)]
+		comments_by_post = {post_id:list() for post_id in post_ids}
+		for comments in self.api.run_concurrently([functools.partial(get_chunk, chunk) for chunk in chunks]):
+			for comment in comments:
+				comments_by_post.setdefault(comment.s.post, list()).append(comment)
+
+		for p in posts:
+			if isinstance(p, Post):
+				p._comments = comments_by_post[p.s.id]
+		return comments_by_post
+
+	def entity_from_dictionary(self, d, class_object=Comment):
+		'''
+		Returns the 'Comment' for a single record of the response, creating it if it is not in the cache.
+		'''
+		# Before we continue, do we have this Comment in the cache already?
+		try:
+			return self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
+		except WPORMCacheObjectNotFoundError:
+			pass
+
+		# create new object
+		comment = class_object.__new__(class_object) # default = Comment()
+		comment.__init__(api=self.api)
+		d = self.defer_large_fields(comment, d) # may drop large HTML fields
+		comment.json = json.dumps(d)
+		
+		comment.update_schema_from_dictionary(d)
+			
+		if "_embedded" in d:
+			self.process_embedded(comment, d["_embedded"])
 	
-				# perform postprocessing for custom fields
-				comment.postprocess_response()
+		# perform postprocessing for custom fields
+		comment.postprocess_response()
 	
-				# add to cache
-				self.api.wordpress_object_cache.set(value=comment, keys=(comment.s.id, comment.s.slug))
-			finally:
-				comments.append(comment)
-		
-		return comments
-		
+		# add to cache
+		self.api.wordpress_object_cache.set(value=comment, keys=(comment.s.id,)) # comments have no slug
+
+		return comment
+
 	@property
 	def context(self):
 		if self._context is None:
@@ -231,7 +345,7 @@ class CommentRequest(WPRequest):
 
 	@property
 	def orderby(self):
-		return self.api_params.get('orderby', None)
+		return self._orderby
 		
 	@orderby.setter
 	def orderby(self, value):
@@ -262,12 +376,16 @@ class CommentRequest(WPRequest):
 	def posts(self, values):
 		'''
 		Set the list of posts to retrieve comments for.
+
+		Accepts 'Post' objects, post IDs (integer or string) or slugs; slugs are resolved to IDs
+		together when the request is made (see 'resolve_slugs').
 		'''
 		
 		# internally save the post ID.
 		
 		if values is None:
 			self._posts = list()
+			self._unresolved_slugs.pop("posts", None)
 			return
 		elif not isinstance(values, list):
 			raise ValueError("Posts must be provided as a list (or append to the existing list).")
@@ -282,7 +400,11 @@ class CommentRequest(WPRequest):
 				try:
 					post_id = int(p)
 				except ValueError:
-					raise ValueError("Posts must be provided as a list of (or append to the existing list). Accepts 'Post' objects or Post IDs.")
+					# not a post ID value, it's the slug
+					self.add_slug_filter("posts", Post, p)
+					continue
+			else:
+				raise ValueError("Posts must be provided as a list (or append to the existing list). Accepts 'Post' objects, Post IDs or slugs.")
 			self._posts.append(str(post_id))
 
 
@@ -11,11 +11,16 @@ import logging
 import requests
 
 from .wordpress_entity import WPEntity, WPRequest, context_values
+from .user import User
+from .. import exc
 from ..cache import WPORMCache, WPORMCacheObjectNotFoundError
 
 logger = logging.getLogger(__name__.split(".")[0]) # package name
 
 status_values = ["publish", "future", "draft", "pending", "private"]
+order_values = ["asc", "desc"]
+orderby_values = ["author", "date", "id", "include", "modified", "parent",
+				  "relevance", "slug", "include_slugs", "title"]
 
 class Media(WPEntity):
 	
@@ -24,8 +29,20 @@ class Media(WPEntity):
 
 		# related objects to cache
 		self._author = None
-		self._associated_post = None
+		self._post = None
 			
+	# relations that can be fetched for many media items at once with 'API.prefetch',
+	# key = relation name, value = (schema field with the related ID(s), related class, attribute caching the related object(s))
+	relations = {
+		"author" : ("author", User, "_author")
+		# "post" is added in the 'post' module (which imports this one)
+	}
+
+	# embedded content attached to the media item, key = link relation, value = relation name
+	embedded_relations = {
+		"author" : "author"
+	}
+
 	def __repr__(self):
 		return "<WP {0} object at {1}, id={2}, type='{3}', file='{4}'>".format(self.__class__.__name__, hex(id(self)),
 																			self.s.id,
@@ -64,33 +81,21 @@ class Media(WPEntity):
 	def author(self):
 		'''
 		Returns the author of this post, class: 'User'.
+
+		Raises 'exc.UserNotFound' if the user doesn't exist; when 'api.lazy_relations' is True and the
+		user is not cached, a proxy is returned and the error is raised when a field other than 'id' is first used.
 		'''
-		# TODO: check cache first!
-		if self._author is None:
-			ur = self.api.UserRequest()
-			ur.id = self.s.author # ID for the author of the object
-			user_list = ur.get()
-			if len(user_list) == 1:
-				self._author = user_list[0]
-			else:
-				raise exc.UserNotFound("User ID '{0}' not found.".format(self.author))
-		return self._author
+		author = self.api.related(self, "author")
+		if author is None and self.s.author:
+			raise exc.UserNotFound("User ID '{0}' not found.".format(self.s.author))
+		return author
 	
 	@property
 	def post(self):
 		'''
-		The post associated with this media item.
+		The post associated with this media item (the post it was uploaded to), None if there is none.
 		'''
-		# TODO check cache first
-		if self._associated_post is None:
-			pr = self.api.PostRequest()
-			pr.id = self.s.featured_media
-			posts = pr.get()
-			if len(media_list) == 1:
-				self._associated_post = posts[0]
-			else:
-				self._associated_post = None
-		return self._associated_post
+		return self.api.related(self, "post")
 	
 
 class MediaRequest(WPRequest):
@@ -109,6 +114,9 @@ class MediaRequest(WPRequest):
 		self._context = None #"view"
 		self._page = None
 		self._per_page = None
+		self._includes = list()
+		self._order = None
+		self._orderby = None
 
 	@property
 	def parameter_names(self):
@@ -152,17 +160,17 @@ class MediaRequest(WPRequest):
 		if self.exclude:
 			assert False, "Field 'exclude' not yet implemented."
 
-		if self.include:
-			assert False, "Field 'include' not yet implemented."
+		if len(self.include) > 0:
+			self.parameters["include"] = ",".join(self.include)
 
 		if self.offset:
 			assert False, "Field 'offset' not yet implemented."
 
 		if self.order:
-			assert False, "Field 'order' not yet implemented."
+			self.parameters["order"] = self.order
 
 		if self.orderby:
-			assert False, "Field 'orderby' not yet implemented."
+			self.parameters["orderby"] = self.orderby
 
 		if self.parent:
 			assert False, "Field 'parent' not yet implemented."
@@ -182,17 +190,18 @@ class MediaRequest(WPRequest):
 		if self.mime_type:
 			assert False, "Field 'mime_type' not yet implemented."
 
-	def get(self, class_object=Media, count=False, embed=True, links=True):
+	def get(self, class_object=Media, count=False, embed=True, links=True, stream=False):
 		'''
 		Returns a list of 'Media' objects that match the parameters set in this object.
 
 		class_object : the class of the objects to instantiate based on the response, used when implementing custom subclasses
 		count        : BOOL, return the number of entities matching this request, not the objects themselves
-		embed        : BOOL, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed,
-			           see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
-		links        : BOOL, if True, returns with response a map of links to other API resources
+		embed        : BOOL or list, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed;
+			           a list of link relations (e.g. ["author", "wp:featuredmedia"]) embeds only those, see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
+		links        : BOOL, if False, the map of links to other API resources ("_links") is omitted from the response
+		stream       : BOOL, if True, parse the response incrementally and return a generator that yields each 'Media' as soon as its record has been read
 		'''
-		super().get(class_object=class_object, count=count, embed=embed, links=links)
+		super().get(class_object=class_object, count=count, embed=embed, links=links, stream=stream)
 		
 		#if self.id:
 		#	self.url += "/{}".format(self.id)
@@ -202,7 +211,7 @@ class MediaRequest(WPRequest):
 		self.populate_request_parameters()
 		
 		try:
-			self.get_response(wpid=self.id)
+			self.get_response(wpid=self.id, stream=stream and not count)
 			logger.debug("URL='{}'".format(self.request.url))
 		except requests.exceptions.HTTPError:
 			logger.debug("HTTP error! media response code: {}".format(self.response.status_code))
@@ -219,38 +228,36 @@ class MediaRequest(WPRequest):
 			return self.total
 			#return len(pages_data)
 
-		media_data = self.response.json()
-
-		if isinstance(media_data, dict):
-			# only one object was returned; make it a list
-			media_data = [media_data]
+		return self.entities_from_response(class_object=class_object, stream=stream)
 
-		media_objects = list()
-		for d in media_data:
-
-			# Before we continue, do we have this Media in the cache already?
-			try:
-				media = self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
-			except WPORMCacheObjectNotFoundError:
-				media = class_object.__new__(class_object) # default = Media()
-				media.__init__(api=self.api)
-				media.json = json.dumps(d)
-				
-				media.update_schema_from_dictionary(d)
-				
-				if "_embedded" in d:
-					logger.debug("TODO: implement _embedded content for Media object")
-	
-				# perform postprocessing for custom fields
-				media.postprocess_response(data=d)
-	
-				# add to cache
-				self.api.wordpress_object_cache.set(value=media, keys=(media.s.id, media.s.slug))
-			finally:
-				media_objects.append(media)
+	def entity_from_dictionary(self, d, class_object=Media):
+		'''
+		Returns the 'Media' for a single record of the response, creating it if it is not in the cache.
+		'''
+		# Before we continue, do we have this Media in the cache already?
+		try:
+			return self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
+		except WPORMCacheObjectNotFoundError:
+			pass
+
+		media = class_object.__new__(class_object) # default = Media()
+		media.__init__(api=self.api)
+		d = self.defer_large_fields(media, d) # may drop large HTML fields
+		media.json = json.dumps(d)
 		
-		return media_objects
+		media.update_schema_from_dictionary(d)
+		
+		if "_embedded" in d:
+			self.process_embedded(media, d["_embedded"])
+	
+		# perform postprocessing for custom fields
+		media.postprocess_response(data=d)
 	
+		# add to cache
+		self.api.wordpress_object_cache.set(value=media, keys=(media.s.id, media.s.slug))
+
+		return media
+
 	@property
 	def context(self):
 		return self._context
@@ -269,6 +276,28 @@ class MediaRequest(WPRequest):
 				pass
 			raise ValueError ("'context' may only be one of ['view', 'embed', 'edit']")
 
+	@property
+	def include(self):
+		return self._includes
+
+	@include.setter
+	def include(self, values):
+		'''
+		Limit result set to specified WordPress media IDs, provided as a list.
+		'''
+		if values is None:
+			self.parameters.pop("include", None)
+			self._includes = list()
+			return
+		elif not isinstance(values, list):
+			raise ValueError("Includes must be provided as a list (or append to the existing list).")
+
+		for include_id in values:
+			try:
+				self._includes.append(str(int(include_id)))
+			except (ValueError, TypeError):
+				raise ValueError("The WordPress ID (an integer, '{0}' given) must be provided to limit result to specific media.".format(include_id))
+
 	@property
 	def page(self):
 		'''
@@ -311,3 +340,45 @@ class MediaRequest(WPRequest):
 	
 
 			
+
+	@property
+	def order(self):
+		return self._order
+
+	@order.setter
+	def order(self, value):
+		if value is None:
+			self.parameters.pop("order", None)
+			self._order = None
+		else:
+			if isinstance(value, str):
+				value = value.lower()
+				if value not in order_values:
+					raise ValueError('The "order" parameter must be one '+\
+									 'of these values: {}'.format(order_values))
+				else:
+					self._order = value
+			else:
+				raise ValueError('The "order" parameter must be one of '+\
+								 'these values: {} (or None).'.format(order_values))
+
+	@property
+	def orderby(self):
+		return self._orderby
+
+	@orderby.setter
+	def orderby(self, value):
+		if value is None:
+			self.parameters.pop("orderby", None)
+			self._orderby = None
+		else:
+			if isinstance(value, str):
+				value = value.lower()
+				if value not in orderby_values:
+					raise ValueError('The "orderby" parameter must be one '+\
+									 'of these values: {}'.format(orderby_values))
+				else:
+					self._orderby = value
+			else:
+				raise ValueError('The "orderby" parameter must be one of these '+\
+								 'values: {} (or None).'.format(orderby_values))
@@ -11,6 +11,7 @@ from datetime import datetime
 
 from .wordpress_entity import WPEntity, WPRequest, context_values
 from .user import User
+from .media import Media
 
 from .. import exc
 from ..cache import WPORMCacheObjectNotFoundError
@@ -29,6 +30,22 @@ class Page(WPEntity):
 		# related objects to cache
 		self._author = None
 		self._featured_media = None
+		self._parent = None
+
+	# relations that can be fetched for many pages at once with 'API.prefetch',
+	# key = relation name, value = (schema field with the related ID(s), related class, attribute caching the related object(s))
+	relations = {
+		"author"         : ("author", User, "_author"),
+		"featured_media" : ("featured_media", Media, "_featured_media")
+		# "parent" is added below the class definition
+	}
+
+	# embedded content attached to the page, key = link relation, value = relation name
+	embedded_relations = {
+		"author"           : "author",
+		"wp:featuredmedia" : "featured_media",
+		"up"               : "parent"
+	}
 
 	def __repr__(self):
 		if len(self.s.title) < 11:
@@ -64,39 +81,36 @@ class Page(WPEntity):
 		'''
 		Returns the 'Media' object that is the "featured media" for this page.
 		'''
-		if self._featured_media is None:
-
-			found_media = self.api.media(id=self.s.featured_media)
-			self._featured_media = found_media
-
-#			mr = self.api.MediaRequest()
-#			mr.id = self.s.featured_media
-#			media_list = mr.get()
-#			if len(media_list) == 1:
-#				self._featured_media = media_list[0]
-#			else:
-#				self._featured_media = None
-		return self._featured_media
+		return self.api.related(self, "featured_media")
 
 	@property
 	def author(self):
 		'''
 		Returns the author of this page, class: 'User'.
+
+		Raises 'exc.UserNotFound' if the user doesn't exist; when 'api.lazy_relations' is True and the
+		user is not cached, a proxy is returned and the error is raised when a field other than 'id' is first used.
 		'''
-		if self._author is None:
-			ur = self.api.UserRequest()
-			ur.id = self.s.author # ID for the author of the object
-			user_list = ur.get()
-			if len(user_list) == 1:
-				self._author = user_list[0]
-			else:
-				raise exc.UserNotFound("User ID '{0}' not found.".format(self.author))
-		return self._author
+		author = self.api.related(self, "author")
+		if author is None and self.s.author:
+			raise exc.UserNotFound("User ID '{0}' not found.".format(self.s.author))
+		return author
+
+	@property
+	def parent(self):
+		'''
+		Returns the parent of this page (class: 'Page'), or None if this is a top level page.
+		'''
+		return self.api.related(self, "parent")
+
+Page.relations["parent"] = ("parent", Page, "_parent")
 
 class PageRequest(WPRequest):
 	'''
 	A class that encapsulates requests for WordPress pages.
 	'''
+	supports_date_windows = True
+
 	def __init__(self, api=None, categories=None, slugs=None):
 		super().__init__(api=api)
 		self.id = None # WordPress ID
@@ -140,6 +154,8 @@ class PageRequest(WPRequest):
 		'''
 		Populates 'self.parameters' to prepare for executing a request.
 		'''
+		self.resolve_slugs() # filters given by slug, e.g. 'parent=["about"]'
+
 		if self.context:
 			self.parameters["context"] = self.context
 		else:
@@ -157,6 +173,9 @@ class PageRequest(WPRequest):
 		if self.after:
 			self.parameters["after"] = self._after.isoformat()
 
+		if self.before:
+			self.parameters["before"] = self._before.isoformat()
+
 		if len(self.author) > 0:
 			# takes a list of author IDs
 			self.parameters["author"] = ",".join(self.author)
@@ -176,28 +195,37 @@ class PageRequest(WPRequest):
 		if self.order:
 			self.parameters["order"] = self.order
 
+		if self.orderby:
+			self.parameters["orderby"] = self.orderby
+
 		if self.menu_order:
 			self.parameters["menu_order"] = self.menu_order
 	
-	def get(self, class_object=Page, count=False, embed=True, links=True):
+	def get(self, class_object=Page, count=False, embed=True, links=True, stream=False):
 		'''
 		Returns a list of 'Page' objects that match the parameters set in this object.
 
 		class_object : the class of the objects to instantiate based on the response, used when implementing custom subclasses
 		count        : BOOL, return the number of entities matching this request, not the objects themselves
-		embed        : BOOL, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed,
-			           see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
-		links        : BOOL, if True, returns with response a map of links to other API resources
+		embed        : BOOL or list, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed;
+			           a list of link relations (e.g. ["author", "wp:featuredmedia"]) embeds only those, see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
+		links        : BOOL, if False, the map of links to other API resources ("_links") is omitted from the response
+		stream       : BOOL, if True, parse the response incrementally and return a generator that yields each 'Page' as soon as its record has been read
 		'''
-		super().get(class_object=class_object, count=count, embed=embed, links=links)		
+		super().get(class_object=class_object, count=count, embed=embed, links=links, stream=stream)		
 
 		#if self.id:
 		#	self.url += "/{}".format(self.id)
 
 		self.populate_request_parameters() # populates 'self.parameters'
 
+		if self.id is None:
+			local = self.answer_locally(class_object, count=count, stream=stream)
+			if local is not None:
+				return local # from a complete snapshot (see 'API.preload')
+
 		try:
-			self.get_response(wpid=self.id)
+			self.get_response(wpid=self.id, stream=stream and not count)
 			logger.debug("URL='{}'".format(self.request.url))
 		except requests.exceptions.HTTPError:
 			logger.debug("page response code: {}".format(self.response.status_code))
@@ -217,38 +245,36 @@ class PageRequest(WPRequest):
 			return self.total
 			#return len(pages_data)
 
-		pages_data = self.response.json()
+		return self.entities_from_response(class_object=class_object, stream=stream)
 
-		if isinstance(pages_data, dict):
-			# only one object was returned; make it a list
-			pages_data = [pages_data]
-
-		pages = list()
-		for d in pages_data:
+	def entity_from_dictionary(self, d, class_object=Page):
+		'''
+		Returns the 'Page' for a single record of the response, creating it if it is not in the cache.
+		'''
+		# Before we continue, do we have this page in the cache already?
+		try:
+			return self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
+		except WPORMCacheObjectNotFoundError:
+			pass
 
-			# Before we continue, do we have this page in the cache already?
-			try:
-				page = self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
-			except WPORMCacheObjectNotFoundError:
-				# create new object
-				page = class_object.__new__(class_object) # default = Page()
-				page.__init__(api=self.api)
-				page.json = json.dumps(d)
+		# create new object
+		page = class_object.__new__(class_object) # default = Page()
+		page.__init__(api=self.api)
+		d = self.defer_large_fields(page, d) # may drop large HTML fields
+		page.json = json.dumps(d)
 	
-				page.update_schema_from_dictionary(d)
-		
-				if "_embedded" in d:
-					logger.debug("TODO: implement _embedded content for Page object")
+		page.update_schema_from_dictionary(d)
+
+		if "_embedded" in d:
+			self.process_embedded(page, d["_embedded"])
 	
-				# perform postprocessing for custom fields
-				page.postprocess_response()
+		# perform postprocessing for custom fields
+		page.postprocess_response()
 	
-				# add to cache
-				self.api.wordpress_object_cache.set(value=page, keys=(page.s.id, page.s.slug))
-			finally:
-				pages.append(page)
-				
-		return pages
+		# add to cache
+		self.api.wordpress_object_cache.set(value=page, keys=(page.s.id, page.s.slug))
+
+		return page
 
 	@property
 	def context(self):
@@ -321,44 +347,43 @@ class PageRequest(WPRequest):
 	def author(self, value):
 		'''
 		Set author parameter for this request; stores WordPress user ID.
+
+		Accepts a 'User', a user ID (integer or string) or the user's slug (resolved when the request is made, see 'resolve_slugs').
 		'''
 		author_id = None
+		slug = None
 
 		if value is None:
 			self.parameters.pop("author", None) # remove key
+			self._author_ids = list()
+			self._unresolved_slugs.pop("author", None)
 			return
-			#self.g = None
 
 		elif isinstance(value, User):
-			# a single user was given, replace any existing list with this one
-			self._author_ids = list()
 			author_id = value.s.id
 
 		elif isinstance(value, int):
-			# a single id was given, replace any existing list with this one
-			self._author_ids = list()
 			author_id = value # assuming WordPress ID
-			#self.parameters["author"] = value
-			#self._author = value
 
 		elif isinstance(value, str):
 			# is this string value the WordPress user ID?
 			try:
 				author_id = int(value)
 			except ValueError:
-				# nope, see if it's the username and get the User object
-				try:
-					user = self.api.user(username=value)
-					author_id = user.s.id
-				except exc.NoEntityFound:
-					raise ValueError("Could not determine a user from the value: {0} (type {1})".format(value, type(value)))
+				slug = value # nope, it's the user's slug
 
 		else:
-			raise ValueError("Unexpected value type passed to 'author' (type: '{1}')".format(type(value)))
+			raise ValueError("Unexpected value type passed to 'author' (type: '{0}')".format(type(value)))
 
-		assert author_id is not None, "could not determine author_id from value {0}".format(value)
-		#self.parameters["author"].append(str(author_id))
-		self._author_ids.append(author_id)
+		# a single user was given, replace any existing list (and slugs) with this one
+		self._author_ids = list()
+		self._unresolved_slugs.pop("author", None)
+		if slug is not None:
+			self.add_slug_filter("author", User, slug) # resolved when the request is made
+			return
+
+		# author IDs are stored as strings
+		self._author_ids.append(str(author_id))
 
 	@property
 	def after(self):
@@ -388,9 +413,9 @@ class PageRequest(WPRequest):
 		'''
 		WordPress parameter to return pages before this date.
 		'''
-		return self._after
+		return self._before
 
-	@after.setter
+	@before.setter
 	def before(self, value):
 		'''
 		Set the WordPress parameter to return pages before this date.
@@ -432,7 +457,7 @@ class PageRequest(WPRequest):
 
 	@property
 	def orderby(self):
-		return self.api_params.get('orderby', None)
+		return self._orderby
 
 	@orderby.setter
 	def orderby(self, value):
@@ -490,35 +515,34 @@ class PageRequest(WPRequest):
 		'''
 		This method validates the parent passed to this request.
 
-		It accepts parent ID (integer or string) or the slug value.
+		It accepts 'Page' objects, page IDs (integer or string) or slugs; slugs are
+		resolved to IDs together when the request is made (see 'resolve_slugs').
 		'''
 		if values is None:
 			self.parameters.pop("parent", None)
 			self._parent_ids = list()
+			self._unresolved_slugs.pop("parent", None)
 			return
 		elif not isinstance(values, list):
 			raise ValueError("Parents must be provided as a list (or append to the existing list, or None).")
 
 		for p in values:
-			par_id = None
-			if isinstance(p, int):
-#				self._category_ids.append(str(c))
+			if isinstance(p, Page):
+				par_id = p.s.id
+			elif isinstance(p, int):
 				par_id = p
 			elif isinstance(p, str):
 				try:
-					# is this a category ID value?
+					# is this a page ID value?
 					par_id = int(p)
-					#self._category_ids.append(str(int(c)))
 				except ValueError:
-					# not a category ID value, try by slug?
-					try:
-						parent = self.api.category(slug=p)
-						par_id = parent.s.id
-						#self._category_ids.append(category.s.id)
-					except exc.NoEntityFound:
-						logger.debug("Asked to find a parent with the slug '{0}' but not found.".format(slug))
-
-			# Categories are stored as string ID values.
+					# not a page ID value, it's the slug
+					self.add_slug_filter("parent", Page, p)
+					continue
+			else:
+				raise ValueError("Unexpected type for property list 'parent'; expected Page, str or int, got '{0}'".format(type(p)))
+
+			# Parents are stored as string ID values.
 			#
 			self._parent_ids.append(str(par_id))
 
@@ -531,35 +555,34 @@ class PageRequest(WPRequest):
 		'''
 		This method validates the parent_exclude passed to this request.
 
-		It accepts category ID (integer or string) or the slug value.
+		It accepts 'Page' objects, page IDs (integer or string) or slugs; slugs are
+		resolved to IDs together when the request is made (see 'resolve_slugs').
 		'''
 		if values is None:
 			self.parameters.pop("parent_exclude", None)
 			self._parent_exclude_ids = list()
+			self._unresolved_slugs.pop("parent_exclude", None)
 			return
 		elif not isinstance(values, list):
 			raise ValueError("parent_exclude must be provided as a list (or append to the existing list, or None).")
 
 		for p in values:
-			par_id = None
-			if isinstance(p, int):
-#				self._category_exclude_ids.append(str(c))
+			if isinstance(p, Page):
+				par_id = p.s.id
+			elif isinstance(p, int):
 				par_id = p
 			elif isinstance(p, str):
 				try:
-					# is this a category ID value?
+					# is this a page ID value?
 					par_id = int(p)
-					#self._category_exclude_ids.append(str(int(c)))
 				except ValueError:
-					# not a category ID value, try by slug?
-					try:
-						category = self.api.parent(slug=p)
-						par_id = parent.s.id
-						#self._category_exclude_ids.append(category.s.id)
-					except exc.NoEntityFound:
-						logger.debug("Asked to find a parent with the slug '{0}' but not found.".format(slug))
-
-			# Categories are stored as string ID values.
+					# not a page ID value, it's the slug
+					self.add_slug_filter("parent_exclude", Page, p)
+					continue
+			else:
+				raise ValueError("Unexpected type for property list 'parent_exclude'; expected Page, str or int, got '{0}'".format(type(p)))
+
+			# Parents are stored as string ID values.
 			#
 			self._parent_exclude_ids.append(str(par_id))
 
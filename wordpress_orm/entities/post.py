@@ -12,6 +12,7 @@ from datetime import datetime
 from .wordpress_entity import WPEntity, WPRequest, context_values
 from .user import User
 from .category import Category
+from .tag import Tag
 from .media import Media
 
 from .. import exc
@@ -33,8 +34,26 @@ class Post(WPEntity):
 		self._featured_media = None
 		self._comments = None
 		self._categories = None
+		self._tags = None
 		self._date_gmt = None		# datetime object
 
+	# relations that can be fetched for many posts at once with 'API.prefetch',
+	# key = relation name, value = (schema field with the related ID(s), related class, attribute caching the related object(s))
+	relations = {
+		"author"         : ("author", User, "_author"),
+		"featured_media" : ("featured_media", Media, "_featured_media"),
+		"categories"     : ("categories", Category, "_categories"),
+		"tags"           : ("tags", Tag, "_tags")
+	}
+
+	# embedded content attached to the post, key = link relation, value = relation name
+	# ("wp:term" is handled separately by 'PostRequest.process_embedded', it holds both categories and tags)
+	embedded_relations = {
+		"author"           : "author",
+		"wp:featuredmedia" : "featured_media",
+		"wp:term"          : "categories"
+	}
+
 	def __repr__(self):
 		if self.s.title is None:
 			truncated_title = "<NO TITLE SET>"
@@ -174,15 +193,8 @@ class Post(WPEntity):
 		'''
 		Returns the 'Media' object that is the "featured media" for this post.
 		'''
-		if self._featured_media is None and self.s.featured_media is not None:
-
-			media_id = self.s.featured_media
-			if media_id == 0:
-				# no featured media for this post entry (this is what WordPress returns)
-				self._featured_media = None
-			else:
-				self._featured_media = self.api.media(id=media_id)
-		return self._featured_media
+		# (None if there is no featured media, i.e. an ID of 0 is what WordPress returns)
+		return self.api.related(self, "featured_media")
 
 	@featured_media.setter
 	def featured_media(self, new_media):
@@ -263,21 +275,14 @@ class Post(WPEntity):
 	def author(self):
 		'''
 		Returns the author of this post, class: 'User'.
+
+		Raises 'exc.UserNotFound' if the user doesn't exist; when 'api.lazy_relations' is True and the
+		user is not cached, a proxy is returned and the error is raised when a field other than 'id' is first used.
 		'''
-		if self._author is None and self.s.author is not None:
-			try:
-				self._author = self.api.user(id=self.s.author)  # ID for the author of the object
-				# TODO does this put the object in the cache?
-			except exc.NoEntityFound:
-				raise exc.UserNotFound("User ID '{0}' not found.".format(self.author))
-# 			ur = self.api.UserRequest()
-# 			ur.id = self.s.author # ID for the author of the object
-# 			user_list = ur.get()
-# 			if len(user_list) == 1:
-# 				self._author = user_list[0]
-# 			else:
-# 				raise exc.UserNotFound("User ID '{0}' not found.".format(self.author))
-		return self._author
+		author = self.api.related(self, "author")
+		if author is None and self.s.author:
+			raise exc.UserNotFound("User ID '{0}' not found.".format(self.s.author))
+		return author
 
 	@author.setter
 	def author(self, author):
@@ -356,10 +361,10 @@ class Post(WPEntity):
 	@property
 	def comments(self):
 		'''
-		Returns the comments associated with this post.
+		Returns all comments associated with this post (see 'comment_tree' to organize them into threads).
 		'''
 		if self._comments is None:
-			self._comments = self.api.CommentRequest(post=self).get()
+			self.api.CommentRequest().get_for_posts([self]) # sets 'self._comments'
 		return self._comments
 
 	@property
@@ -367,14 +372,16 @@ class Post(WPEntity):
 		'''
 		Returns a list of categories (as Category objects) associated with this post.
 		'''
-		if self._categories is None and self.s.categories is not None:
-			self._categories = list()
-			for category_id in self.s.categories:
-				try:
-					self._categories.append(self.api.category(id=category_id))
-				except exc.NoEntityFound:
-					logger.debug("Expected to find category ID={0} from post (ID={1}), but no category found.".format(category_id, self.s.id))
-		return self._categories
+		# all categories not in the cache are fetched with a single request
+		return self.api.related(self, "categories")
+
+	@property
+	def tags(self):
+		'''
+		Returns a list of tags (as Tag objects) associated with this post.
+		'''
+		# all tags not in the cache are fetched with a single request
+		return self.api.related(self, "tags")
 
 	@property
 	def category_names(self):
@@ -384,10 +391,15 @@ class Post(WPEntity):
 			return list()
 
 
+Media.relations["post"] = ("post", Post, "_post")
+
 class PostRequest(WPRequest):
 	'''
 	A class that encapsulates requests for WordPress posts.
 	'''
+	supports_offset = True
+	supports_date_windows = True
+
 	def __init__(self, api=None, categories=None, slugs=None):
 		super().__init__(api=api)
 		self.id = None # WordPress ID
@@ -416,9 +428,9 @@ class PostRequest(WPRequest):
 		self._excludes = list()
 		self._slugs = list()
 		self._category_ids = list()
-		self._categories_exclude_ids = list()
-		self._tags = list() # list of IDs of tags
-		self._tags_exclude = list() # list of IDs of tags
+		self._category_exclude_ids = list()
+		self._tags = list() # list of IDs of tags (str)
+		self._tags_exclude = list() # list of IDs of tags (str)
 
 		if categories:
 			self.categories = categories
@@ -441,6 +453,8 @@ class PostRequest(WPRequest):
 		'''
 		Populates 'self.parameters' to prepare for executing a request.
 		'''
+		self.resolve_slugs() # filters given by slug, e.g. 'categories=["news"]'
+
 		if self.context:
 			self.parameters["context"] = self.context
 		else:
@@ -519,28 +533,31 @@ class PostRequest(WPRequest):
 		if self.sticky:
 			self.parameters["sticky"] = "1"
 
-	def get(self, class_object=Post, count=False, embed=True, links=True):
+	def get(self, class_object=Post, count=False, embed=True, links=True, stream=False):
 		'''
 		Returns a list of 'Post' objects that match the parameters set in this object.
 
 		class_object : the class of the objects to instantiate based on the response, used when implementing custom subclasses
 		count        : BOOL, return the number of entities matching this request, not the objects themselves
-		embed        : BOOL, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed,
-					   see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
-		links        : BOOL, if True, returns with response a map of links to other API resources
+		embed        : BOOL or list, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed;
+					   a list of link relations (e.g. ["author", "wp:featuredmedia"]) embeds only those, see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
+		links        : BOOL, if False, the map of links to other API resources ("_links") is omitted from the response
+		stream       : BOOL, if True, parse the response incrementally and return a generator that yields each 'Post' as soon as its record has been read
 		'''
-		super().get(class_object=class_object, count=count, embed=embed, links=links)
+		super().get(class_object=class_object, count=count, embed=embed, links=links, stream=stream)
 
 		#if self.id:
 		#	self.url += "/{}".format(self.id)
 
-		if embed is True:
-			self.parameters["_embed"] = "true"
-
 		self.populate_request_parameters()
 
+		if self.id is None:
+			local = self.answer_locally(class_object, count=count, stream=stream)
+			if local is not None:
+				return local # from a complete snapshot (see 'API.preload')
+
 		try:
-			self.get_response()
+			self.get_response(wpid=self.id, stream=stream and not count)
 			logger.debug("URL='{}'".format(self.request.url))
 		except requests.exceptions.HTTPError:
 			logger.debug("Post response code: {}".format(self.response.status_code))
@@ -560,91 +577,72 @@ class PostRequest(WPRequest):
 				raise Exception("Header 'X-WP-Total' was not found.") # if you are getting this, modify to use len(posts_data)
 			return self.total
 
-		posts_data = self.response.json()
-
-		if isinstance(posts_data, dict):
-			# only one object was returned; make it a list
-			posts_data = [posts_data]
+		return self.entities_from_response(class_object=class_object, stream=stream)
 
-		posts = list()
-		for d in posts_data:
+	def entity_from_dictionary(self, d, class_object=Post):
+		'''
+		Returns the 'Post' for a single record of the response, creating it if it is not in the cache.
+		'''
+		# Before we continue, do we have this Post in the cache already?
+		try:
+			return self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
+		except WPORMCacheObjectNotFoundError:
+			pass
 
-			# Before we continue, do we have this Post in the cache already?
-			try:
-				post = self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
-			except WPORMCacheObjectNotFoundError:
-				post = class_object.__new__(class_object) # default = Post()
-				post.__init__(api=self.api)
-				post.json = json.dumps(d)
-				post.update_schema_from_dictionary(d)
-
-				# Check for embedded content
-				if "_embedded" in d:
-					embedded = d["_embedded"]
-					for key in embedded:
-
-						# These are related objects, provided by the API in full.
-						# See if the objects are in the cache first, and if not, create them.
-
-						if key == "author":
-							# value is a list of objects (dictionaries), only expecting one
-							author_obj = embedded[key][0]
-							try:
-								author = self.api.wordpress_object_cache.get(class_name=User.__name__, key=author_obj["id"])
-							except WPORMCacheObjectNotFoundError:
-								author = User(api=self.api)
-								author.update_schema_from_dictionary(author_obj)
-								self.api.wordpress_object_cache.set(value=author, keys=(author.s.id, author.s.slug))
-
-							post.author = author
-
-						elif key == "wp:featuredmedia":
-							# value is a list of objects (dictionaries), only expecting one
-							media_obj = embedded[key][0]
-							try:
-								media = self.api.wordpress_object_cache.get(class_name=Media.__name__, key=media_obj["id"])
-							except WPORMCacheObjectNotFoundError:
-								media = Media(api=self.api)
-								media.update_schema_from_dictionary(media_obj)
-								self.api.wordpress_object_cache.set(value=media, keys=(media.s.id, media.s.slug))
-
-							post.featured_media = media
-
-						elif key == "wp:term":
-							# value is list of lists,
-							# first list is a list of metadata objects (can potentially be different kinds, or is this strictly 'category'?)
-							# (this is not documented)
-							# see: https://www.sitepoint.com/wordpress-term-meta/
-
-							for term_list in embedded[key]:
-								if len(term_list) == 0:
-									continue
-								for category_obj in term_list:
-									if "taxonomy" in category_obj and category_obj["taxonomy"] in ["category", "post_tag", "nav_menu", "link_category", "post_format"]:
-										try:
-											category = self.api.wordpress_object_cache.get(class_name=Category.__name__,
-																						   key=category_obj["id"])
-										except WPORMCacheObjectNotFoundError:
-											category = Category(api=self.api)
-											category.update_schema_from_dictionary(category_obj)
-											self.api.wordpress_object_cache.set(value=category, keys=(category.s.id, category.s.slug))
-
-# 										post.categories.append(category)
-									else:
-										logger.warning("Unknown taxonomy encountered in _embedded data of Post (or something else entirely): {0}".format(json.dumps(term_list)))
-						else:
-							logger.debug("Note: Unhandled embedded content in {0}, key='{1}'".format(self.__class__.__name__, key))
-
-				# perform postprocessing for custom fields
-				post.postprocess_response()
-
-				# add to cache
-				self.api.wordpress_object_cache.set(value=post, keys=(post.s.id, post.s.slug))
-
-			finally:
-				posts.append(post)
-
-		return posts
+		post = class_object.__new__(class_object) # default = Post()
+		post.__init__(api=self.api)
+		d = self.defer_large_fields(post, d) # may drop large HTML fields
+		post.json = json.dumps(d)
+		post.update_schema_from_dictionary(d)
+
+		# Check for embedded content
+		if "_embedded" in d:
+			self.process_embedded(post, d["_embedded"])
+
+		# perform postprocessing for custom fields
+		post.postprocess_response()
+
+		# add to cache
+		self.api.wordpress_object_cache.set(value=post, keys=(post.s.id, post.s.slug))
+
+		return post
+
+	def process_embedded(self, entity, embedded):
+		'''
+		Attaches the related objects embedded in a response record to the post, including terms ("wp:term").
+		'''
+		if "wp:term" in embedded:
+			# value is list of lists, one list of term objects per taxonomy
+			# (e.g. [[categories...], [tags...]], this is not documented)
+			# see: https://www.sitepoint.com/wordpress-term-meta/
+			# Note that embedded terms only contain the fields of the "embed" context.
+			terms = {Category:dict(), Tag:dict()} # key = ID, value = term object
+
+			for term_list in embedded["wp:term"]:
+				for term_obj in term_list:
+					taxonomy = term_obj.get("taxonomy", None)
+					if taxonomy == "category":
+						term_class = Category
+					elif taxonomy == "post_tag":
+						term_class = Tag
+					elif "id" not in term_obj:
+						# e.g. an error object for a taxonomy that can't be accessed
+						logger.debug("Embedded term in {0} without an ID: {1}".format(self.__class__.__name__, json.dumps(term_obj)))
+						continue
+					else:
+						logger.debug("Unhandled taxonomy '{0}' encountered in _embedded data of Post.".format(taxonomy))
+						continue
+
+					term = self.embedded_entity(term_class, term_obj)
+					terms[term_class][term.s.id] = term
+
+			# Attach the terms in the order of the post's IDs, as long as all of them were embedded
+			# (otherwise the 'categories'/'tags' properties will fetch the missing ones).
+			for term_class, ids, attribute in [(Category, entity.s.categories, "_categories"), (Tag, entity.s.tags, "_tags")]:
+				if ids is not None and all(int(i) in terms[term_class] for i in ids):
+					setattr(entity, attribute, [terms[term_class][int(i)] for i in ids])
+
+		super().process_embedded(entity, {key:value for key,value in embedded.items() if key != "wp:term"})
 
 	@property
 	def context(self):
@@ -738,44 +736,43 @@ class PostRequest(WPRequest):
 	def author(self, value):
 		'''
 		Set author parameter for this request; stores WordPress user ID.
+
+		Accepts a 'User', a user ID (integer or string) or the user's slug (resolved when the request is made, see 'resolve_slugs').
 		'''
 		author_id = None
+		slug = None
 
 		if value is None:
 			self.parameters.pop("author", None) # remove key
+			self._author_ids = list()
+			self._unresolved_slugs.pop("author", None)
 			return
-			#self.g = None
 
 		elif isinstance(value, User):
-			# a single user was given, replace any existing list with this one
-			self._author_ids = list()
 			author_id = value.s.id
 
 		elif isinstance(value, int):
-			# a single id was given, replace any existing list with this one
-			self._author_ids = list()
 			author_id = value # assuming WordPress ID
-			#self.parameters["author"] = value
-			#self._author = value
 
 		elif isinstance(value, str):
 			# is this string value the WordPress user ID?
 			try:
 				author_id = int(value)
 			except ValueError:
-				# nope, see if it's the username and get the User object
-				try:
-					user = self.api.user(username=value)
-					author_id = user.s.id
-				except exc.NoEntityFound:
-					raise ValueError("Could not determine a user from the value: {0} (type {1})".format(value, type(value)))
+				slug = value # nope, it's the user's slug
 
 		else:
-			raise ValueError("Unexpected value type passed to 'author' (type: '{1}')".format(type(value)))
+			raise ValueError("Unexpected value type passed to 'author' (type: '{0}')".format(type(value)))
+
+		# a single user was given, replace any existing list (and slugs) with this one
+		self._author_ids = list()
+		self._unresolved_slugs.pop("author", None)
+		if slug is not None:
+			self.add_slug_filter("author", User, slug) # resolved when the request is made
+			return
 
-		assert author_id is not None, "could not determine author_id from value {0}".format(value)
-		#self.parameters["author"].append(str(author_id))
-		self._author_ids.append(author_id)
+		# author IDs are stored as strings
+		self._author_ids.append(str(author_id))
 
 	@property
 	def author_exclude(self):
@@ -785,45 +782,43 @@ class PostRequest(WPRequest):
 	def author_exclude(self, value):
 		'''
 		Set author to exclude from this query; stores WordPress user ID.
+
+		Accepts a 'User', a user ID (integer or string) or the user's slug (resolved when the request is made, see 'resolve_slugs').
 		'''
 		author_id = None
-
-		# plan: define author_id, append to "self._author_ids" list below
+		slug = None
 
 		if value is None:
 			self.parameters.pop("author_exclude", None) # remove key
+			self._author_exclude = list()
+			self._unresolved_slugs.pop("author_exclude", None)
 			return
-			#self.g = None
 
 		elif isinstance(value, User):
-			# a single user was given, replace any existing list with this one
-			self._author_exclude = list()
 			author_id = value.s.id
 
 		elif isinstance(value, int):
-			# a single id was given, replace any existing list with this one
-			self._author_exclude = list()
 			author_id = value # assuming WordPress ID
-			#self.parameters["author"] = value
-			#self._author = value
 
 		elif isinstance(value, str):
 			# is this string value the WordPress user ID?
 			try:
 				author_id = int(value)
 			except ValueError:
-				# nope, see if it's the username and get the User object
-				try:
-					user = self.api.user(username=value)
-					author_id = user.s.id
-				except exc.NoEntityFound:
-					raise ValueError("Could not determine a user from the value: '{0}' (type '{1}')".format(value, type(value)))
+				slug = value # nope, it's the user's slug
 
 		else:
-			raise ValueError("Unexpected value type passed to 'author_exclude' (type: '{1}')".format(type(value)))
+			raise ValueError("Unexpected value type passed to 'author_exclude' (type: '{0}')".format(type(value)))
 
-		assert author_id is not None, "Could not determine author_id from value '{0}'.".format(value)
-		self._author_exclude.append(author_id)
+		# a single user was given, replace any existing list (and slugs) with this one
+		self._author_exclude = list()
+		self._unresolved_slugs.pop("author_exclude", None)
+		if slug is not None:
+			self.add_slug_filter("author_exclude", User, slug) # resolved when the request is made
+			return
+
+		# author IDs are stored as strings
+		self._author_exclude.append(str(author_id))
 
 	@property
 	def before(self):
@@ -832,7 +827,7 @@ class PostRequest(WPRequest):
 		'''
 		return self._before
 
-	@after.setter
+	@before.setter
 	def before(self, value):
 		'''
 		Set the WordPress parameter to return posts before this date.
@@ -1024,36 +1019,32 @@ class PostRequest(WPRequest):
 		'''
 		This method validates the categories passed to this request.
 
-		It accepts category ID (integer or string) or the slug value.
+		It accepts 'Category' objects, category IDs (integer or string) or slugs; slugs are
+		resolved to IDs together when the request is made (see 'resolve_slugs').
 		'''
 		if values is None:
 			self.parameters.pop("categories", None)
 			self._category_ids = list()
+			self._unresolved_slugs.pop("categories", None)
 			return
 		elif not isinstance(values, list):
 			raise ValueError("Categories must be provided as a list (or append to the existing list, or None).")
 
 		for c in values:
-			cat_id = None
 			if isinstance(c, Category):
 				cat_id = c.s.id
-#				self._category_ids.append(str(c.s.id))
 			elif isinstance(c, int):
-#				self._category_ids.append(str(c))
 				cat_id = c
 			elif isinstance(c, str):
 				try:
 					# is this a category ID value?
 					cat_id = int(c)
-					#self._category_ids.append(str(int(c)))
 				except ValueError:
-					# not a category ID value, try by slug?
-					try:
-						category = self.api.category(slug=c)
-						cat_id = category.s.id
-						#self._category_ids.append(category.s.id)
-					except exc.NoEntityFound:
-						logger.debug("Asked to find a category with the slug '{0}' but not found.".format(slug))
+					# not a category ID value, it's the slug
+					self.add_slug_filter("categories", Category, c)
+					continue
+			else:
+				raise ValueError("Unexpected type for property list 'categories'; expected Category, str or int, got '{0}'".format(type(c)))
 
 			# Categories are stored as string ID values.
 			#
@@ -1068,36 +1059,32 @@ class PostRequest(WPRequest):
 		'''
 		This method validates the categories_exclude passed to this request.
 
-		It accepts category ID (integer or string) or the slug value.
+		It accepts 'Category' objects, category IDs (integer or string) or slugs; slugs are
+		resolved to IDs together when the request is made (see 'resolve_slugs').
 		'''
 		if values is None:
 			self.parameters.pop("categories_exclude", None)
 			self._category_exclude_ids = list()
+			self._unresolved_slugs.pop("categories_exclude", None)
 			return
 		elif not isinstance(values, list):
 			raise ValueError("categories_exclude must be provided as a list (or append to the existing list, or None).")
 
 		for c in values:
-			cat_id = None
 			if isinstance(c, Category):
 				cat_id = c.s.id
-#				self._category_exclude_ids.append(str(c.s.id))
 			elif isinstance(c, int):
-#				self._category_exclude_ids.append(str(c))
 				cat_id = c
 			elif isinstance(c, str):
 				try:
 					# is this a category ID value?
 					cat_id = int(c)
-					#self._category_exclude_ids.append(str(int(c)))
 				except ValueError:
-					# not a category ID value, try by slug?
-					try:
-						category = self.api.category(slug=c)
-						cat_id = category.s.id
-						#self._category_exclude_ids.append(category.s.id)
-					except exc.NoEntityFound:
-						logger.debug("Asked to find a category with the slug '{0}' but not found.".format(slug))
+					# not a category ID value, it's the slug
+					self.add_slug_filter("categories_exclude", Category, c)
+					continue
+			else:
+				raise ValueError("Unexpected type for property list 'categories_exclude'; expected Category, str or int, got '{0}'".format(type(c)))
 
 			# Categories are stored as string ID values.
 			#
@@ -1113,25 +1100,32 @@ class PostRequest(WPRequest):
 	@tags.setter
 	def tags(self, values):
 		'''
-		List of tag IDs that are required to be attached to items returned from query.
+		List of tags required to be attached to items returned from query.
+
+		Accepts 'Tag' objects, tag IDs (integer or string) or slugs; slugs are resolved to IDs
+		together when the request is made (see 'resolve_slugs').
 		'''
 		if values is None:
 			self.parameters.pop("tags", None)
 			self._tags = list()
+			self._unresolved_slugs.pop("tags", None)
 			return
 		elif not isinstance(values, list):
-			raise ValueError("Tags must be provided as a list of IDs (or append to the existing list).")
-
-		for tag_id in values:
-			if isinstance(tag_id, int):
-				self.tags.append(str(tag_id))
-			elif isinstance(tag_id, str):
+			raise ValueError("Tags must be provided as a list (or append to the existing list).")
+
+		for tag in values:
+			if isinstance(tag, Tag):
+				self._tags.append(str(tag.s.id))
+			elif isinstance(tag, int):
+				self._tags.append(str(tag))
+			elif isinstance(tag, str):
 				try:
-					self.tags.append(str(int(tag_id)))
+					self._tags.append(str(int(tag)))
 				except ValueError:
-					raise ValueError("The given tag was in the form of a string but could not be converted to an integer ('{0}').".format(tag_id))
+					# not a tag ID value, it's the slug
+					self.add_slug_filter("tags", Tag, tag)
 			else:
-				raise ValueError("Unexpected type for property list 'tags'; expected str or int, got '{0}'".format(type(s)))
+				raise ValueError("Unexpected type for property list 'tags'; expected Tag, str or int, got '{0}'".format(type(tag)))
 
 	@property
 	def tags_exclude(self):
@@ -1143,25 +1137,32 @@ class PostRequest(WPRequest):
 	@tags_exclude.setter
 	def tags_exclude(self, values):
 		'''
-		List of tag IDs attached to items to be excluded from query.
+		List of tags attached to items to be excluded from query.
+
+		Accepts 'Tag' objects, tag IDs (integer or string) or slugs; slugs are resolved to IDs
+		together when the request is made (see 'resolve_slugs').
 		'''
 		if values is None:
-			self.parameters.pop("tags", None)
+			self.parameters.pop("tags_exclude", None)
 			self._tags_exclude = list()
+			self._unresolved_slugs.pop("tags_exclude", None)
 			return
 		elif not isinstance(values, list):
-			raise ValueError("Tags must be provided as a list of IDs (or append to the existing list).")
-
-		for tag_id in values:
-			if isinstance(tag_id, int):
-				self._tags_exclude.append(tag_id)
-			elif isinstance(tag_id, str):
+			raise ValueError("Tags must be provided as a list (or append to the existing list).")
+
+		for tag in values:
+			if isinstance(tag, Tag):
+				self._tags_exclude.append(str(tag.s.id))
+			elif isinstance(tag, int):
+				self._tags_exclude.append(str(tag))
+			elif isinstance(tag, str):
 				try:
-					self._tags_exclude.append(str(int(tag_id)))
+					self._tags_exclude.append(str(int(tag)))
 				except ValueError:
-					raise ValueError("The given tag was in the form of a string but could not be converted to an integer ('{0}').".format(tag_id))
+					# not a tag ID value, it's the slug
+					self.add_slug_filter("tags_exclude", Tag, tag)
 			else:
-				raise ValueError("Unexpected type for property list 'tags'; expected str or int, got '{0}'".format(type(s)))
+				raise ValueError("Unexpected type for property list 'tags_exclude'; expected Tag, str or int, got '{0}'".format(type(tag)))
 
 	@property
 	def sticky(self):
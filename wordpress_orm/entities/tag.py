@@ -99,6 +99,8 @@ class TagRequest(WPRequest):
 	'''
 	A class that encapsulates requests for WordPress tags.
 	'''
+	supports_offset = True
+
 	def __init__(self, api=None, categories=None, slugs=None):
 		super().__init__(api=api)
 		self.id = None # WordPress ID
@@ -119,6 +121,7 @@ class TagRequest(WPRequest):
 		self._per_page = None
 
 		self._slugs = list()
+		self._includes = list()
 
 		if slugs:
 			self.slugs = slugs
@@ -152,8 +155,8 @@ class TagRequest(WPRequest):
 		if self.exclude:
 			self.parameters["exclude"] = self.tags_exclude
 
-		if self.include:
-			self.parameters["include"] = self.include
+		if len(self.include) > 0:
+			self.parameters["include"] = ",".join(self.include)
 
 		if self.offset:
 			self.parameters["offset"] = self.offset
@@ -170,23 +173,29 @@ class TagRequest(WPRequest):
 		if self.order:
 			self.parameters["order"] = self.order
 
-	def get(self, class_object=Tag, count=False, embed=True, links=True):
+		if self.orderby:
+			self.parameters["orderby"] = self.orderby
+
+	def get(self, class_object=Tag, count=False, embed=True, links=True, stream=False):
 		'''
 		Returns a list of 'Tag' objects that match the parameters set in this object.
 
 		class_object : the class of the objects to instantiate based on the response, used when implementing custom subclasses
 		count        : BOOL, return the number of entities matching this request, not the objects themselves
-		embed        : BOOL, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed,
-			           see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
-		links        : BOOL, if True, returns with response a map of links to other API resources
+		embed        : BOOL or list, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed;
+			           a list of link relations (e.g. ["author", "wp:featuredmedia"]) embeds only those, see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
+		links        : BOOL, if False, the map of links to other API resources ("_links") is omitted from the response
+		stream       : BOOL, if True, parse the response incrementally and return a generator that yields each 'Tag' as soon as its record has been read
 		'''
-		super().get(class_object=class_object, count=count, embed=embed, links=links)
+		super().get(class_object=class_object, count=count, embed=embed, links=links, stream=stream)
 
 		#if self.id:
 		#	self.url += "/{}".format(self.id)
 
+		self.populate_request_parameters()
+
 		try:
-			self.get_response(wpid=self.id)
+			self.get_response(wpid=self.id, stream=stream and not count)
 			logger.debug("URL='{}'".format(self.request.url))
 		except requests.exceptions.HTTPError:
 			logger.debug("page response code: {}".format(self.response.status_code))
@@ -205,42 +214,34 @@ class TagRequest(WPRequest):
 				raise Exception("Header 'X-WP-Total' was not found.") # if you are getting this, modify to use len(posts_data)
 			return self.total
 
-		tags_data = self.response.json()
-
-		if isinstance(tags_data, dict):
-			# only one object was returned; make it a list
-			tags_data = [tags_data]
-
-		if count:
-			return len(tags_data)
-
-		tags = list()
-		for d in tags_data:
-
-			# Before we continue, do we have this page in the cache already?
-			try:
-				tag = self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
-			except WPORMCacheObjectNotFoundError:
+		return self.entities_from_response(class_object=class_object, stream=stream)
 
-				tag = class_object.__new__(class_object) # default = Tag()
-				tag.__init__(api=self.api)
-				tag.json = json.dumps(d)
+	def entity_from_dictionary(self, d, class_object=Tag):
+		'''
+		Returns the 'Tag' for a single record of the response, creating it if it is not in the cache.
+		'''
+		# Before we continue, do we have this Tag in the cache already?
+		try:
+			return self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
+		except WPORMCacheObjectNotFoundError:
+			pass
 
-				tag.update_schema_from_dictionary(d)
+		tag = class_object.__new__(class_object) # default = Tag()
+		tag.__init__(api=self.api)
+		tag.json = json.dumps(d)
 
-				if "_embedded" in d:
-					logger.debug("TODO: implement _embedded content for Tag object")
+		tag.update_schema_from_dictionary(d)
 
-				# perform postprocessing for custom fields
-				tag.postprocess_response()
+		if "_embedded" in d:
+			self.process_embedded(tag, d["_embedded"])
 
-				# add to cache
-				self.api.wordpress_object_cache.set(value=tag, keys=(tag.s.id, tag.s.slug))
+		# perform postprocessing for custom fields
+		tag.postprocess_response()
 
-			finally:
-				tags.append(tag)
+		# add to cache
+		self.api.wordpress_object_cache.set(value=tag, keys=(tag.s.id, tag.s.slug))
 
-		return tags
+		return tag
 
 	@property
 	def context(self):
@@ -264,6 +265,28 @@ class TagRequest(WPRequest):
 				pass
 			raise ValueError ("'context' may only be one of ['view', 'embed', 'edit']")
 
+	@property
+	def include(self):
+		return self._includes
+
+	@include.setter
+	def include(self, values):
+		'''
+		Limit result set to specified WordPress tags IDs, provided as a list.
+		'''
+		if values is None:
+			self.parameters.pop("include", None)
+			self._includes = list()
+			return
+		elif not isinstance(values, list):
+			raise ValueError("Includes must be provided as a list (or append to the existing list).")
+
+		for include_id in values:
+			try:
+				self._includes.append(str(int(include_id)))
+			except (ValueError, TypeError):
+				raise ValueError("The WordPress ID (an integer, '{0}' given) must be provided to limit result to specific tags.".format(include_id))
+
 	@property
 	def page(self):
 		'''
@@ -329,7 +352,7 @@ class TagRequest(WPRequest):
 
 	@property
 	def orderby(self):
-		return self.api_params.get('orderby', None)
+		return self._orderby
 
 	@orderby.setter
 	def orderby(self, value):
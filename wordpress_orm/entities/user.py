@@ -9,20 +9,24 @@ import requests
 
 from .wordpress_entity import WPEntity, WPRequest, context_values
 from ..cache import WPORMCacheObjectNotFoundError
-from ..exc import AuthenticationRequired, MissingRequiredParameter
+from ..paginated import PaginatedList
+from ..exc import AuthenticationRequired, MissingRequiredParameter, UserNotFound
 
 logger = logging.getLogger(__name__.split(".")[0]) # package name
 
+order_values = ["asc", "desc"]
+orderby_values = ["id", "include", "name", "registered_date", "slug", "include_slugs", "email", "url"]
+
 class User(WPEntity):
 	
+	not_found_error = UserNotFound
+
 	def __init__(self, id=None, session=None, api=None, from_dictionary=None):
 		super().__init__(api=api)
 		
 		# parameters that undergo validation, i.e. need custom setter
 		self._context = None
 
-		# cache related objects
-		self._posts = None			
 		
 	@property
 	def schema_fields(self):
@@ -64,17 +68,24 @@ class User(WPEntity):
 				if getattr(self.s, field) is None:
 					raise MissingRequiredParameter("The '{0}' field must be provided when creating a new user.".format(field))
 		
-		response = self.api.session.post(url=self.url, params=parameters, auth=self.api.auth())
+		response = self.api.http_request("POST", self.url, params=parameters)
 				
 		return response
 
 	@property
 	def posts(self):
-		if self._posts is None:
+		'''
+		Returns the posts written by this user, a lazy paginated collection (class: 'PaginatedList').
+		
+		Posts are only requested as they are accessed, e.g. 'len(user.posts)', 'user.posts[:20]', or iterating over it.
+		Each access returns a new collection, which reads the site again.
+		'''
+		def post_request():
 			pr = self.api.PostRequest()
-			pr.author = self
-			self._posts = pr.get()
-		return self._posts
+			pr.author = self.s.id
+			return pr
+		from .post import Post # the 'post' module imports this one
+		return PaginatedList(api=self.api, request_factory=post_request, class_object=Post)
 
 	def __repr__(self):
 		return "<WP {0} object at {1}, id={2}, name='{3}'>".format(self.__class__.__name__, hex(id(self)), self.s.id, self.s.name)
@@ -128,6 +139,8 @@ class UserRequest(WPRequest):
 	'''
 	A class that encapsulates requests for WordPress users.
 	'''
+	supports_offset = True
+
 	def __init__(self, api=None):
 		super().__init__(api=api)
 		self.id = None # WordPress ID
@@ -181,11 +194,11 @@ class UserRequest(WPRequest):
 
 		# include : Limit result set to specific IDs.
 		if len(self._includes) > 0:
-			self.parameters["include"] = ",".join.self.includes
+			self.parameters["include"] = ",".join(self.include)
 			
 		# offset : Offset the result set by a specific number of items.
 		if self.offset:
-			self.parameters["offset"] = self.search
+			self.parameters["offset"] = self.offset
 		
 		# order : Order sort attribute ascending or descending, default "asc", one of ["asc", "desc"]
 		if self.order:
@@ -203,24 +216,25 @@ class UserRequest(WPRequest):
 		if len(self.roles) > 0:
 			self.parameters["roles"] = ",".join(self.roles)
 
-	def get(self, class_object=User, count=False, embed=True, links=True):
+	def get(self, class_object=User, count=False, embed=True, links=True, stream=False):
 		'''
 		Returns a list of 'Tag' objects that match the parameters set in this object.
 		
 		class_object : the class of the objects to instantiate based on the response, used when implementing custom subclasses
 		count        : BOOL, return the number of entities matching this request, not the objects themselves
-		embed        : BOOL, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed,
-			           see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
-		links        : BOOL, if True, returns with response a map of links to other API resources
+		embed        : BOOL or list, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed;
+			           a list of link relations (e.g. ["author", "wp:featuredmedia"]) embeds only those, see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
+		links        : BOOL, if False, the map of links to other API resources ("_links") is omitted from the response
+		stream       : BOOL, if True, parse the response incrementally and return a generator that yields each 'User' as soon as its record has been read
 		'''
-		super().get(class_object=class_object, count=count, embed=embed, links=links)
+		super().get(class_object=class_object, count=count, embed=embed, links=links, stream=stream)
 		#if self.id:
 		#	self.url += "/{}".format(self.id)
 		
 		self.populate_request_parameters()
 
 		try:
-			self.get_response(wpid=self.id)
+			self.get_response(wpid=self.id, stream=stream and not count)
 			logger.debug("URL='{}'".format(self.request.url))
 		except requests.exceptions.HTTPError:
 			logger.debug("User response code: {}".format(self.response.status_code))
@@ -243,40 +257,37 @@ class UserRequest(WPRequest):
 				raise Exception("Header 'X-WP-Total' was not found.") # if you are getting this, modify to use len(posts_data)
 			return self.total
 	
-		users_data = self.response.json()
-		
-		if isinstance(users_data, dict):
-			# only one object was returned; make it a list
-			users_data = [users_data]
-	
-		users = list()
-		for d in users_data:
+		return self.entities_from_response(class_object=class_object, stream=stream)
 
-			# Before we continue, do we have this User in the cache already?
-			try:
-				user = self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
-			except WPORMCacheObjectNotFoundError:
-				user = class_object.__new__(class_object)
-				user.__init__(api=self.api)
-				user.json = json.dumps(d)
-				
-				user.update_schema_from_dictionary(d)
-				
-				if "_embedded" in d:
-					logger.debug("TODO: implement _embedded content for User object")
-	
-				# perform postprocessing for custom fields
-				user.postprocess_response()
-				
-				# add to cache
-				self.api.wordpress_object_cache.set(value=user, keys=(user.s.id, user.s.slug))
-			finally:
-				users.append(user)
+	# ================================= query properties ==============================
 
-		return users
+	def entity_from_dictionary(self, d, class_object=User):
+		'''
+		Returns the 'User' for a single record of the response, creating it if it is not in the cache.
+		'''
+		# Before we continue, do we have this User in the cache already?
+		try:
+			return self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"])
+		except WPORMCacheObjectNotFoundError:
+			pass
 
-	# ================================= query properties ==============================
+		user = class_object.__new__(class_object)
+		user.__init__(api=self.api)
+		user.json = json.dumps(d)
+		
+		user.update_schema_from_dictionary(d)
+		
+		if "_embedded" in d:
+			self.process_embedded(user, d["_embedded"])
 	
+		# perform postprocessing for custom fields
+		user.postprocess_response()
+		
+		# add to cache
+		self.api.wordpress_object_cache.set(value=user, keys=(user.s.id, user.s.slug))
+
+		return user
+
 	@property
 	def context(self):
 		return self._context
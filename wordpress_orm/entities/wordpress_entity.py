@@ -1,14 +1,27 @@
 
+import copy
+import json
 import inspect
+import contextlib
 import logging
+import functools
 from abc import ABCMeta, abstractmethod, abstractproperty
 
-import requests
+from ..json_stream import iter_json_records
+from .. import exc
+from .. import columns
+from .. import windows
+from .. import tuning
+from .. import explain
+from ..cache import WPORMCacheObjectNotFoundError
+from ..compiled import CompiledRequest
 
 logger = logging.getLogger(__name__.split(".")[0]) # package name
 
 context_values = ["view", "embed", "edit"]
 
+MAX_PER_PAGE = 100 # largest page size WordPress allows
+
 class WPSchema():
 	'''
 	Object representing the schema for each WordPress entity.
@@ -16,12 +29,65 @@ class WPSchema():
 	#
 	# Properties are defined based on the field names, see below.
 	#
-	pass
+	# A field can instead be given a "loader", a function that returns its value
+	# when the field is first accessed (see 'defer_field').
+	#
+	def __getattr__(self, name):
+		# only called when 'name' is not a regular attribute
+		loaders = self.__dict__.get("_loaders", None)
+		if loaders is not None and name in loaders:
+			value = loaders.pop(name)()
+			setattr(self, name, value)
+			return value
+		raise AttributeError("'{0}' object has no attribute '{1}'".format(self.__class__.__name__, name))
+
+	def defer_field(self, name, loader):
+		'''
+		Remove the value of the field 'name'; it will be set from 'loader()' when next accessed.
+		'''
+		if "_loaders" not in self.__dict__:
+			self._loaders = dict()
+		self.__dict__.pop(name, None)
+		self._loaders[name] = loader
+
+	def is_deferred(self, name):
+		'''
+		Returns True if the value of the field 'name' has not been loaded.
+		'''
+		return name in self.__dict__.get("_loaders", dict())
+
+def fetch_field(api, url, field):
+	'''
+	Fetches the value of a single field of one entity from the API, e.g. a field that was not kept in the cache.
+	
+	api   : the API object
+	url   : URL of the entity, e.g. ".../wp/v2/posts/12"
+	field : the name of the field
+	'''
+	parameters = {"_fields":field, "context":"view"}
+	response = api.http_request("GET", url, params=parameters)
+	response.raise_for_status()
+	value = response.json().get(field, None)
+	if isinstance(value, dict) and "rendered" in value:
+		value = value["rendered"]
+	return value
 
 class WPEntity(metaclass=ABCMeta):
 	'''
 	Abstract superclass for all entities of the WordPress API.
 	'''
+	# Relations to other entities,
+	# key = relation name, value = (schema field with the related ID(s), related class, attribute caching the related object(s))
+	relations = dict()
+
+	# Embedded content (see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding)
+	# that is attached to the entity, key = link relation (key in "_embedded"), value = relation name (key in 'relations').
+	# Passing 'list(embedded_relations)' as 'embed' to a request embeds only the content that will be used.
+	embedded_relations = dict()
+
+	# raised when an entity of this class is not found, e.g. by a 'WPEntityProxy'
+	not_found_error = exc.NoEntityFound
+
 	def __init__(self, api=None):
 		
 		if api is None:
@@ -41,6 +107,21 @@ class WPEntity(metaclass=ABCMeta):
 		for field in self.post_fields:
 			setattr(self.s, field, None)
 				
+	def __eq__(self, other):
+		'''
+		Entities are equal if they are the same WordPress entity (same class and ID), also when one is a 'WPEntityProxy'.
+		An entity without an ID (not created in WordPress yet) is only equal to itself.
+		'''
+		if other is self:
+			return True
+		if isinstance(other, (WPEntity, WPEntityProxy)):
+			return self.s.id is not None and other.__class__ is self.__class__ and other.s.id == self.s.id
+		return NotImplemented
+
+	def __hash__(self):
+		# the same as the hash of a proxy of this entity
+		return hash((self.__class__.__name__, self.s.id))
+
 	@abstractproperty
 	def schema_fields(self):
 		'''
@@ -75,12 +156,9 @@ class WPEntity(metaclass=ABCMeta):
 		'''
 		Implementation of HTTP POST comment for WordPress entities.
 		'''
-		if self.api.session is None:
-			self.post_response = requests.post(url=url, data=data, params=parameters, auth=self.api.auth())
-		else:
-			# use existing session
-			self.post_response = self.api.session.post(url=url, data=data, params=parameters, auth=self.api.auth())
+		self.post_response = self.api.http_request("POST", url, params=parameters, data=data)
 		self.post_response.raise_for_status()
+		self.api.local_index.discard(type(self)) # a snapshot of the class is no longer complete
 
 	def preprocess_additional_post_fields(self, data=None, parameters=None):
 		'''
@@ -102,14 +180,17 @@ class WPEntity(metaclass=ABCMeta):
 			raise ValueError("The method 'update_schema_from_dictionary' expects a dictionary.")
 		
 		fields = self.schema_fields
+		value_pool = getattr(self.api, "value_pool", None) # shares repeated values between entities
 		
 		for key in fields:
 			if key in d:
-				if isinstance(d[key], dict) and "rendered" in d[key]:
+				value = d[key]
+				if isinstance(value, dict) and "rendered" in value:
 					# for some fields, we want the "rendered" value - any cases where we don't??
-					setattr(self.s, key, d[key]["rendered"])
-				else:
-					setattr(self.s, key, d[key])
+					value = value["rendered"]
+				if value_pool is not None:
+					value = value_pool.share(key, value)
+				setattr(self.s, key, value)
 			if key not in fields:
 				logger.debug("WARNING: encountered field ('{0}') in dictionary that is not in the list of schema fields for '{1}' (fields: {2}).".format(key, self.__class__.__name__, fields))
 		
@@ -117,10 +198,101 @@ class WPEntity(metaclass=ABCMeta):
 			# TODO: handle _links if present
 			raise NotImplementedError("Processing '_links' has not yet been implemented.")
 
+class WPEntityProxy:
+	'''
+	Stand-in for a related entity that has not been fetched yet, e.g. the value of 'post.author'.
+	
+	The proxy holds the entity's class and WordPress ID (and any other fields known). Reading
+	'proxy.s.id' (or another known field) makes no request. The first time anything else is
+	accessed, the entity is fetched (through the cache, see 'API.fetch_by_ids'), and from then on
+	the proxy behaves as the entity; 'isinstance(proxy, User)' is also True for a 'User' proxy,
+	and a proxy is equal to (and has the same hash as) its entity. If the entity doesn't exist,
+	the 'not_found_error' of its class is raised at that point (e.g. 'exc.UserNotFound').
+	Proxies created together (e.g. the categories of a post) are fetched together.
+	'''
+	__slots__ = ("_api", "_class_object", "_fields", "_batch", "_entity", "s")
+	
+	def __init__(self, api, class_object, wpid, fields=None, batch=None):
+		'''
+		api          : the API object
+		class_object : the class of the entity, e.g. 'User'
+		wpid         : WordPress ID of the entity
+		fields       : dictionary of other known field values, key = field name
+		batch        : list of IDs (of the same class) to fetch together with this one
+		'''
+		object.__setattr__(self, "_api", api)
+		object.__setattr__(self, "_class_object", class_object)
+		object.__setattr__(self, "_fields", dict(fields or dict(), id=int(wpid)))
+		object.__setattr__(self, "_batch", batch)
+		object.__setattr__(self, "_entity", None)
+		object.__setattr__(self, "s", WPSchemaProxy(self))
+	
+	@property
+	def __class__(self):
+		return self._class_object
+	
+	def __repr__(self):
+		if self._entity is not None:
+			return repr(self._entity)
+		return "<WP {0} proxy at {1}, id={2}>".format(self._class_object.__name__, hex(id(self)), self._fields["id"])
+	
+	def __eq__(self, other):
+		if isinstance(other, (WPEntity, WPEntityProxy)):
+			# 'type(self)' is 'WPEntityProxy', '__class__' is the class of the entity (for both proxies and entities)
+			return other.__class__ is self.__class__ and other.s.id == self.s.id
+		return NotImplemented
+	
+	def __hash__(self):
+		# the same as the hash of the entity (see 'WPEntity.__hash__')
+		return hash((self._class_object.__name__, self._fields["id"]))
+	
+	def __getattr__(self, name):
+		# only called when 'name' is not a regular attribute
+		return getattr(self.resolve(), name)
+	
+	def __setattr__(self, name, value):
+		setattr(self.resolve(), name, value)
+	
+	def resolve(self):
+		'''
+		Returns the entity, fetching it if it is not in the cache.
+		'''
+		if self._entity is None:
+			wpid = self._fields["id"]
+			found = self._api.fetch_by_ids(self._class_object, self._batch or [wpid])
+			if wpid not in found:
+				raise self._class_object.not_found_error("{0} ID '{1}' not found.".format(self._class_object.__name__, wpid))
+			object.__setattr__(self, "_entity", found[wpid])
+		return self._entity
+
+class WPSchemaProxy:
+	'''
+	The 's' object of a 'WPEntityProxy'; known fields are returned without fetching the entity.
+	'''
+	__slots__ = ("_proxy",)
+	
+	def __init__(self, proxy):
+		object.__setattr__(self, "_proxy", proxy)
+	
+	def __getattr__(self, name):
+		fields = object.__getattribute__(self._proxy, "_fields")
+		if name in fields:
+			return fields[name]
+		return getattr(self._proxy.resolve().s, name)
+	
+	def __setattr__(self, name, value):
+		setattr(self._proxy.resolve().s, name, value)
+
 class WPRequest(metaclass=ABCMeta):
 	'''
 	Abstract superclass for WordPress requests.
 	'''
+	# True if the request sends the 'offset' parameter (see 'QuerySet.window')
+	supports_offset = False
+
+	# True if the request sends the 'after' and 'before' parameters (see 'get_all_by_date')
+	supports_date_windows = False
+
 	def __init__(self, api=None):
 		
 		if api is None:
@@ -134,9 +306,14 @@ class WPRequest(metaclass=ABCMeta):
 		self.api = api
 		self.url = None
 		self.parameters = dict()
+		self.stream_chunk_size = 65536 # bytes read from the connection at a time when streaming
 		self.context = None		# parameter found on all entities
 		self.response = None
+		self.http_method = "GET"	# "HEAD" when only the response headers are needed
+		self.counting = False		# True when the last 'get' only counted the matching entities (see 'get_response')
+		self.refresh = False		# if True, cached entities are updated with the values in the response (see 'refreshed_entity')
 		self._parameter_names = None
+		self._unresolved_slugs = dict() # key = filter (e.g. "categories"), value = (class of the entities, list of slugs)
 
 		for arg in self.parameter_names:
 			setattr(self, arg, None)
@@ -152,28 +329,357 @@ class WPRequest(metaclass=ABCMeta):
 	def parameter_names(self):
 		pass
 
-	def get(self, class_object=None, count=False, embed=True, links=True):
+	def get(self, class_object=None, count=False, embed=True, links=True, stream=False):
 		'''
 		Base implementation of the HTTP GET request to fetch WordPress entities.
 		
 		class_object : the class of the objects to instantiate based on the response, used when implementing custom subclasses
 		count        : BOOL, return the number of entities matching this request, not the objects themselves
-		embed        : BOOL, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed,
-			           see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
-		links        : BOOL, if True, returns with response a map of links to other API resources
+		embed        : BOOL or list, if True, embed details on linked resources (e.g. URLs) instead of just an ID in response to reduce number of HTTPS calls needed;
+			           a list of link relations (e.g. ["author", "wp:featuredmedia"]) embeds only those, see: https://developer.wordpress.org/rest-api/using-the-rest-api/linking-and-embedding/#embedding
+		links        : BOOL, if False, the map of links to other API resources ("_links") is omitted from the response
+		stream       : BOOL, if True, parse the response incrementally and return a generator that yields each entity as soon as its record has been read
 		'''
+		if count != self.counting:
+			self.response = None # the response to a count has no entities to reuse (nor the other way around)
+		self.counting = count
+		if count:
+			embed = False
+
 		if embed is True:
 			self.parameters["_embed"] = "true"
-		if links is True:
-			self.parameters["_links"] = "true"
-			
-		if count:
-			request_context = "embed" # only counting results, this is a shorter response
+		elif embed:
+			# only embed the given link relations, e.g. "_embed=author,wp:featuredmedia" (WordPress 5.4+)
+			self.parameters["_embed"] = ",".join(embed)
 		else:
-			request_context = "view" # default value
-			
-		# if the user set the 
+			self.parameters.pop("_embed", None)
+
+		if links is False and "_fields" not in self.parameters and isinstance(class_object, type) and issubclass(class_object, WPEntity):
+			# "_links" is always returned unless the response is limited to the given fields
+			fields = list(class_object(api=self.api).schema_fields)
+			if embed:
+				fields.append("_embedded")
+			self.parameters["_fields"] = ",".join(fields)
 	
+	def get_all(self, **kwargs):
+		'''
+		Returns a list of all entities that match this request, reading every page of results.
+		
+		The first page is requested to learn the number of pages ('X-WP-TotalPages'); the
+		remaining pages are then requested in parallel (up to 'api.max_workers' at a time).
+		If 'per_page' is not set, the largest page size WordPress allows (100) is used, or, if
+		'api.adaptive_paging' is True, the page size and number of parallel requests chosen by
+		'api.page_tuner' (see the 'tuning' module); pages that then fail with a server error are
+		read again, one at a time. Takes the same keyword arguments as 'get' (except 'count' and 'stream').
+		'''
+		tuner = self.api.page_tuner if self.api.adaptive_paging and self.per_page is None else None
+		setting = (MAX_PER_PAGE, None) # per_page, maximum number of parallel requests
+		if tuner is not None:
+			setting = tuner.setting(self.url)
+		if self.per_page is None:
+			self.per_page = setting[0]
+		first_page = self.page or 1
+		self.page = first_page
+
+		measure = tuner.measure(self.url, setting) if tuner is not None else contextlib.nullcontext(tuning.BulkRead())
+		with measure as read:
+			def get_page(request):
+				try:
+					entities = request.get(**kwargs)
+				except Exception as error:
+					if tuner is not None and tuning.is_server_error(request, error):
+						read.error()
+					raise
+				if entities is not None and request.response is not None: # not answered from a local snapshot
+					entities = list(entities)
+					read.add(len(entities), len(request.response.content))
+				return entities
+
+			entities = get_page(self)
+			if entities is None:
+				return list() # not found
+			entities = list(entities)
+			if self.total_pages is None or self.total_pages <= first_page:
+				return entities
+
+			def get_other_page(request):
+				try:
+					return get_page(request) or list()
+				except Exception as error:
+					if tuner is None or not tuning.is_server_error(request, error):
+						raise
+					return None # read again below
+			requests_for_pages = [self.request_for_page(page) for page in range(first_page + 1, self.total_pages + 1)]
+			pages = self.api.run_concurrently([functools.partial(get_other_page, r) for r in requests_for_pages], max_workers=setting[1])
+			for request, page_entities in zip(requests_for_pages, pages):
+				if page_entities is None:
+					logger.debug("Reading page {0} of {1} again after a server error.".format(request.page, self.url))
+					page_entities = self.request_for_page(request.page).get(**kwargs) or list()
+				entities.extend(page_entities)
+			return entities
+
+	def get_all_by_date(self, window_size=1000, **kwargs):
+		'''
+		Returns a list of all entities that match this request, read in date windows (see the 'windows' module).
+
+		WordPress takes longer to answer the deeper a page is in the results. Here the results are
+		split into 'after'/'before' date ranges of at most 'window_size' entities each (sized with
+		count requests), and the pages of every range are read in parallel, so no request goes deeper
+		than 'window_size' entities. The entities are returned in order of date, newest first (oldest
+		first if 'order' is "asc"). Requests without date filters read every page with 'get_all'.
+		As for 'get_all', 'api.adaptive_paging' lets 'api.page_tuner' choose the page size and number
+		of parallel requests. Takes the same keyword arguments as 'get' (except 'count' and 'stream').
+
+		window_size : largest number of entities in a date window
+		'''
+		if not type(self).supports_date_windows:
+			return self.get_all(**kwargs)
+		tuner = self.api.page_tuner if self.api.adaptive_paging and self.per_page is None else None
+		setting = (MAX_PER_PAGE, None) # per_page, maximum number of parallel requests
+		if tuner is not None:
+			setting = tuner.setting(self.url)
+		if self.per_page is None:
+			self.per_page = setting[0]
+		compiled = self.compile(class_object=kwargs.get("class_object", None), embed=kwargs.get("embed", True), links=kwargs.get("links", True))
+		measure = tuner.measure(self.url, setting) if tuner is not None else contextlib.nullcontext(tuning.BulkRead())
+		with measure as read:
+			entities = windows.get_in_windows(compiled, window_size=window_size, max_workers=setting[1])
+			read.add(len(entities))
+		return entities
+
+	def add_slug_filter(self, parameter, class_object, slug):
+		'''
+		Records the slug of an entity given to an ID filter (e.g. a category slug for 'categories'); see 'resolve_slugs'.
+
+		parameter    : name of the filter, a property returning the list of IDs (as strings)
+		class_object : the class of the entity, e.g. 'Category'
+		'''
+		self._unresolved_slugs.setdefault(parameter, (class_object, list()))[1].append(slug)
+
+	def resolve_slugs(self):
+		'''
+		Adds the IDs of the entities given by slug to their filters.
+
+		All the slugs for one class (e.g. every category slug given to 'categories' and 'categories_exclude')
+		are found with a single request (slug=a,b,c), the requests for different classes are made in parallel.
+		IDs found before are remembered (see 'API.slug_ids') and not requested again.
+		'''
+		if len(self._unresolved_slugs) == 0:
+			return
+		slugs = dict() # key = class, value = list of slugs
+		for class_object, class_slugs in self._unresolved_slugs.values():
+			slugs.setdefault(class_object, list()).extend(class_slugs)
+		classes = list(slugs)
+		results = self.api.run_concurrently([functools.partial(self.api.ids_for_slugs, c, slugs[c]) for c in classes])
+		ids = dict(zip(classes, results))
+
+		for parameter, (class_object, class_slugs) in self._unresolved_slugs.items():
+			for slug in class_slugs:
+				if slug not in ids[class_object]:
+					raise ValueError("Could not find a {0} with the slug '{1}' (given to '{2}').".format(class_object.__name__, slug, parameter))
+				getattr(self, parameter).append(ids[class_object][slug])
+		self._unresolved_slugs = dict()
+
+	def answer_locally(self, class_object, count=False, stream=False):
+		'''
+		Returns the result of this request from 'api.local_index' if it holds every entity the request could match, otherwise None.
+
+		Call after 'populate_request_parameters'. Sets 'total' and 'total_pages' as a response would.
+		'''
+		if not self.api.local_queries or self.refresh:
+			return None # a refresh reads the site
+		result = self.api.local_index.query(class_object, self.parameters, ranked_search=self.api.ranked_search)
+		if result is None:
+			return None
+		entities, self.total = result
+		self.total_pages = -(-self.total // int(self.parameters.get("per_page", 10)))
+		self.api.record_request(self.http_method, self.url, self.parameters, source=explain.LOCAL_SNAPSHOT)
+		if count:
+			return self.total
+		return iter(entities) if stream else entities
+
+	def request_for_page(self, page):
+		'''
+		Returns a copy of this request (with the same parameters) for another page of the results.
+		'''
+		request = copy.copy(self)
+		request.parameters = dict(self.parameters)
+		request.response = None
+		request.total = None
+		request.total_pages = None
+		request.page = page
+		return request
+
+	def compile(self, class_object=None, embed=True, links=True):
+		'''
+		Returns a 'CompiledRequest' that runs this request (a collection query) repeatedly with some parameters changed.
+
+		The request parameters are validated and prepared once; each 'execute' only merges in the
+		parameters that change (e.g. 'page', 'include', 'search'). This request object should not be used afterwards.
+
+		class_object : the class of the objects to instantiate, default: the class the request's 'get' returns
+		embed, links : as for 'get'
+		'''
+		if class_object is None:
+			class_object = inspect.signature(type(self).get).parameters["class_object"].default
+		WPRequest.get(self, class_object=class_object, embed=embed, links=links) # sets "_embed"/"_fields" only
+		self.populate_request_parameters()
+		return CompiledRequest(self, class_object=class_object, embed=embed)
+
+	@abstractmethod
+	def entity_from_dictionary(self, d, class_object):
+		'''
+		Returns the entity (of type 'class_object') for a single record of the response, creating it if it is not in the cache.
+		'''
+		pass
+
+	def entities_from_response(self, class_object, stream=False):
+		'''
+		Returns the entities found in the response: a list, or a generator if 'stream' is True.
+		
+		If 'class_object' is 'dict', the decoded records are returned as they are (no entities are created or cached).
+		'''
+		records = self.response_records(stream=stream)
+		if class_object is dict:
+			return records if stream else list(records)
+		cache = self.api.wordpress_object_cache
+		def entity_from_dictionary(d, class_object):
+			# an entity created from an embedded object is completed in place (see 'embedded_entity')
+			if self.refresh or cache.is_partial(class_object.__name__, d.get("id")):
+				return self.refreshed_entity(d, class_object=class_object)
+			return self.entity_from_dictionary(d, class_object=class_object)
+		if stream:
+			return (entity_from_dictionary(d, class_object=class_object) for d in records)
+		return [entity_from_dictionary(d, class_object=class_object) for d in records]
+
+	def refreshed_entity(self, d, class_object):
+		'''
+		Returns the entity for a single record of the response, updating the cached entity in place (if there is one) with the record's values.
+
+		Objects holding the entity see the new values. Related objects attached to it are dropped
+		(they are read again when used), and the cache keys are updated if the slug changed. An
+		entity created from an embedded object (see 'embedded_entity') is no longer partial afterwards.
+		'''
+		cache = self.api.wordpress_object_cache
+		try:
+			entity = cache.get(class_name=class_object.__name__, key=d["id"], partial=True)
+		except WPORMCacheObjectNotFoundError:
+			return self.entity_from_dictionary(d, class_object=class_object)
+
+		old_slug = getattr(entity.s, "slug", None)
+		for field, related_class, attribute in type(entity).relations.values():
+			setattr(entity, attribute, None)
+		d = self.defer_large_fields(entity, d)
+		entity.json = json.dumps(d)
+		entity.update_schema_from_dictionary(d)
+		if "_embedded" in d:
+			self.process_embedded(entity, d["_embedded"])
+		entity.postprocess_response()
+
+		if old_slug is not None and old_slug != getattr(entity.s, "slug", None):
+			cache.discard(class_name=class_object.__name__, key=old_slug)
+			self.api.slug_ids.pop((class_object.__name__, old_slug), None)
+		cache.set(value=entity, keys=(entity.s.id, getattr(entity.s, "slug", None)))
+		return entity
+
+	def process_embedded(self, entity, embedded):
+		'''
+		Attaches the related objects embedded in a response record (the "_embedded" value) to the entity.
+		
+		These are related objects provided by the API in full. Each is taken from the cache if
+		present, otherwise it is created and added to the cache. Link relations handled are those
+		in the entity class' 'embedded_relations'; subclasses can override this method to handle others.
+		'''
+		for link_relation, objects in embedded.items():
+			relation = type(entity).embedded_relations.get(link_relation, None)
+			if relation is None:
+				logger.debug("Note: Unhandled embedded content in {0}, key='{1}'".format(self.__class__.__name__, link_relation))
+				continue
+			field, related_class, attribute = type(entity).relations[relation]
+			
+			# value is a list of objects (dictionaries), only expecting one
+			related = [self.embedded_entity(related_class, obj) for obj in objects if isinstance(obj, dict) and "id" in obj]
+			if len(related) > 0:
+				setattr(entity, attribute, related[0])
+			else:
+				# e.g. an error object if the related entity can't be accessed
+				logger.debug("No usable embedded '{0}' content in {1}: {2}".format(link_relation, self.__class__.__name__, objects))
+
+	def embedded_entity(self, class_object, d):
+		'''
+		Returns the entity for an embedded object, from the cache if present, otherwise it is created and cached.
+		
+		Embedded objects only contain the fields of the "embed" context (e.g. an embedded post has no
+		'content' or 'categories'). An entity created from one is cached as partial: it is shared by the
+		entities it is embedded in, but looking it up (e.g. 'api.post(id=...)') reads the full record,
+		which completes it in place (see 'refreshed_entity').
+		'''
+		try:
+			return self.api.wordpress_object_cache.get(class_name=class_object.__name__, key=d["id"], partial=True)
+		except WPORMCacheObjectNotFoundError:
+			entity = class_object(api=self.api)
+			entity.update_schema_from_dictionary(d)
+			self.api.wordpress_object_cache.set(value=entity, keys=(entity.s.id, getattr(entity.s, "slug", None)), partial=True)
+			return entity
+
+	def defer_large_fields(self, entity, d):
+		'''
+		Avoids keeping large rendered HTML fields (see 'API.lazy_html_fields') in a cached entity.
+		
+		Fields whose rendered value is longer than 'API.lazy_html_max_size' characters are removed
+		from the entity and fetched again from WordPress if they are accessed. Returns the record
+		without those fields (so they are not kept in 'entity.json' either).
+		'''
+		max_size = getattr(self.api, "lazy_html_max_size", None)
+		if max_size is None or "id" not in d:
+			return d
+		
+		deferred = list()
+		for field in self.api.lazy_html_fields:
+			value = d.get(field, None)
+			if isinstance(value, dict) and "rendered" in value and len(value["rendered"]) > max_size:
+				deferred.append(field)
+		if len(deferred) == 0:
+			return d
+		
+		url = "{0}/{1}".format(self.url, d["id"])
+		for field in deferred:
+			entity.s.defer_field(field, functools.partial(fetch_field, self.api, url, field))
+		return {key:value for key,value in d.items() if key not in deferred}
+
+	def to_columns(self, fields=None, arrays=True):
+		'''
+		Performs the request and returns every page of results as columns (key = field name, value = array of values).
+		
+		Each page's response is parsed incrementally and columns are built directly from the
+		records; no entities are created and the cache is not touched. Only the requested fields
+		are asked of the server (WordPress '_fields' parameter). Pages are read one after the
+		other, starting at 'page' (default: the first), 100 records each unless 'per_page' is set.
+		
+		fields : list of schema field names to export, e.g. ["id", "date", "author", "title"]
+		arrays : BOOL, if True and NumPy is available, return NumPy arrays, otherwise return lists
+		'''
+		if fields is None or len(fields) == 0:
+			raise ValueError("The fields to export must be specified, e.g. to_columns(fields=['id', 'date']).")
+		self.resolve_slugs() # once, not for every page
+		# the pages are read with copies, this request is not changed
+		first = self.request_for_page(self.page or 1)
+		first.parameters["_fields"] = ",".join(fields)
+		if first.per_page is None:
+			first.per_page = MAX_PER_PAGE
+
+		def records():
+			request = first
+			while True:
+				page_records = request.get(class_object=dict, embed=False, links=False, stream=True)
+				if page_records is None:
+					return # not found
+				yield from page_records
+				if request.total_pages is None or int(request.page) >= request.total_pages:
+					return
+				request = first.request_for_page(int(request.page) + 1)
+		return columns.to_columns(records(), fields=fields, arrays=arrays)
+
 	def process_response_headers(self):
 		'''
 		Handle any customization of parsing response headers, processes X-WP-* headers by default.
@@ -194,10 +700,11 @@ class WPRequest(metaclass=ABCMeta):
 		if 'X-WP-Nonce' in self.response.headers:
 			self.nonce = self.response.headers['X-WP-Nonce']
 	
-	def get_response(self, wpid=None):
+	def get_response(self, wpid=None, stream=False):
 		'''
 		
-		wpid : specify this if a specific WordPress object (of given ID) is being requested
+		wpid   : specify this if a specific WordPress object (of given ID) is being requested
+		stream : BOOL, if True, the response body is not downloaded until it is read (see 'response_records')
 		'''
 		if self.response is None:
 		
@@ -205,16 +712,36 @@ class WPRequest(metaclass=ABCMeta):
 				url = self.url
 			else:
 				url = "{0}/{1}".format(self.url, wpid)
-		
-			if self.api.session is None:
-				#logger.debug("creating new request")
-				# no exiting request, create a new one
-				self.response = requests.get(url=url, params=self.parameters, auth=self.api.auth())
-			else:
-				# use existing session
-				self.response = self.api.session.get(url=url, params=self.parameters, auth=self.api.auth())
+
+			method, parameters = self.http_method, self.parameters
+			if self.counting:
+				# Only the 'X-WP-Total' header is needed; request as little of the body as possible,
+				# without changing the parameters of this request (it may be used to get the entities later).
+				parameters = dict(parameters, per_page=1, _fields="id")
+				if self.api.head_requests_for_counts:
+					method = "HEAD"
+
+			# made in 'api.session' if one is open
+			self.response = self.api.http_request(method, url, params=parameters, stream=stream)
 		self.response.raise_for_status()
 		#return self.response
+
+	def response_records(self, stream=False):
+		'''
+		Returns an iterable of the records (dictionaries) found in the response.
+		
+		stream : BOOL, if True, parse the response body incrementally as it is read from the connection,
+		         yielding each record as soon as it is complete (the response must have been requested with 'stream=True')
+		'''
+		if stream:
+			return iter_json_records(self.response.iter_content(chunk_size=self.stream_chunk_size),
+									 encoding=self.response.encoding)
+		
+		data = self.response.json()
+		if isinstance(data, dict):
+			# only one object was returned; make it a list
+			data = [data]
+		return data
 		
 	@property
 	def request(self):
@@ -3,8 +3,6 @@ import inspect
 import logging
 from abc import ABCMeta, abstractmethod, abstractproperty
 
-import requests
-
 logger = logging.getLogger(__name__.split(".")[0]) # use package name
 
 context_values = ["view", "embed", "edit"]
@@ -123,13 +121,7 @@ class WPRequest(metaclass=ABCMeta):
 
 	def get_response(self):
 		if self.response is None:
-			if self.api.session is None:
-				#logger.debug("creating new request")
-				# no exiting request, create a new one
-				self.response = requests.get(url=self.url, params=self.parameters, auth=self.api.auth())
-			else:
-				# use existing session
-				self.response = self.api.session.get(url=self.url, params=self.parameters, auth=self.api.auth())
+			self.response = self.api.http_request("GET", self.url, params=self.parameters)
 		self.response.raise_for_status()
 		#return self.response
 
@@ -138,13 +130,7 @@ class WPRequest(metaclass=ABCMeta):
 	# 	pass
 
 	def post_update(self):
-		if self.api.session is None:
-			#logger.debug("creating new request")
-			# no exiting request, create a new one
-			self.response = requests.post(url=self.url, data=self.data, params=self.parameters, auth=self.api.auth())
-		else:
-			# use existing session
-			self.response = self.api.session.post(url=self.url, data=self.data, params=self.parameters, auth=self.api.auth())
+		self.response = self.api.http_request("POST", self.url, params=self.parameters, data=self.data)
 		self.response.raise_for_status()
 
 	@property
@@ -19,7 +19,7 @@ class AuthenticationRequired(WordPressORMException):
 	''' Authentication required for this request. '''
 	pass
 
-class UserNotFound(WordPressORMException):
+class UserNotFound(NoEntityFound):
 	''' WordPress user not found. '''
 	pass
 
@@ -27,3 +27,6 @@ class MissingRequiredParameter(WordPressORMException):
 	''' A required parameter was missing. '''
 	pass
 
+class RequestBudgetExceeded(WordPressORMException):
+	''' More requests were needed than allowed by 'API.request_budget'. '''
+	pass
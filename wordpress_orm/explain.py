@@ -0,0 +1,186 @@
+'''
+Recording the requests made by a block of code.
+
+Relation properties, deferred fields and paginated collections make requests when they are
+used, which makes it easy for a template looping over posts to make hundreds of requests
+without a trace in the code. 'API.explain' records every request made while it is active
+(method, URL, parameters, whether a cache answered it, and the entity property whose use
+led to it), and 'API.request_budget' fails (or logs) as soon as a block makes more requests
+to WordPress than allowed:
+
+	plan = api.explain(lambda: [post.author.s.name for post in api.posts[0:20]])
+	print(plan)
+
+	with api.request_budget(3):
+		render(posts)
+'''
+
+import sys
+import logging
+import threading
+from urllib.parse import urlencode
+
+from . import exc
+
+logger = logging.getLogger(__name__.split(".")[0]) # package name
+
+# sources of a recorded request
+NETWORK = "network"                # sent to WordPress
+RESPONSE_CACHE = "response cache"  # 'api.response_cache'
+LOCAL_SNAPSHOT = "local snapshot"  # 'api.local_index', see 'API.preload'
+ENTITY_CACHE = "entity cache"      # 'api.wordpress_object_cache'
+
+_local = threading.local() # 'trigger' of the requests made in a thread started by 'API.run_concurrently'
+
+def trigger():
+	'''
+	Returns a description of the entity property whose use led to the current request
+	(e.g. "Post.author", "User.s.name", "Category.posts()", "s.content"), or None.
+
+	The innermost entity property or method on the call stack is used; in threads started by
+	'API.run_concurrently', the one that started the thread.
+	'''
+	from .entities.wordpress_entity import WPEntity, WPEntityProxy, WPSchemaProxy, WPSchema # that module imports this one
+
+	frame = sys._getframe(1)
+	while frame is not None:
+		code_name = frame.f_code.co_name
+		owner = frame.f_locals.get("self", None)
+		if owner is not None:
+			if type(owner) is WPSchemaProxy and code_name == "__getattr__":
+				return "{0}.s.{1}".format(owner._proxy.__class__.__name__, frame.f_locals.get("name"))
+			elif type(owner) is WPEntityProxy and code_name == "__getattr__":
+				return "{0}.{1}".format(owner.__class__.__name__, frame.f_locals.get("name"))
+			elif isinstance(owner, WPSchema) and code_name == "__getattr__":
+				return "s.{0}".format(frame.f_locals.get("name")) # a deferred field (see 'lazy_html_max_size')
+			elif type(owner) is not WPEntityProxy and isinstance(owner, WPEntity) and not code_name.startswith("_"):
+				attribute = getattr(type(owner), code_name, None)
+				if isinstance(attribute, property):
+					return "{0}.{1}".format(type(owner).__name__, code_name)
+				elif callable(attribute):
+					return "{0}.{1}()".format(type(owner).__name__, code_name)
+		frame = frame.f_back
+	return getattr(_local, "trigger", None)
+
+def call_with_trigger(trigger, function):
+	'''
+	Calls the function (in a thread started by 'API.run_concurrently'), attributing its requests to the given trigger.
+	'''
+	previous = getattr(_local, "trigger", None)
+	_local.trigger = trigger
+	try:
+		return function()
+	finally:
+		_local.trigger = previous
+
+class RequestRecord:
+	'''
+	A request made (or answered from a cache) while 'API.explain' or 'API.request_budget' was active.
+	'''
+	def __init__(self, method, url, parameters, source, trigger):
+		'''
+		method     : "GET", "HEAD" or "POST"
+		url        : URL of the request, without parameters
+		parameters : dictionary of the request parameters
+		source     : what answered the request, 'NETWORK' if it was sent to WordPress, otherwise the cache
+		trigger    : the entity property whose use led to the request (see 'trigger'), or None
+		'''
+		self.method = method
+		self.url = url
+		self.parameters = parameters
+		self.source = source
+		self.trigger = trigger
+
+	@property
+	def cache_hit(self):
+		'''
+		True if the request was answered without contacting WordPress.
+		'''
+		return self.source != NETWORK
+
+	def __repr__(self):
+		return "<{0} at {1}, {2} {3}, source='{4}', trigger='{5}'>".format(self.__class__.__name__, hex(id(self)),
+																	self.method, self.url, self.source, self.trigger)
+
+	def __str__(self):
+		query = "?" + urlencode(sorted(self.parameters.items())) if len(self.parameters) > 0 else ""
+		triggered = " <- {0}".format(self.trigger) if self.trigger else ""
+		return "{0} {1}{2} [{3}]{4}".format(self.method, self.url, query, "hit: " + self.source if self.cache_hit else "miss", triggered)
+
+class QueryPlan:
+	'''
+	The requests recorded by 'API.explain', in the order they were made.
+
+	'result' holds the return value of the function explained (if one was given).
+	'''
+	def __init__(self):
+		self.records = list()
+		self.result = None
+		self._lock = threading.Lock()
+
+	def __repr__(self):
+		return "<{0} at {1}, {2} requests, {3} cache hits>".format(self.__class__.__name__, hex(id(self)),
+																  len(self.requests), len(self.records) - len(self.requests))
+
+	def __str__(self):
+		return "\n".join(str(record) for record in self.records)
+
+	def __len__(self):
+		return len(self.records)
+
+	def __iter__(self):
+		return iter(list(self.records))
+
+	def __getitem__(self, index):
+		return self.records[index]
+
+	def record(self, record):
+		with self._lock:
+			self.records.append(record)
+
+	@property
+	def requests(self):
+		'''
+		The records of the requests sent to WordPress.
+		'''
+		return [record for record in self.records if not record.cache_hit]
+
+	def triggers(self):
+		'''
+		Returns a dictionary, key = trigger (see 'RequestRecord'), value = number of requests sent to WordPress because of it.
+		'''
+		counts = dict()
+		for record in self.requests:
+			counts[record.trigger] = counts.get(record.trigger, 0) + 1
+		return counts
+
+class RequestBudget:
+	'''
+	The number of requests to WordPress allowed in a block of code, see 'API.request_budget'.
+	'''
+	def __init__(self, limit, raise_error=True):
+		'''
+		limit       : largest number of requests that may be sent to WordPress
+		raise_error : BOOL, if True, raise 'exc.RequestBudgetExceeded' instead of sending another request, otherwise log a warning (once)
+		'''
+		self.limit = limit
+		self.raise_error = raise_error
+		self.used = 0
+		self._warned = False
+		self._lock = threading.Lock()
+
+	def __repr__(self):
+		return "<{0} at {1}, {2} of {3} requests used>".format(self.__class__.__name__, hex(id(self)), self.used, self.limit)
+
+	def record(self, record):
+		if record.cache_hit:
+			return
+		message = "Request budget of {0} exceeded by {1} {2} (triggered by: {3}).".format(self.limit, record.method, record.url, record.trigger)
+		with self._lock:
+			if self.used >= self.limit and self.raise_error:
+				raise exc.RequestBudgetExceeded(message) # not sent
+			self.used += 1
+			warn = self.used > self.limit and not self._warned
+			self._warned = self._warned or warn
+		if warn:
+			logger.warning(message)
@@ -0,0 +1,172 @@
+'''
+Incremental parsing of JSON responses returned by the WordPress API.
+
+Collection responses are a single top-level JSON array of records. Rather than
+buffering (and decoding) the whole response body before any entity can be
+created, the function here scans the array as chunks arrive from the socket and
+yields each record as soon as its closing bracket has been read. Only the text
+of the record currently being read is held in memory.
+'''
+
+import re
+import json
+import codecs
+import logging
+
+logger = logging.getLogger(__name__.split(".")[0]) # package name
+
+_whitespace = re.compile(r'[ \t\n\r]*')
+_structure_characters = re.compile(r'[{}\[\]"]')
+_string_special_characters = re.compile(r'["\\]')
+_scalar_end = re.compile(r'[,\]\s]')
+
+# parser states
+_BEFORE_DOCUMENT = 0	# nothing (but whitespace) read yet
+_SINGLE_DOCUMENT = 1	# top-level value is not an array; buffer it all
+_BEFORE_ELEMENT = 2		# after '[' or ','
+_IN_ELEMENT = 3			# inside an object, array, or string element
+_IN_SCALAR = 4			# inside a number, true, false, or null element
+_AFTER_ELEMENT = 5		# expecting ',' or ']'
+_AFTER_DOCUMENT = 6		# closing ']' has been read
+
+def iter_json_records(chunks, encoding="utf-8"):
+	'''
+	Generator that yields each element of a top-level JSON array as it is completed.
+
+	If the top-level value is not an array (e.g. a single object is returned when
+	a WordPress ID is requested), it is read in full and yielded as the only record.
+
+	chunks   : iterable of 'bytes' (or 'str') pieces of the JSON document, e.g. 'response.iter_content()'
+	encoding : character encoding used to decode byte chunks
+	'''
+	decoder = codecs.getincrementaldecoder(encoding or "utf-8")()
+
+	buffer = ""
+	position = 0		# scan position in 'buffer'
+	start = 0			# position in 'buffer' where the current element begins
+	depth = 0			# nesting level of the current element
+	in_string = False
+	empty_array = True	# no element read since the opening '['
+	state = _BEFORE_DOCUMENT
+
+	final = False
+	chunk_iterator = iter(chunks)
+	while not final:
+		try:
+			chunk = next(chunk_iterator)
+			text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+		except StopIteration:
+			final = True
+			text = decoder.decode(b"", final=True)
+
+		buffer += text
+
+		while True:
+			if state == _BEFORE_DOCUMENT:
+				position = _whitespace.match(buffer, position).end()
+				if position == len(buffer):
+					break
+				if buffer[position] == "[":
+					state = _BEFORE_ELEMENT
+					position += 1
+				else:
+					state = _SINGLE_DOCUMENT
+
+			elif state == _SINGLE_DOCUMENT:
+				break # read everything, parse below
+
+			elif state == _BEFORE_ELEMENT:
+				position = _whitespace.match(buffer, position).end()
+				if position == len(buffer):
+					break
+				c = buffer[position]
+				if c == "]" and empty_array:
+					state = _AFTER_DOCUMENT
+					position += 1
+					continue
+				start = position
+				depth = 0
+				in_string = False
+				if c in "{[\"":
+					state = _IN_ELEMENT
+				else:
+					state = _IN_SCALAR
+
+			elif state == _IN_ELEMENT:
+				complete = False
+				while True:
+					if in_string:
+						match = _string_special_characters.search(buffer, position)
+						if match is None:
+							position = len(buffer)
+							break
+						if match.group() == "\\":
+							if match.end() >= len(buffer):
+								# escape sequence split across chunks, wait for more
+								position = match.start()
+								break
+							position = match.end() + 1 # skip the escaped character
+							continue
+						in_string = False
+						position = match.end()
+						if depth == 0:
+							complete = True # a string element
+							break
+					else:
+						match = _structure_characters.search(buffer, position)
+						if match is None:
+							position = len(buffer)
+							break
+						c = match.group()
+						position = match.end()
+						if c == "\"":
+							in_string = True
+						elif c in "{[":
+							depth += 1
+						else:
+							depth -= 1
+							if depth == 0:
+								complete = True
+								break
+				if not complete:
+					break
+				yield json.loads(buffer[start:position])
+				buffer = buffer[position:]
+				position = 0
+				empty_array = False
+				state = _AFTER_ELEMENT
+
+			elif state == _IN_SCALAR:
+				match = _scalar_end.search(buffer, position)
+				if match is None:
+					position = len(buffer)
+					break
+				yield json.loads(buffer[start:match.start()])
+				buffer = buffer[match.start():]
+				position = 0
+				empty_array = False
+				state = _AFTER_ELEMENT
+
+			elif state == _AFTER_ELEMENT:
+				position = _whitespace.match(buffer, position).end()
+				if position == len(buffer):
+					break
+				c = buffer[position]
+				if c == ",":
+					state = _BEFORE_ELEMENT
+				elif c == "]":
+					state = _AFTER_DOCUMENT
+				else:
+					raise ValueError("Unexpected character '{0}' found between elements of a JSON array.".format(c))
+				position += 1
+
+			elif state == _AFTER_DOCUMENT:
+				position = _whitespace.match(buffer, position).end()
+				if position < len(buffer):
+					raise ValueError("Extra data found after the end of the JSON array.")
+				break
+
+	if state == _SINGLE_DOCUMENT:
+		yield json.loads(buffer)
+	elif state != _AFTER_DOCUMENT:
+		raise ValueError("The JSON document ended before it was complete.")
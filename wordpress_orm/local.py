@@ -0,0 +1,467 @@
+'''
+Answering post and page queries from a complete local snapshot.
+
+When every post (or page) of a site has been read (see 'API.preload'), the filters WordPress
+applies ('categories', 'author', 'after', 'search', ...) can be evaluated against the cached
+entities instead. Indexes are built once per snapshot: a set of IDs per category, tag, author,
+status and parent, and the entities sorted by date, so a query costs a few set intersections.
+Searches use an inverted index of the words in the title, excerpt and content (see 'SearchIndex').
+Requests with parameters that cannot be evaluated locally are sent to WordPress as usual.
+'''
+
+import re
+import html
+import math
+import bisect
+import logging
+import threading
+import collections
+
+logger = logging.getLogger(__name__.split(".")[0]) # package name
+
+# parameters whose value is a comma separated list of IDs, key = parameter, value = (entity field, excluded)
+id_list_parameters = {"categories":("categories", False), "categories_exclude":("categories", True),
+					  "tags":("tags", False), "tags_exclude":("tags", True),
+					  "author":("author", False), "author_exclude":("author", True),
+					  "parent":("parent", False), "parent_exclude":("parent", True),
+					  "include":("id", False), "exclude":("id", True)}
+
+# parameters that don't change the entities returned
+ignored_parameters = ["_embed", "_fields", "context"]
+
+# fields searched by WordPress ('search' parameter)
+search_fields = ["title", "excerpt", "content"]
+
+orderby_fields = {"date":"date", "modified":"modified", "id":"id", "title":"title", "slug":"slug",
+				  "author":"author", "parent":"parent", "menu_order":"menu_order"}
+
+tag_regex = re.compile(r"<[^>]*>")
+word_regex = re.compile(r"\w+")
+# search terms as WordPress splits them ('WP_Query::parse_search'): quoted phrases or runs of characters other than space, comma and plus
+term_regex = re.compile(r'".*?("|$)|((?<=[\t ",+])|^)[^\t ",+]+')
+# words left out of searches of several terms ('WP_Query::get_search_stopwords', the English list; translations of WordPress may differ)
+search_stopwords = {"about", "an", "are", "as", "at", "be", "by", "com", "for", "from", "how", "in", "is", "it", "of", "on",
+					"or", "that", "the", "this", "to", "was", "what", "when", "where", "who", "will", "with", "www"}
+# single characters left out of searches of several terms
+single_character_regex = re.compile(r"^[a-z\-]$")
+
+def searchable_fields(entity):
+	'''
+	Returns a tuple of the text of the searched fields of the entity (HTML tags removed), or None if a field is not loaded.
+	'''
+	texts = list()
+	for field in search_fields:
+		if entity.s.is_deferred(field):
+			return None # searching it would read it from WordPress
+		value = getattr(entity.s, field, None) or ""
+		texts.append(html.unescape(tag_regex.sub(" ", value)))
+	return tuple(texts)
+
+def tokenize(text):
+	'''
+	Returns the list of (lower case) words in the text.
+	'''
+	return word_regex.findall(text.lower())
+
+def search_terms(query):
+	'''
+	Returns (list of terms, list of excluded terms) of a search, in lower case, split as WordPress does.
+
+	Terms are separated by spaces, commas or plus signs, except within double quotes; a term
+	prefixed with "-" excludes the entities that contain it. When there are several terms,
+	stopwords (e.g. "the", "with", see 'search_stopwords') and single letters are left out, as
+	'WP_Query::parse_search_terms' does; if none are left, or more than 9, the whole query is one term.
+	'''
+	query = query.lower()
+	candidates = [match.group(0).strip("\"'\n\r ") for match in term_regex.finditer(query)]
+	if len(candidates) > 1:
+		checked = [term for term in candidates if len(term) > 0 and term not in search_stopwords and not single_character_regex.match(term)]
+		candidates = checked if 0 < len(checked) <= 9 else [query.strip()]
+
+	terms = list()
+	excluded = list()
+	for term in candidates:
+		if len(term) > 1 and term.startswith("-"):
+			excluded.append(term[1:])
+		elif len(term) > 0:
+			terms.append(term)
+	return terms, excluded
+
+class SearchIndex:
+	'''
+	An inverted index of the words in a set of documents (e.g. the title, excerpt and content of posts).
+
+	'match' finds documents as WordPress does: every term must appear somewhere in the text. Terms
+	made of word characters only (nearly all of them) are looked up in the list of distinct words
+	rather than in the text of every document. 'ranked' is an alternative where each query word
+	matches the words it is a prefix of (e.g. "chee" matches "cheese"), with the matches ranked with BM25.
+	Documents can be added and removed at any time.
+	'''
+	k1 = 1.2 # BM25 term frequency saturation
+	b = 0.75 # BM25 document length normalization
+
+	def __init__(self):
+		self.postings = dict()  # key = word, value = dictionary (key = document ID, value = number of occurrences)
+		self.documents = dict() # key = document ID, value = (list of distinct words, number of words)
+		self.fields = dict()    # key = document ID, value = tuple of the (lower case) texts of the document
+		self.total_length = 0   # number of words in all documents
+		self._words = None      # sorted list of the indexed words, for prefix lookups
+
+	def __len__(self):
+		return len(self.documents)
+
+	def add(self, document_id, fields):
+		'''
+		Indexes the texts (e.g. a tuple of title, excerpt and content) as the document with the given ID, replacing any previous texts.
+		'''
+		self.remove(document_id)
+		fields = tuple(text.lower() for text in fields)
+		words = tokenize(" ".join(fields))
+		counts = collections.Counter(words)
+		for word, count in counts.items():
+			if word not in self.postings:
+				self.postings[word] = dict()
+				self._words = None
+			self.postings[word][document_id] = count
+		self.documents[document_id] = (list(counts), len(words))
+		self.fields[document_id] = fields
+		self.total_length += len(words)
+
+	def remove(self, document_id):
+		'''
+		Removes the document with the given ID from the index (if present).
+		'''
+		document = self.documents.pop(document_id, None)
+		if document is None:
+			return
+		words, length = document
+		for word in words:
+			postings = self.postings[word]
+			postings.pop(document_id, None)
+			if len(postings) == 0:
+				del self.postings[word]
+				self._words = None
+		del self.fields[document_id]
+		self.total_length -= length
+
+	def expand(self, prefix):
+		'''
+		Returns the indexed words that start with the prefix.
+		'''
+		if self._words is None:
+			self._words = sorted(self.postings)
+		start = bisect.bisect_left(self._words, prefix)
+		stop = bisect.bisect_left(self._words, prefix + "\uffff")
+		return self._words[start:stop]
+
+	def containing(self, term):
+		'''
+		Returns the set of IDs of the documents whose text contains the (lower case) term.
+		'''
+		if word_regex.fullmatch(term):
+			# a run of word characters is found in the text only within a single word
+			ids = set()
+			for word in self.postings:
+				if term in word:
+					ids.update(self.postings[word])
+			return ids
+		return set(document_id for document_id, fields in self.fields.items() if any(term in text for text in fields))
+
+	def match(self, query):
+		'''
+		Returns the set of IDs of the documents that contain every term of the query (see 'search_terms')
+		and none of its excluded terms, or None if the query has no terms.
+		'''
+		terms, excluded = search_terms(query)
+		if len(terms) == 0 and len(excluded) == 0:
+			return None
+		ids = set(self.documents)
+		for term in terms:
+			ids &= self.containing(term)
+		for term in excluded:
+			ids -= self.containing(term)
+		return ids
+
+	def wordpress_rank(self, document_id, query):
+		'''
+		Returns the rank (1 is best) WordPress gives the document when ordering a search by relevance ('WP_Query::parse_search_order').
+		'''
+		title, excerpt, content = (self.fields[document_id] + ("", "", ""))[:3]
+		terms, excluded = search_terms(query)
+		phrase = query.lower().strip()
+		if len(terms) > 1:
+			if phrase in title:
+				return 1
+			if len(terms) < 7 and all(term in title for term in terms):
+				return 2
+			if len(terms) < 7 and any(term in title for term in terms):
+				return 3
+			if phrase in excerpt:
+				return 4
+			if phrase in content:
+				return 5
+			return 6
+		return 1 if phrase in title else 2
+
+	def ranked(self, query):
+		'''
+		Returns a dictionary (key = document ID, value = BM25 score) of the documents where every word of the
+		query starts a word of the text, or None if the query has no words.
+		'''
+		words = tokenize(query)
+		if len(words) == 0:
+			return None
+		count = len(self.documents)
+		average_length = self.total_length / count if count > 0 else 0
+		scores = None
+		for word in set(words):
+			word_scores = dict()
+			for indexed_word in self.expand(word):
+				postings = self.postings[indexed_word]
+				idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+				for document_id, frequency in postings.items():
+					norm = self.k1 * (1 - self.b + self.b * self.documents[document_id][1] / average_length)
+					word_scores[document_id] = word_scores.get(document_id, 0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+			if scores is None:
+				scores = word_scores
+			else:
+				scores = {document_id:score + word_scores[document_id] for document_id, score in scores.items() if document_id in word_scores}
+			if len(scores) == 0:
+				break
+		return scores
+
+class LocalCollection:
+	'''
+	All the entities of one class (e.g. every published post), indexed to answer collection queries.
+	'''
+	def __init__(self, class_object, entities, statuses):
+		'''
+		class_object : the class of the entities
+		entities     : every entity of the class (with one of the statuses) on the site
+		statuses     : list of the statuses the snapshot holds, e.g. ["publish"]
+		'''
+		self.class_object = class_object
+		self.statuses = set(statuses)
+		self.entities = {entity.s.id:entity for entity in entities} # key = WordPress ID
+		self._lock = threading.RLock()
+		self._indexes = None
+		self._search_index = None # built when first searched, False if some searched fields are not loaded
+
+	def __repr__(self):
+		return "<{0} of {1} {2} objects at {3}>".format(self.__class__.__name__, len(self.entities), self.class_object.__name__, hex(id(self)))
+
+	def update(self, entities=None, deleted_ids=None):
+		'''
+		Adds or replaces the given entities and removes those with the given IDs; indexes are rebuilt when next used.
+		'''
+		with self._lock:
+			for entity in entities or list():
+				self.entities[entity.s.id] = entity
+				if self._search_index:
+					fields = searchable_fields(entity)
+					if fields is None:
+						self._search_index = False
+					else:
+						self._search_index.add(entity.s.id, fields)
+			for wpid in deleted_ids or list():
+				self.entities.pop(int(wpid), None)
+				if self._search_index:
+					self._search_index.remove(int(wpid))
+			self._indexes = None
+			if self._search_index is False:
+				self._search_index = None # check the fields again when next searched
+
+	@property
+	def search_index(self):
+		'''
+		The 'SearchIndex' of the title, excerpt and content of the entities, or None if some of these fields are not loaded.
+		'''
+		with self._lock:
+			if self._search_index is None:
+				self._search_index = SearchIndex()
+				for wpid, entity in self.entities.items():
+					fields = searchable_fields(entity)
+					if fields is None:
+						self._search_index = False # 'search' is sent to WordPress
+						break
+					self._search_index.add(wpid, fields)
+			return self._search_index or None
+
+	@property
+	def indexes(self):
+		with self._lock:
+			if self._indexes is None:
+				self._indexes = self.build_indexes()
+			return self._indexes
+
+	def build_indexes(self):
+		'''
+		Returns a dictionary of the indexes used to answer queries.
+		'''
+		by_value = dict() # key = field, value = dictionary (key = value, value = set of IDs)
+		for field in set(field for field, excluded in id_list_parameters.values() if field != "id") | {"status", "slug"}:
+			by_value[field] = dict()
+		for wpid, entity in self.entities.items():
+			for field, index in by_value.items():
+				value = getattr(entity.s, field, None)
+				values = value if isinstance(value, list) else [value]
+				for v in values:
+					index.setdefault(str(v), set()).add(wpid)
+
+		by_date = sorted((entity.s.date or "", wpid) for wpid, entity in self.entities.items())
+		return {"by_value":by_value, "by_date":by_date, "dates":[date for date, wpid in by_date]}
+
+	def can_answer(self, parameters):
+		'''
+		Returns True if the query given by the request parameters can be evaluated from this snapshot.
+		'''
+		for name, value in parameters.items():
+			if name == "context":
+				if value != "view":
+					return False
+			elif name in ignored_parameters or name in id_list_parameters:
+				continue
+			elif name in ["page", "per_page", "offset", "after", "before", "slug", "order"]:
+				continue
+			elif name == "status":
+				if not set(str(value).split(",")) <= self.statuses:
+					return False
+			elif name == "orderby":
+				if value not in orderby_fields and value not in ["include", "relevance"]:
+					return False
+				if value == "relevance" and not parameters.get("search", None):
+					return False # an error from WordPress
+			elif name == "search":
+				if self.search_index is None:
+					return False # some searched fields are not loaded
+			else:
+				return False # e.g. 'sticky', 'menu_order'
+		if "status" not in parameters and "publish" not in self.statuses:
+			return False
+		return True
+
+	def query(self, parameters, ranked_search=False):
+		'''
+		Returns (list of entities on the requested page, total number of matching entities) for the request parameters.
+
+		ranked_search : BOOL, if True, 'search' matches words by prefix and "relevance" is the BM25 score (see 'SearchIndex.ranked'),
+		                otherwise the results are those WordPress returns
+		'''
+		indexes = self.indexes
+		by_value = indexes["by_value"]
+		ids = set(self.entities)
+
+		statuses = str(parameters.get("status", "publish")).split(",")
+		ids &= set().union(*[by_value["status"].get(s, set()) for s in statuses])
+
+		for name, (field, excluded) in id_list_parameters.items():
+			if name not in parameters:
+				continue
+			values = str(parameters[name]).split(",")
+			if field == "id":
+				matching = set(int(v) for v in values)
+			else:
+				matching = set().union(*[by_value[field].get(v, set()) for v in values])
+			ids = ids - matching if excluded else ids & matching
+
+		if "slug" in parameters:
+			ids &= set().union(*[by_value["slug"].get(s, set()) for s in str(parameters["slug"]).split(",")])
+
+		if "after" in parameters or "before" in parameters:
+			# WordPress compares the (local time) publication date, ISO 8601 strings sort chronologically
+			dates = indexes["dates"]
+			start = bisect.bisect_right(dates, str(parameters["after"])) if "after" in parameters else 0
+			stop = bisect.bisect_left(dates, str(parameters["before"])) if "before" in parameters else len(dates)
+			ids &= set(wpid for date, wpid in indexes["by_date"][start:stop])
+
+		search = parameters.get("search", None)
+		scores = None # BM25 scores of a ranked search
+		if search:
+			search_index = self.search_index
+			with self._lock:
+				if ranked_search:
+					scores = search_index.ranked(str(search))
+					matching = None if scores is None else set(scores)
+				else:
+					matching = search_index.match(str(search))
+			if matching is not None:
+				ids &= matching
+
+		entities = [self.entities[wpid] for wpid in ids]
+		orderby = parameters.get("orderby", "date")
+		descending = parameters.get("order", "desc") == "desc"
+		if orderby == "relevance" and search:
+			# most relevant first, regardless of 'order'
+			entities.sort(key=lambda e: (e.s.date or "", e.s.id), reverse=True)
+			if scores is not None:
+				entities.sort(key=lambda e: scores[e.s.id], reverse=True)
+			else:
+				with self._lock:
+					entities.sort(key=lambda e: search_index.wordpress_rank(e.s.id, str(search)))
+		elif orderby == "include" and "include" in parameters:
+			position = {int(v):n for n, v in enumerate(str(parameters["include"]).split(","))}
+			entities.sort(key=lambda e: position[e.s.id])
+		else:
+			field = orderby_fields.get(orderby, "date") # "relevance" without a search is by date
+			missing = 0 if field in ["id", "author", "parent", "menu_order"] else ""
+			def key(entity):
+				value = getattr(entity.s, field, None)
+				return (missing if value is None else value, entity.s.id)
+			entities.sort(key=key, reverse=descending)
+
+		total = len(entities)
+		per_page = int(parameters.get("per_page", 10))
+		if "offset" in parameters:
+			start = int(parameters["offset"])
+		else:
+			start = (int(parameters.get("page", 1)) - 1) * per_page
+		return entities[start:start + per_page], total
+
+class WPORMLocalIndex:
+	'''
+	Complete snapshots of entity classes (see 'LocalCollection'), key = class name.
+	'''
+	def __init__(self):
+		self.initialize()
+
+	def initialize(self):
+		'''
+		Internal method to set up the index from scratch.
+		'''
+		self.collections = dict()
+
+	def set(self, class_object, entities, statuses=("publish",)):
+		'''
+		Records the given entities as every entity of the class (with the given statuses) on the site.
+		'''
+		self.collections[class_object.__name__] = LocalCollection(class_object, entities, statuses)
+		return self.collections[class_object.__name__]
+
+	def collection(self, class_object):
+		'''
+		Returns the snapshot of the given class, or None.
+		'''
+		return self.collections.get(class_object.__name__, None)
+
+	def discard(self, class_object):
+		'''
+		Forgets the snapshot of the given class, e.g. because it is no longer complete.
+		'''
+		self.collections.pop(class_object.__name__, None)
+
+	def query(self, class_object, parameters, ranked_search=False):
+		'''
+		Returns (list of entities, total) if the request parameters can be answered from a snapshot, otherwise None.
+
+		ranked_search : see 'LocalCollection.query'
+		'''
+		collection = self.collections.get(class_object.__name__, None)
+		if collection is None or collection.class_object is not class_object or not collection.can_answer(parameters):
+			return None
+		return collection.query(parameters, ranked_search=ranked_search)
+
+	def clear(self):
+		'''
+		Forget all snapshots.
+		'''
+		self.initialize()
@@ -0,0 +1,174 @@
+'''
+Lazy, paginated collections of WordPress entities.
+
+An author or category archive can hold thousands of posts, far more than fit in one
+response (WordPress returns at most 100 items per request). The class here reads the
+pages of a query only as they are needed, so 'len(user.posts)' needs a single request
+and 'user.posts[200:250]' only requests the page(s) holding those posts.
+'''
+
+import logging
+import functools
+import concurrent.futures
+
+from .cache import WPORMCacheObjectNotFoundError
+from . import explain
+from .entities.wordpress_entity import MAX_PER_PAGE
+
+logger = logging.getLogger(__name__.split(".")[0]) # package name
+
+def cached_get(request, class_object, embed):
+	'''
+	Returns (list of entities, X-WP-Total) for the request, from 'api.response_cache' if the same request was made before.
+	
+	request      : a request object (e.g. 'PostRequest') with its parameters set, not yet used
+	class_object : the class of the entities
+	embed        : 'embed' argument of the request's 'get'
+	'''
+	api = request.api
+	request.populate_request_parameters()
+	key = api.response_cache.key(request.url, dict(request.parameters, _embed=embed))
+	try:
+		entities, total = api.response_cache.get(key)
+		api.record_request("GET", request.url, request.parameters, source=explain.RESPONSE_CACHE)
+		return entities, total
+	except WPORMCacheObjectNotFoundError:
+		entities = request.get(class_object=class_object, embed=embed) or list()
+		api.response_cache.set(key, entities, request.total)
+		return entities, request.total
+
+class PaginatedList:
+	'''
+	A read-only sequence of the entities matching a query, read from WordPress a page at a time.
+
+	'len()' is the total reported by WordPress ('X-WP-Total'). Indexing and slicing request only the
+	pages holding the items asked for (in parallel); iterating requests the next page while the
+	current one is being consumed. Each page is requested once per collection, and the total is the
+	one read with the last page; a new collection (e.g. 'user.posts' again) reads the site again.
+	Collections returned by 'cached()' keep their pages in 'api.response_cache' instead, so
+	collections for the same query (e.g. the 'posts' of the same user) share them.
+	'''
+	def __init__(self, api, request_factory, class_object, per_page=MAX_PER_PAGE, embed=None, cached=False):
+		'''
+		api             : the API object
+		request_factory : function (without arguments) that returns a new request with the query parameters set, e.g. a 'PostRequest'
+		class_object    : the class of the entities in the collection
+		per_page        : number of entities read per request (at most 100)
+		embed           : 'embed' argument of the request's 'get', default: the link relations the class attaches (see 'embedded_relations')
+		cached          : BOOL, if True, keep the pages read in 'api.response_cache' (see 'cached')
+		'''
+		self.api = api
+		self.request_factory = request_factory
+		self.class_object = class_object
+		self.per_page = per_page
+		if embed is None:
+			embed = list(class_object.embedded_relations) or False
+		self.embed = embed
+		self.is_cached = cached
+		self.relations = list() # relations prefetched for every page read
+		self._total = None
+		self._pages = dict() # pages read by this collection, key = page number, value = list of entities
+
+	def __repr__(self):
+		total = "?" if self._total is None else self._total
+		return "<{0} of {1} objects at {2}, total={3}>".format(self.__class__.__name__, self.class_object.__name__, hex(id(self)), total)
+
+	def prefetch(self, *relations):
+		'''
+		Prefetch the given relations (see 'API.prefetch') for the entities of every page read; returns the collection.
+
+		Example: for post in user.posts.prefetch("featured_media", "categories"): ...
+		'''
+		self.relations = list(relations)
+		return self
+
+	def cached(self):
+		'''
+		Returns a new collection for the same query whose pages are kept in 'api.response_cache' and shared with other cached collections.
+
+		Cached pages are not refreshed: they change only when the response cache is cleared (e.g. by 'API.sync').
+		'''
+		collection = self.__class__(self.api, self.request_factory, self.class_object, per_page=self.per_page, embed=self.embed, cached=True)
+		collection.relations = list(self.relations)
+		return collection
+
+	def to_columns(self, fields=None, arrays=True):
+		'''
+		Returns the whole collection as columns, without creating entities (see 'WPRequest.to_columns').
+
+		The pages are read from WordPress, not from 'api.response_cache'.
+		'''
+		request = self.request_factory()
+		request.per_page = self.per_page
+		return request.to_columns(fields=fields, arrays=arrays)
+
+	@property
+	def total_pages(self):
+		return -(-len(self) // self.per_page)
+
+	def get_page(self, page):
+		'''
+		Returns the list of entities on the given page of results (the first page is 1).
+		'''
+		if page in self._pages:
+			return self._pages[page]
+		request = self.request_factory()
+		request.per_page = self.per_page
+		request.page = page
+		if self.is_cached:
+			entities, total = cached_get(request, class_object=self.class_object, embed=self.embed)
+		else:
+			entities = request.get(class_object=self.class_object, embed=self.embed) or list()
+			total = request.total
+		if total is None:
+			# header not returned, e.g. the page was not found
+			total = (page - 1) * self.per_page + len(entities)
+		self._total = total
+
+		if len(self.relations) > 0:
+			self.api.prefetch(entities, *self.relations)
+		self._pages[page] = entities
+		return entities
+
+	def __len__(self):
+		if self._total is None:
+			self.get_page(1)
+		return self._total
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			indices = range(*index.indices(len(self)))
+			if len(indices) == 0:
+				return list()
+			first_page = min(indices) // self.per_page + 1
+			last_page = max(indices) // self.per_page + 1
+			pages = self.api.run_concurrently([functools.partial(self.get_page, page) for page in range(first_page, last_page + 1)])
+			entities = [entity for page_entities in pages for entity in page_entities]
+			offset = (first_page - 1) * self.per_page
+			return [entities[i - offset] for i in indices if i - offset < len(entities)]
+
+		if index < 0:
+			index += len(self)
+		if index < 0 or (self._total is not None and index >= self._total):
+			raise IndexError("{0} index out of range".format(self.__class__.__name__))
+		entities = self.get_page(index // self.per_page + 1)
+		try:
+			return entities[index % self.per_page]
+		except IndexError:
+			raise IndexError("{0} index out of range".format(self.__class__.__name__))
+
+	def __iter__(self):
+		if self.api.max_workers < 2:
+			for page in range(1, self.total_pages + 1):
+				yield from self.get_page(page)
+			return
+
+		# read the next page while the current one is consumed
+		with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+			page = 1
+			future = executor.submit(self.get_page, page)
+			while future is not None:
+				entities = future.result()
+				page += 1
+				future = executor.submit(self.get_page, page) if page <= self.total_pages else None
+				yield from entities
@@ -0,0 +1,179 @@
+'''
+Lazy, chainable queries of WordPress entities.
+
+Request objects (e.g. 'PostRequest') are configured by setting attributes and can only be
+used once. A 'QuerySet' instead describes a query without running it; each call to
+'filter' or 'order_by' returns a new QuerySet, and requests are only made when the
+results are used:
+
+	posts = api.posts.filter(categories=[4, 9]).order_by("-date")[200:450]
+'''
+
+import logging
+import functools
+
+from .paginated import PaginatedList
+from .entities.wordpress_entity import MAX_PER_PAGE
+
+logger = logging.getLogger(__name__.split(".")[0]) # package name
+
+class QuerySet:
+	'''
+	An immutable description of a query for entities of one class, evaluated only when used.
+
+	Slicing (e.g. 'qs[200:450]') returns a list, read with the smallest number of requests that
+	cover the range exactly ('offset'/'per_page', up to 100 entities each, made in parallel).
+	Iterating reads every page of results (see 'PaginatedList'); 'len()' is the number of
+	matching entities. Calling the QuerySet with 'ids' or 'slugs' looks up those entities
+	(see 'API.lookup'), e.g. 'api.posts(ids=[12, 7])'.
+
+	Slices are read from WordPress each time, unless the QuerySet was made with 'cached()'.
+	'''
+	def __init__(self, api, class_object, filters=None, ordering=None, embed=None, cached=False):
+		'''
+		api          : the API object
+		class_object : the class of the entities, e.g. 'Post'
+		filters      : dictionary of request parameters, key = parameter name (e.g. "categories"), value = value to set on the request
+		ordering     : field to order by, prefixed with "-" for descending order (e.g. "-date")
+		embed        : 'embed' argument of the request's 'get', default: the link relations the class attaches (see 'embedded_relations')
+		cached       : BOOL, if True, slices are kept in (and returned from) 'api.response_cache'
+		'''
+		self.api = api
+		self.class_object = class_object
+		self.filters = dict(filters or dict())
+		self.ordering = ordering
+		if embed is None:
+			embed = list(class_object.embedded_relations) or False
+		self.embed = embed
+		self.is_cached = cached
+		self._total = None # number of entities matching the query, once known
+
+	def __repr__(self):
+		return "<{0} of {1} objects at {2}, filters={3}, ordering={4}>".format(self.__class__.__name__, self.class_object.__name__,
+																			 hex(id(self)), self.filters, self.ordering)
+
+	def __call__(self, ids=None, slugs=None):
+		'''
+		Returns a list of the entities with the provided IDs or slugs, in the order given (see 'API.lookup').
+
+		The filters of the QuerySet are not applied.
+		'''
+		return self.api.lookup(self.class_object, ids=ids, slugs=slugs)
+
+	def copy(self, **kwargs):
+		'''
+		Returns a new QuerySet with the same query, changing the given arguments of the initializer.
+		'''
+		arguments = {"filters":self.filters, "ordering":self.ordering, "embed":self.embed, "cached":self.is_cached}
+		arguments.update(kwargs)
+		return self.__class__(self.api, self.class_object, **arguments)
+
+	def filter(self, **parameters):
+		'''
+		Returns a new QuerySet that also limits the results by the given request parameters.
+
+		The parameters are those of the request for the class (e.g. 'PostRequest'), such as
+		'categories', 'tags', 'author', 'search', 'after', 'before', 'status'. A parameter given
+		again replaces its previous value.
+		'''
+		request = self.api.request_for_class(self.class_object)
+		for name in parameters:
+			if name not in request.parameter_names or name in ["page", "per_page", "offset", "order", "orderby"]:
+				raise ValueError("'{0}' is not a filter for '{1}' queries.".format(name, self.class_object.__name__))
+		return self.copy(filters=dict(self.filters, **parameters))
+
+	def order_by(self, field):
+		'''
+		Returns a new QuerySet ordered by the given field, in descending order if prefixed with "-" (e.g. "-date").
+		'''
+		return self.copy(ordering=field)
+
+	def cached(self):
+		'''
+		Returns a new QuerySet whose slices are kept in 'api.response_cache', so slicing the same range again makes no requests.
+
+		Cached slices are not refreshed: they change only when the response cache is cleared (e.g. by 'API.sync').
+		'''
+		return self.copy(cached=True)
+
+	def request(self):
+		'''
+		Returns a new request object (e.g. 'PostRequest') with the parameters of this query set.
+		'''
+		request = self.api.request_for_class(self.class_object)
+		for name, value in self.filters.items():
+			setattr(request, name, value)
+		if self.ordering is not None:
+			request.orderby = self.ordering.lstrip("-")
+			request.order = "desc" if self.ordering.startswith("-") else "asc"
+		return request
+
+	def compile(self):
+		'''
+		Returns a 'CompiledRequest' for this query, to run it repeatedly with some parameters changed (e.g. 'page', 'search').
+		'''
+		return self.request().compile(class_object=self.class_object, embed=self.embed)
+
+	def to_columns(self, fields=None, arrays=True):
+		'''
+		Returns every entity matching the query as columns, without creating entities (see 'WPRequest.to_columns').
+		'''
+		return self.request().to_columns(fields=fields, arrays=arrays)
+
+	def count(self):
+		'''
+		Returns the number of entities that match the query.
+		'''
+		if self._total is None:
+			self._total = self.request().get(count=True) # a minimal request, no entity data is downloaded
+		return self._total
+
+	def __len__(self):
+		return self.count()
+
+	def __iter__(self):
+		return iter(PaginatedList(api=self.api, request_factory=self.request, class_object=self.class_object, embed=self.embed))
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			if index.step not in [None, 1]:
+				return self[index.start:index.stop][::index.step]
+			start = 0 if index.start is None else index.start
+			stop = index.stop
+			if start < 0 or stop is None or stop < 0:
+				start, stop, step = index.indices(self.count())
+			return self.window(start, stop)
+
+		if index < 0:
+			index += self.count()
+		entities = self.window(index, index + 1) if index >= 0 else list()
+		if len(entities) == 0:
+			raise IndexError("{0} index out of range".format(self.__class__.__name__))
+		return entities[0]
+
+	def window(self, start, stop):
+		'''
+		Returns the list of entities from position 'start' up to (not including) 'stop' in the results.
+
+		The range is read with 'offset'/'per_page' requests of up to 100 entities each, made in
+		parallel. Request types that don't support 'offset' read the (100 entity) pages covering the range.
+		'''
+		if stop <= start:
+			return list()
+
+		compiled = self.compile() # the parameters are prepared once for all the requests below
+		if type(compiled.template).supports_offset:
+			calls = [functools.partial(compiled.execute, cached=self.is_cached, with_total=True, offset=offset, per_page=min(MAX_PER_PAGE, stop - offset))
+					 for offset in range(start, stop, MAX_PER_PAGE)]
+			skip = 0
+		else:
+			calls = [functools.partial(compiled.execute, cached=self.is_cached, with_total=True, page=page, per_page=MAX_PER_PAGE)
+					 for page in range(start // MAX_PER_PAGE + 1, (stop - 1) // MAX_PER_PAGE + 2)]
+			skip = start % MAX_PER_PAGE
+
+		entities = list()
+		for page_entities, total in self.api.run_concurrently(calls):
+			entities.extend(page_entities)
+			if total is not None:
+				self._total = total
+		return entities[skip:skip + stop - start]
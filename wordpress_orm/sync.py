@@ -0,0 +1,96 @@
+'''
+Keeping a local copy of a site up to date.
+
+The first 'API.sync' reads every entity of the given classes. Later runs only read the
+entities modified since the previous run ('modified_after', for classes with a 'modified'
+field) and find deleted entities by comparing the IDs on the site (read with '_fields=id',
+a few bytes per entity) with those seen before. Classes without a 'modified' field
+(categories, tags, users) are small and are read in full each time.
+'''
+
+import logging
+import functools
+from datetime import datetime, timedelta
+
+from .entities import Post, Page
+
+logger = logging.getLogger(__name__.split(".")[0]) # package name
+
+# classes whose synchronized entities are kept as a complete snapshot (see 'API.preload')
+snapshot_classes = [Post, Page]
+
+class WPORMSync:
+	'''
+	Synchronizes the entity cache with the site, remembering for each class the IDs seen and the latest 'modified' date.
+	'''
+	def __init__(self, api):
+		self.api = api
+		self.initialize()
+
+	def initialize(self):
+		'''
+		Internal method to set up the state from scratch (the next 'run' reads every entity again).
+		'''
+		self.marks = dict() # key = class name, value = latest 'modified' value seen (ISO 8601 string), or None
+		self.ids = dict()   # key = class name, value = set of WordPress IDs on the site
+
+	def run(self, classes, full=False):
+		'''
+		Synchronizes the given classes (in parallel); returns a dictionary, key = class name,
+		value = {"changed":list of entities read, "deleted":list of IDs of deleted entities}.
+
+		full : BOOL, if True, read every entity again
+		'''
+		classes = list(classes)
+		if full:
+			for class_object in classes:
+				self.marks.pop(class_object.__name__, None)
+				self.ids.pop(class_object.__name__, None)
+		results = self.api.run_concurrently([functools.partial(self.sync_class, c) for c in classes])
+		if any(len(r["changed"]) > 0 or len(r["deleted"]) > 0 for r in results):
+			self.api.response_cache.clear() # pages of query results may have changed
+		return {c.__name__:result for c, result in zip(classes, results)}
+
+	def sync_class(self, class_object):
+		'''
+		Synchronizes one class, see 'run'.
+		'''
+		name = class_object.__name__
+		initial = name not in self.ids
+		incremental = not initial and self.marks.get(name, None) is not None
+
+		request = self.api.request_for_class(class_object)
+		request.refresh = True # update cached entities in place
+		if incremental:
+			# an edit made in the same second as the mark would be missed by 'modified_after' alone
+			since = datetime.strptime(self.marks[name][:19], "%Y-%m-%dT%H:%M:%S") - timedelta(seconds=1)
+			request.parameters["modified_after"] = since.isoformat()
+			request.parameters["orderby"] = "modified"
+			request.parameters["order"] = "asc"
+		changed = request.get_all(class_object=class_object, embed=list(class_object.embedded_relations) or False)
+
+		if incremental:
+			ids_request = self.api.request_for_class(class_object)
+			ids_request.refresh = True # read from the site, not a snapshot
+			ids_request.parameters["_fields"] = "id"
+			ids = set(record["id"] for record in ids_request.get_all(class_object=dict, embed=False))
+		else:
+			ids = set(entity.s.id for entity in changed)
+		deleted = sorted(self.ids.get(name, set()) - ids)
+		for wpid in deleted:
+			self.api.wordpress_object_cache.discard(class_name=name, key=wpid)
+		self.api.update_slug_ids(class_object, changed=changed, deleted=deleted) # e.g. a renamed category
+
+		modified = [entity.s.modified for entity in changed if getattr(entity.s, "modified", None)]
+		self.marks[name] = max(modified + ([self.marks[name]] if self.marks.get(name, None) else list()), default=None)
+		self.ids[name] = ids
+
+		if class_object in snapshot_classes:
+			collection = self.api.local_index.collection(class_object)
+			if not incremental:
+				self.api.local_index.set(class_object, changed)
+			elif collection is not None:
+				collection.update(entities=changed, deleted_ids=deleted)
+
+		logger.debug("Synchronized {0}: {1} read, {2} deleted.".format(name, len(changed), len(deleted)))
+		return {"changed":changed, "deleted":deleted}
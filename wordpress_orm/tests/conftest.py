@@ -12,6 +12,8 @@ import pytest
 from ..api import API
 from requests.auth import HTTPBasicAuth
 
+from .fake_wordpress import FakeWordPressSession, BASE_URL
+
 #
 # Fixtures are pytest resources used for testing. Define fixtures here.
 # At the very least, the application must be defined as a fixure named "app".
@@ -51,10 +53,18 @@ def wp_api(request):
 	
 	return wordpress
 
+@pytest.fixture
+def fake_wordpress():
+	'''
+	An in-memory WordPress site; add records to 'fake_wordpress.records["posts"]' etc.
+	'''
+	return FakeWordPressSession()
 
-
-
-
-
-
-
+@pytest.fixture
+def offline_api(fake_wordpress):
+	'''
+	Instance of the WordPress API object that talks to the in-memory site in the 'fake_wordpress' fixture.
+	'''
+	wordpress = API(url=BASE_URL)
+	wordpress.session = fake_wordpress
+	return wordpress
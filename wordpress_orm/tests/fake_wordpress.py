@@ -0,0 +1,194 @@
+'''
+An in-memory stand-in for a WordPress site, used to run tests without a network connection.
+
+'FakeWordPressSession' is used in place of a 'requests.Session' object (i.e. set as
+'api.session') and answers GET requests from lists of records held in memory,
+applying the subset of the WordPress REST API query arguments the tests need.
+'''
+
+import io
+import json
+from urllib.parse import urlencode
+
+import requests
+
+BASE_URL = "https://wordpress.example.org/wp-json/wp/v2/"
+
+class FakeWordPressSession:
+	'''
+	Replacement for 'requests.Session' that serves canned WordPress records.
+
+	records : dictionary, key = endpoint name (e.g. "posts"), value = list of record dictionaries
+	'''
+	def __init__(self, records=None, base_url=BASE_URL):
+		self.base_url = base_url
+		self.records = records if records is not None else dict()
+		self.requests = list() # (method, url, parameters) of every request made
+
+	def get(self, url=None, params=None, auth=None, stream=False, **kwargs):
+		return self.respond("GET", url, params)
+
+	def head(self, url=None, params=None, auth=None, **kwargs):
+		return self.respond("HEAD", url, params)
+
+	def close(self):
+		pass
+
+	def respond(self, method, url, params):
+		params = {k:str(v) for k,v in (params or dict()).items()}
+		self.requests.append((method, url, params))
+
+		path = url[len(self.base_url):].strip("/").split("/")
+		endpoint = path[0]
+		records = self.records.get(endpoint, list())
+
+		if len(path) > 1:
+			matches = [r for r in records if str(r["id"]) == path[1]]
+			if len(matches) == 0:
+				return self.make_response(method, url, params, status=404,
+										  payload={"code":"rest_invalid_id", "message":"Invalid ID.", "data":{"status":404}})
+			return self.make_response(method, url, params, payload=self.present(matches[0], params))
+
+		records = self.filter(records, params)
+
+		total = len(records)
+		per_page = int(params.get("per_page", 10))
+		if per_page > 100:
+			return self.make_response(method, url, params, status=400,
+									  payload={"code":"rest_invalid_param", "message":"Invalid parameter(s): per_page", "data":{"status":400}})
+		page = int(params.get("page", 1))
+		offset = int(params.get("offset", (page - 1) * per_page))
+		window = records[offset:offset + per_page]
+
+		headers = {"X-WP-Total":str(total), "X-WP-TotalPages":str(-(-total // per_page))}
+		return self.make_response(method, url, params, payload=[self.present(r, params) for r in window], headers=headers)
+
+	def filter(self, records, params):
+		'''
+		Apply the collection query arguments to the list of records.
+		'''
+		def csv(name):
+			return params[name].split(",")
+
+		if "include" in params:
+			records = [r for r in records if str(r["id"]) in csv("include")]
+		if "exclude" in params:
+			records = [r for r in records if str(r["id"]) not in csv("exclude")]
+		if "slug" in params:
+			records = [r for r in records if r.get("slug") in csv("slug")]
+		for name in ["author", "post", "parent"]:
+			if name in params:
+				records = [r for r in records if str(r.get(name)) in csv(name)]
+		if "author_exclude" in params:
+			records = [r for r in records if str(r.get("author")) not in csv("author_exclude")]
+		for name in ["categories", "tags"]:
+			if name in params:
+				records = [r for r in records if set(str(x) for x in r.get(name, [])) & set(csv(name))]
+		if "search" in params:
+			term = params["search"].lower()
+			records = [r for r in records if term in json.dumps(r.get("title", r.get("name", ""))).lower()]
+		if "after" in params:
+			records = [r for r in records if r["date"] > params["after"]]
+		if "before" in params:
+			records = [r for r in records if r["date"] < params["before"]]
+		if "modified_after" in params:
+			records = [r for r in records if r["modified"] > params["modified_after"]]
+		if params.get("orderby", None) == "include" and "include" in params:
+			records = sorted(records, key=lambda r: csv("include").index(str(r["id"])))
+		elif "orderby" in params:
+			key = params["orderby"]
+			def value(r):
+				v = r.get(key)
+				return v["rendered"] if isinstance(v, dict) else v
+			records = sorted(records, key=value, reverse=(params.get("order", "desc") == "desc"))
+		return records
+
+	def present(self, record, params):
+		'''
+		Return the record as WordPress would render it for this query.
+		'''
+		record = dict(record)
+		if "_embed" not in params:
+			record.pop("_embedded", None)
+		elif params["_embed"] not in ["true", "1", ""] and "_embedded" in record:
+			relations = params["_embed"].split(",")
+			record["_embedded"] = {k:v for k,v in record["_embedded"].items() if k in relations}
+		if "_links" not in record and "_fields" not in params:
+			record["_links"] = {"self":[{"href":"{0}{1}s/{2}".format(BASE_URL, record.get("type", "item"), record["id"])}]}
+		if "_fields" in params:
+			fields = params["_fields"].split(",")
+			record = {k:v for k,v in record.items() if k in fields}
+		return record
+
+	def make_response(self, method, url, params, status=200, payload=None, headers=None):
+		body = json.dumps(payload).encode("utf-8")
+
+		response = requests.Response()
+		response.status_code = status
+		response.url = "{0}?{1}".format(url, urlencode(params)) if params else url
+		response.encoding = "utf-8"
+		response.headers["Content-Type"] = "application/json; charset=UTF-8"
+		response.headers.update(headers or dict())
+		response.raw = io.BytesIO(b"" if method == "HEAD" else body)
+		response.request = requests.Request(method=method, url=url, params=params).prepare()
+		return response
+
+def rendered(value):
+	return {"rendered":value}
+
+def user_record(id, name="Ada Lovelace"):
+	slug = name.lower().replace(" ", "-")
+	return {"id":id, "name":name, "url":"", "description":"Writes about {0}.".format(slug), "slug":slug,
+			"link":"https://wordpress.example.org/author/{0}/".format(slug),
+			"avatar_urls":{"24":"https://secure.gravatar.com/avatar/{0}?s=24".format(id),
+						   "48":"https://secure.gravatar.com/avatar/{0}?s=48".format(id),
+						   "96":"https://secure.gravatar.com/avatar/{0}?s=96".format(id)},
+			"meta":[]}
+
+def term_record(id, name, taxonomy="category", count=1):
+	slug = name.lower().replace(" ", "-")
+	base = "category" if taxonomy == "category" else "tag"
+	return {"id":id, "count":count, "description":"", "name":name, "slug":slug, "taxonomy":taxonomy, "meta":[],
+			"link":"https://wordpress.example.org/{0}/{1}/".format(base, slug), "parent":0}
+
+def media_record(id, author=1, post=None):
+	return {"id":id, "date":"2019-01-01T00:00:00", "date_gmt":"2019-01-01T00:00:00",
+			"guid":rendered("https://wordpress.example.org/wp-content/uploads/image-{0}.jpg".format(id)),
+			"modified":"2019-01-01T00:00:00", "modified_gmt":"2019-01-01T00:00:00",
+			"slug":"image-{0}".format(id), "status":"inherit", "type":"attachment",
+			"link":"https://wordpress.example.org/image-{0}/".format(id), "title":rendered("Image {0}".format(id)),
+			"author":author, "comment_status":"open", "ping_status":"closed", "template":"", "meta":[],
+			"description":rendered("<p>Image {0}</p>".format(id)), "caption":rendered(""), "alt_text":"",
+			"media_type":"image", "mime_type":"image/jpeg", "post":post,
+			"media_details":{"width":1024, "height":768, "file":"image-{0}.jpg".format(id), "sizes":{}},
+			"source_url":"https://wordpress.example.org/wp-content/uploads/image-{0}.jpg".format(id)}
+
+def post_record(id, author=1, categories=(1,), tags=(), featured_media=0, paragraphs=20,
+				date="2019-01-01T00:00:00", modified=None, endpoint="posts", embedded=None):
+	'''
+	A realistic post (or page) record as returned by the WordPress API.
+	'''
+	content = "".join("<p>Paragraph {0} of item {1}, with some text that goes on for a while.</p>\n".format(n, id)
+					  for n in range(paragraphs))
+	record = {"id":id, "date":date, "date_gmt":date, "modified":modified or date, "modified_gmt":modified or date,
+			  "guid":rendered("https://wordpress.example.org/?p={0}".format(id)),
+			  "slug":"item-{0}".format(id), "status":"publish", "type":endpoint[:-1],
+			  "link":"https://wordpress.example.org/{0}/item-{1}/".format(endpoint, id),
+			  "title":rendered("Item number {0}".format(id)), "content":rendered(content),
+			  "excerpt":rendered("<p>Paragraph 0 of item {0}</p>\n".format(id)),
+			  "author":author, "featured_media":featured_media, "comment_status":"open", "ping_status":"open",
+			  "template":"", "meta":[]}
+	record["content"]["protected"] = False
+	if endpoint == "posts":
+		record.update({"sticky":False, "format":"standard", "categories":list(categories), "tags":list(tags)})
+	else:
+		record.update({"parent":0, "menu_order":0})
+	if embedded is not None:
+		record["_embedded"] = embedded
+	return record
+
+def comment_record(id, post, parent=0, author=0):
+	return {"id":id, "post":post, "parent":parent, "author":author, "author_name":"Reader {0}".format(id),
+			"author_url":"", "date":"2019-01-02T00:00:00", "date_gmt":"2019-01-02T00:00:00",
+			"content":rendered("<p>Comment {0}</p>".format(id)), "link":"https://wordpress.example.org/?c={0}".format(id),
+			"status":"approved", "type":"comment", "author_avatar_urls":{}, "meta":[]}
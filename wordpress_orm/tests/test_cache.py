@@ -0,0 +1,51 @@
+
+from ..cache import WPORMValuePool
+from .fake_wordpress import post_record
+
+def test_repeated_values_are_shared(offline_api, fake_wordpress):
+	'''
+	Entities hydrated from separate records share low-cardinality strings, and identical small lists if enabled.
+	'''
+	fake_wordpress.records["posts"] = [post_record(id, categories=[1, 6]) for id in range(1, 4)]
+
+	posts = offline_api.PostRequest().get()
+
+	assert posts[0].s.status == "publish"
+	assert posts[0].s.status is posts[1].s.status is posts[2].s.status
+	assert posts[0].s.slug is not posts[1].s.slug
+	posts[0].s.categories.append(3) # lists are not shared by default
+	assert posts[0].s.categories == [1, 6, 3] and posts[1].s.categories == [1, 6]
+
+	offline_api.value_pool = WPORMValuePool(share_lists=True)
+	offline_api.wordpress_object_cache.clear()
+	posts = offline_api.PostRequest().get()
+	assert posts[0].s.categories == [1, 6]
+	assert posts[0].s.categories is posts[1].s.categories is posts[2].s.categories
+
+def test_value_pool_can_be_disabled(offline_api, fake_wordpress):
+	fake_wordpress.records["posts"] = [post_record(id, categories=[1, 6]) for id in range(1, 3)]
+	offline_api.value_pool = None
+
+	posts = offline_api.PostRequest().get()
+
+	assert posts[0].s.categories == posts[1].s.categories
+	assert posts[0].s.categories is not posts[1].s.categories
+
+def test_large_html_fields_are_fetched_on_demand(offline_api, fake_wordpress):
+	'''
+	Content over 'lazy_html_max_size' is not kept in the cached post, and is fetched again when accessed.
+	'''
+	fake_wordpress.records["posts"] = [post_record(1, paragraphs=50)]
+	offline_api.lazy_html_max_size = 1000
+
+	post = offline_api.PostRequest().get()[0]
+
+	assert post.s.title == "Item number 1"
+	assert post.s.is_deferred("content")
+	assert "Paragraph 49" not in post.json
+	assert len(fake_wordpress.requests) == 1
+
+	assert "Paragraph 49 of item 1" in post.s.content
+	assert fake_wordpress.requests[-1][1].endswith("posts/1")
+	assert fake_wordpress.requests[-1][2]["_fields"] == "content"
+	assert not post.s.is_deferred("content")
@@ -0,0 +1,48 @@
+
+import pytest
+
+from ..columns import to_columns
+from .fake_wordpress import post_record, user_record
+
+def test_to_columns_without_entities(offline_api, fake_wordpress):
+	'''
+	Columns are built from the records alone: only the requested fields are fetched and nothing is cached.
+	'''
+	fake_wordpress.records["posts"] = [post_record(id, author=id % 3) for id in range(1, 6)]
+
+	pr = offline_api.PostRequest()
+	columns = pr.to_columns(fields=["id", "author", "title"], arrays=False)
+	assert "_fields" not in pr.parameters and pr.per_page is None and pr.page is None # the request is not changed
+
+	assert columns["id"] == [1, 2, 3, 4, 5]
+	assert columns["author"] == [1, 2, 0, 1, 2]
+	assert columns["title"][0] == "Item number 1"
+	assert fake_wordpress.requests[-1][2]["_fields"] == "id,author,title"
+	assert offline_api.wordpress_object_cache.cache.get("Post", dict()) == dict()
+
+def test_to_columns_reads_every_page(offline_api, fake_wordpress):
+	fake_wordpress.records["posts"] = [post_record(id, author=1 + id % 2) for id in range(1, 251)]
+	fake_wordpress.records["users"] = [user_record(1), user_record(2)]
+
+	columns = offline_api.PostRequest().to_columns(fields=["id", "author"], arrays=False)
+	assert columns["id"] == list(range(1, 251))
+	assert [params["page"] for method, url, params in fake_wordpress.requests] == ["1", "2", "3"]
+	assert all(params["_fields"] == "id,author" for method, url, params in fake_wordpress.requests)
+
+	columns = offline_api.posts.filter(author=2).order_by("-id").to_columns(fields=["id"], arrays=False)
+	assert columns["id"] == list(range(249, 0, -2))
+	columns = offline_api.user(id=1).posts.to_columns(fields=["id", "author"], arrays=False)
+	assert columns["id"] == list(range(2, 251, 2)) and set(columns["author"]) == {1}
+	assert offline_api.wordpress_object_cache.cache.get("Post", dict()) == dict()
+
+def test_to_columns_numpy_types():
+	numpy = pytest.importorskip("numpy")
+
+	records = [post_record(1, categories=[1, 2]), post_record(2, date="2019-02-01T12:00:00")]
+	columns = to_columns(records, fields=["id", "date", "sticky", "categories", "slug"])
+
+	assert columns["id"].dtype == numpy.int64
+	assert columns["date"].dtype == numpy.dtype("datetime64[s]")
+	assert columns["sticky"].dtype == bool
+	assert columns["categories"][0] == [1, 2]
+	assert list(columns["slug"]) == ["item-1", "item-2"]
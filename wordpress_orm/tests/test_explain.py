@@ -0,0 +1,95 @@
+import logging
+import functools
+import threading
+
+import pytest
+
+from .. import exc, explain
+from ..entities import Post, User
+from .fake_wordpress import post_record, user_record, term_record
+
+def site(fake_wordpress):
+	fake_wordpress.records["users"] = [user_record(7), user_record(8)]
+	fake_wordpress.records["posts"] = [post_record(id, author=7 + id % 2, categories=list(range(1, 151))) for id in range(1, 6)]
+	fake_wordpress.records["categories"] = [term_record(id, "Category {0}".format(id)) for id in range(1, 151)]
+
+def test_explain_records_requests_and_triggers(offline_api, fake_wordpress):
+	site(fake_wordpress)
+
+	with offline_api.explain() as plan:
+		posts = offline_api.PostRequest().get(embed=False)
+		names = [post.author.s.name for post in posts]
+
+	assert len(plan.requests) == len(fake_wordpress.requests) == 3
+	assert plan.triggers() == {None:1, "User.s.name":2}
+	first, second = plan.requests[0], plan.requests[1]
+	assert first.method == "GET" and first.url.endswith("/posts") and first.trigger is None
+	assert second.url.endswith("/users") and second.parameters["include"] == "8" and not second.cache_hit
+	assert "[miss] <- User.s.name" in str(plan).splitlines()[1]
+
+	# requests made in other threads are attributed to the property that started them
+	offline_api.lazy_relations = False
+	plan = offline_api.explain(lambda: posts[0].categories)
+	assert len(plan.result) == 150
+	assert [r.trigger for r in plan.requests] == ["Post.categories", "Post.categories"] # 100 IDs per request
+
+def test_explain_records_cache_hits(offline_api, fake_wordpress):
+	site(fake_wordpress)
+	query = offline_api.posts.order_by("id").cached()
+	query[0:2]
+	offline_api.preload(Post)
+	fake_wordpress.requests.clear()
+
+	with offline_api.explain() as plan:
+		query[0:2]
+		offline_api.posts.filter(author=8)[0:2]
+		offline_api.lookup(Post, ids=[1, 2])
+
+	assert [r.source for r in plan] == [explain.RESPONSE_CACHE, explain.LOCAL_SNAPSHOT, explain.ENTITY_CACHE]
+	assert all(r.cache_hit for r in plan) and len(plan.requests) == 0
+	assert plan[2].parameters == {"include":"1,2"}
+	assert len(fake_wordpress.requests) == 0
+
+def test_request_budget(offline_api, fake_wordpress, caplog):
+	site(fake_wordpress)
+	posts = offline_api.PostRequest().get(embed=False)
+
+	with pytest.raises(exc.RequestBudgetExceeded) as error:
+		with offline_api.request_budget(1) as budget:
+			names = [post.author.s.name for post in posts]
+	assert budget.used == 1 and len(fake_wordpress.requests) == 2 # the second author was not requested
+	assert "User.s.name" in str(error.value)
+
+	offline_api.wordpress_object_cache.clear()
+	with caplog.at_level(logging.WARNING):
+		with offline_api.request_budget(1, raise_error=False) as budget:
+			offline_api.PostRequest().get(embed=False)
+			names = [post.author.s.name for post in offline_api.PostRequest().get(embed=False)]
+	assert budget.used == 4
+	assert len([r for r in caplog.records if "Request budget of 1 exceeded" in r.getMessage()]) == 1
+	assert offline_api.active_recorders() == ()
+
+def test_scopes_belong_to_their_thread(offline_api, fake_wordpress):
+	'''
+	A budget or plan only sees the requests of its thread, and of the threads it starts with 'run_concurrently'.
+	'''
+	site(fake_wordpress)
+	errors = list()
+	def other_thread():
+		try:
+			offline_api.PostRequest().get(embed=False)
+		except Exception as error:
+			errors.append(error)
+
+	with offline_api.request_budget(0) as budget:
+		thread = threading.Thread(target=other_thread)
+		thread.start()
+		thread.join()
+	assert errors == [] and budget.used == 0 and len(fake_wordpress.requests) == 1
+
+	with offline_api.explain() as plan:
+		thread = threading.Thread(target=other_thread)
+		thread.start()
+		thread.join()
+		offline_api.run_concurrently([functools.partial(offline_api.fetch_by_ids, User, [id]) for id in [7, 8]])
+	assert sorted(record.parameters["include"] for record in plan.requests) == ["7", "8"]
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+
+from ..entities import Post
+from ..local import SearchIndex, tokenize
+from .fake_wordpress import post_record, rendered
+
+def site_posts(count):
+	start = datetime(2019, 1, 1)
+	return [post_record(id, author=1 + id % 3, categories=[1 + id % 4], tags=[10 + id % 5], paragraphs=1,
+						date=(start + timedelta(hours=7 * id)).isoformat()) for id in range(1, count + 1)]
+
+def test_preloaded_posts_answer_queries_locally(offline_api, fake_wordpress):
+	'''
+	Once every post is preloaded, filtered and paginated queries give the same results without requests.
+	'''
+	fake_wordpress.records["posts"] = site_posts(240)
+	queries = [dict(categories=[2, 3], orderby="date", order="desc", per_page=20, page=2),
+			   dict(tags=[11], author=2, orderby="id", order="asc", per_page=100),
+			   dict(after=datetime(2019, 2, 1), before=datetime(2019, 2, 15), orderby="title", order="asc", per_page=50),
+			   dict(search="13", orderby="date", order="asc"),
+			   dict(include=[30, 5, 17], orderby="include")]
+
+	def run(query, count=False):
+		pr = offline_api.PostRequest()
+		for name, value in query.items():
+			setattr(pr, name, value)
+		return pr.get(count=count) if count else [p.s.id for p in pr.get()]
+
+	offline_api.local_queries = False
+	expected = [(run(q), run(q, count=True)) for q in queries]
+	offline_api.local_queries = True
+	assert all(len(ids) > 0 for ids, total in expected)
+
+	offline_api.preload(Post)
+	request_count = len(fake_wordpress.requests)
+	assert [(run(q), run(q, count=True)) for q in queries] == expected
+	assert offline_api.posts.filter(categories=[1]).order_by("-date")[10:40] is not None
+	assert len(fake_wordpress.requests) == request_count
+
+def test_local_queries_fall_back_to_wordpress(offline_api, fake_wordpress):
+	fake_wordpress.records["posts"] = site_posts(30)
+	offline_api.lazy_html_max_size = 10 # content is not kept, so it can't be searched locally
+	offline_api.preload(Post)
+	request_count = len(fake_wordpress.requests)
+
+	pr = offline_api.PostRequest()
+	pr.categories = [2]
+	assert len(pr.get()) == 8
+	assert len(fake_wordpress.requests) == request_count
+
+	pr = offline_api.PostRequest()
+	pr.search = "number"
+	pr.get()
+	pr = offline_api.PostRequest()
+	pr.sticky = True # not indexed
+	pr.get()
+	assert len(fake_wordpress.requests) == request_count + 2
+
+def test_search_index():
+	assert tokenize("Grilled Cheese, with wine!") == ["grilled", "cheese", "with", "wine"]
+
+	index = SearchIndex()
+	index.add(1, ("Cheese", "", "cheese and bread"))
+	index.add(2, ("Bread", "", "bread bread cheesecake"))
+	index.add(3, ("Wine", "", "red wine"))
+
+	assert index.expand("chee") == ["cheese", "cheesecake"]
+	# WordPress semantics: substrings, quoted phrases, excluded terms
+	assert index.match("ees") == {1, 2}
+	assert index.match("bread -cheesecake") == {1}
+	assert index.match('"and bread"') == {1}
+	assert index.match(" , ") is None
+	# stopwords and single letters are left out of searches of several terms
+	assert index.match("the cheese") == {1, 2} and index.match("a wine") == {3}
+	assert index.match("the") == set() and index.match("with the") == set()
+
+	# ranked: prefixes of words, BM25 scores
+	scores = index.ranked("chee")
+	assert set(scores) == {1, 2} and scores[1] > scores[2]
+	scores = index.ranked("bread")
+	assert scores[2] > scores[1]
+	assert index.ranked("ees") == dict()
+
+	index.remove(2)
+	assert index.expand("chee") == ["cheese"] and index.match("bread") == {1}
+	assert len(index) == 2
+
+def test_ranked_search_is_opt_in(offline_api, fake_wordpress):
+	posts = site_posts(30)
+	for record in posts:
+		record["title"] = rendered("Item number {0} about {1}".format(record["id"], ["cheese", "cheesecake", "wine"][record["id"] % 3]))
+	posts[4]["content"] = rendered("<p>Cheese, cheese and more cheese.</p>")
+	fake_wordpress.records["posts"] = posts
+	offline_api.preload(Post)
+	request_count = len(fake_wordpress.requests)
+
+	def search(term, **parameters):
+		pr = offline_api.PostRequest()
+		pr.search = term
+		pr.per_page = 100
+		for name, value in parameters.items():
+			setattr(pr, name, value)
+		return [p.s.id for p in pr.get()]
+
+	# as WordPress: substrings, and titles containing the term first
+	assert set(search("eesec")) == set(range(1, 31, 3))
+	assert search("cheese", orderby="relevance")[0] == 30 # most recent post with "cheese" in the title
+	assert search("chee", orderby="relevance")[0] == 30
+
+	offline_api.ranked_search = True
+	assert search("eesec") == list() # not the start of a word
+	assert search("chee", orderby="relevance")[0] == 5 # "cheese" four times
+
+	# updates change the search index in place
+	collection = offline_api.local_index.collection(Post)
+	index = collection.search_index
+	edited = offline_api.post(id=6)
+	edited.s.content = "<p>Cheesy cheese, cheese, cheese, cheese.</p>"
+	collection.update(entities=[edited], deleted_ids=[5])
+	assert collection.search_index is index and 5 not in index.documents
+	assert search("chee", orderby="relevance")[0] == 6
+	assert len(fake_wordpress.requests) == request_count
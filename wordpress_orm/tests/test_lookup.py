@@ -0,0 +1,92 @@
+import pytest
+
+from ..entities import Category
+from .fake_wordpress import post_record, user_record, term_record
+
+def test_posts_by_ids_in_requested_order(offline_api, fake_wordpress):
+	'''
+	Uncached posts are fetched in chunks of 100 IDs; the result follows the order of the IDs given.
+	'''
+	fake_wordpress.records["posts"] = [post_record(id) for id in range(1, 301)]
+	offline_api.post(id=17) # cached
+	request_count = len(fake_wordpress.requests)
+
+	ids = list(range(250, 0, -1)) + [999] # 999 doesn't exist
+	posts = offline_api.posts(ids=ids)
+
+	assert [p.s.id for p in posts] == list(range(250, 0, -1))
+	requests = fake_wordpress.requests[request_count:]
+	assert len(requests) == 3
+	assert sorted(len(params["include"].split(",")) for method, url, params in requests) == [50, 100, 100]
+	assert "17" not in ",".join(params["include"] for method, url, params in requests).split(",")
+
+def test_users_by_slugs(offline_api, fake_wordpress):
+	fake_wordpress.records["users"] = [user_record(id, name="Author {0}".format(id)) for id in range(1, 6)]
+
+	users = offline_api.users(slugs=["author-4", "author-2", "author-5"])
+
+	assert [u.s.id for u in users] == [4, 2, 5]
+	assert fake_wordpress.requests[-1][2]["slug"] == "author-4,author-2,author-5"
+	assert offline_api.users(slugs=["author-2"])[0] is users[1]
+	assert len(fake_wordpress.requests) == 1
+
+def test_filter_slugs_resolved_together(offline_api, fake_wordpress):
+	'''
+	Slugs given to filters cost one request per entity class, and are remembered.
+	'''
+	fake_wordpress.records["categories"] = [term_record(id, "Topic {0}".format(id)) for id in range(1, 11)]
+	fake_wordpress.records["tags"] = [term_record(id, "Label {0}".format(id), taxonomy="post_tag") for id in range(20, 25)]
+	fake_wordpress.records["users"] = [user_record(id, name="Author {0}".format(id)) for id in range(1, 4)]
+	fake_wordpress.records["posts"] = [post_record(id, author=1 + id % 3, categories=[id % 10 + 1], tags=[20 + id % 5])
+									   for id in range(1, 101)]
+
+	def request():
+		pr = offline_api.PostRequest()
+		pr.categories = ["topic-{0}".format(n) for n in range(1, 11)] + [4]
+		pr.tags = ["label-21", 22]
+		pr.author = "author-2"
+		pr.per_page = 100
+		return pr
+
+	posts = request().get()
+	assert sorted(p.s.id for p in posts) == [id for id in range(1, 101) if 1 + id % 3 == 2 and 20 + id % 5 in [21, 22]]
+	assert sorted(url.rsplit("/", 1)[-1] for method, url, params in fake_wordpress.requests) == ["categories", "posts", "tags", "users"]
+
+	offline_api.wordpress_object_cache.clear()
+	request().get()
+	assert len(fake_wordpress.requests) == 5 # only the posts were requested again
+
+	pr = offline_api.PostRequest()
+	pr.categories = ["no-such-topic"]
+	with pytest.raises(ValueError):
+		pr.get()
+
+def test_author_filter_replaced_by_slug(offline_api, fake_wordpress):
+	'''
+	Setting the author again (by ID or slug) replaces the previous author.
+	'''
+	fake_wordpress.records["users"] = [user_record(id, name="Author {0}".format(id)) for id in range(1, 4)]
+	fake_wordpress.records["posts"] = [post_record(id, author=1 + id % 3) for id in range(1, 10)]
+
+	pr = offline_api.PostRequest()
+	pr.author = 3
+	pr.author = "author-2"
+	assert set(p.s.author for p in pr.get()) == {2}
+
+	pr = offline_api.PostRequest()
+	pr.author_exclude = "author-2"
+	pr.author_exclude = 1
+	assert set(p.s.author for p in pr.get()) == {2, 3}
+
+def test_sync_updates_slugs_of_filters(offline_api, fake_wordpress):
+	fake_wordpress.records["categories"] = [term_record(id, "Topic {0}".format(id)) for id in range(1, 4)]
+	fake_wordpress.records["posts"] = [post_record(id, categories=[1 + id % 3]) for id in range(1, 10)]
+
+	assert len(offline_api.posts.filter(categories=["topic-1"])) == 3
+	offline_api.wordpress_object_cache.clear()
+	fake_wordpress.records["categories"][0]["slug"] = "renamed"
+	offline_api.sync([Category])
+
+	assert len(offline_api.posts.filter(categories=["renamed"])) == 3
+	with pytest.raises(ValueError):
+		len(offline_api.posts.filter(categories=["topic-1"]))
@@ -0,0 +1,120 @@
+'''
+Memory footprint of cached entities.
+
+Each test loads synthetic (but realistically sized) WordPress records through the
+corresponding '*Request.get()' into the API's 'WPORMCache' and measures with 'tracemalloc'
+how many bytes stay allocated per entity, including the raw 'entity.json' string and
+references to related objects. The budgets below fail the test if a change makes
+cached entities more expensive; lower them when an improvement lands.
+
+Run this file directly to log a report:
+
+	python -m wordpress_orm.tests.test_memory
+'''
+
+import gc
+import logging
+import tracemalloc
+
+import pytest
+
+from ..api import API
+from .fake_wordpress import (FakeWordPressSession, BASE_URL, post_record, media_record,
+							 user_record, term_record)
+
+logger = logging.getLogger(__name__.split(".")[0]) # package name
+
+ENTITY_COUNT = 200
+
+# maximum number of bytes allowed per cached entity
+memory_budget = {
+	"Post"  : 12500, # includes the embedded featured media, one per post
+	"Page"  : 11500, # includes the embedded featured media, one per page
+	"Media" : 4200,
+	"User"  : 2800,
+}
+
+def synthetic_records(endpoint, count=ENTITY_COUNT, paragraphs=20):
+	'''
+	Returns a dictionary of records for the fake WordPress site, 'count' of them in 'endpoint'.
+	'''
+	users = [user_record(id, name="Author {0}".format(id)) for id in range(1, 6)]
+	categories = [term_record(id, "Category {0}".format(id)) for id in range(1, 9)]
+	tags = [term_record(id, "Tag {0}".format(id), taxonomy="post_tag") for id in range(101, 121)]
+
+	records = {"users":users, "categories":categories, "tags":tags}
+	if endpoint == "users":
+		records["users"] = [user_record(id, name="Author {0}".format(id)) for id in range(1, count + 1)]
+	elif endpoint == "media":
+		records["media"] = [media_record(id, author=1 + id % 5) for id in range(1, count + 1)]
+	else:
+		items = list()
+		for id in range(1, count + 1):
+			author = users[id % 5]
+			item_categories = [categories[id % 8], categories[(id + 3) % 8]]
+			item_tags = [tags[id % 20], tags[(id + 7) % 20], tags[(id + 11) % 20]]
+			embedded = {"author":[author],
+						"wp:featuredmedia":[media_record(1000 + id, author=author["id"])]}
+			if endpoint == "posts":
+				embedded["wp:term"] = [item_categories, item_tags]
+			items.append(post_record(id, author=author["id"], endpoint=endpoint, featured_media=1000 + id, paragraphs=paragraphs,
+									 categories=[c["id"] for c in item_categories],
+									 tags=[t["id"] for t in item_tags], embedded=embedded))
+		records[endpoint] = items
+	return records
+
+def bytes_per_entity(request_factory_name, endpoint, count=ENTITY_COUNT, paragraphs=20, lazy_html_max_size=None):
+	'''
+	Returns the number of bytes that remain allocated per entity after loading 'count' entities into the cache.
+	'''
+	session = FakeWordPressSession(records=synthetic_records(endpoint, count=count, paragraphs=paragraphs))
+	api = API(url=BASE_URL)
+	api.session = session
+	api.lazy_html_max_size = lazy_html_max_size
+
+	gc.collect()
+	tracemalloc.start()
+	try:
+		before = tracemalloc.get_traced_memory()[0]
+		for page in range(1, -(-count // 100) + 1):
+			request = getattr(api, request_factory_name)()
+			request.per_page = 100
+			request.page = page
+			entities = request.get()
+			assert len(entities) > 0
+		del request, entities
+		gc.collect()
+		after = tracemalloc.get_traced_memory()[0]
+	finally:
+		tracemalloc.stop()
+
+	return (after - before) / count
+
+@pytest.mark.parametrize("class_name,request_factory_name,endpoint", [
+	("Post", "PostRequest", "posts"),
+	("Page", "PageRequest", "pages"),
+	("Media", "MediaRequest", "media"),
+	("User", "UserRequest", "users"),
+])
+def test_cached_entity_memory_budget(class_name, request_factory_name, endpoint):
+	size = bytes_per_entity(request_factory_name, endpoint)
+	assert size <= memory_budget[class_name], \
+		"A cached '{0}' uses {1:.0f} bytes, over the budget of {2} bytes.".format(class_name, size, memory_budget[class_name])
+
+def test_deferred_content_does_not_scale_with_article_length():
+	'''
+	With large HTML fields deferred, the memory used by a cached post doesn't depend on the length of its content.
+	'''
+	short = bytes_per_entity("PostRequest", "posts", paragraphs=20, lazy_html_max_size=500)
+	long = bytes_per_entity("PostRequest", "posts", paragraphs=200, lazy_html_max_size=500)
+	assert long - short < 100, \
+		"A cached 'Post' uses {0:.0f} bytes with short content and {1:.0f} bytes with long content.".format(short, long)
+
+if __name__ == "__main__":
+	logging.basicConfig(level=logging.INFO, format="%(message)s")
+	for class_name, request_factory_name, endpoint in [("Post", "PostRequest", "posts"),
+														("Page", "PageRequest", "pages"),
+														("Media", "MediaRequest", "media"),
+														("User", "UserRequest", "users")]:
+		size = bytes_per_entity(request_factory_name, endpoint)
+		logger.info("{0:6s} {1:8.0f} bytes per cached entity (budget {2})".format(class_name, size, memory_budget[class_name]))
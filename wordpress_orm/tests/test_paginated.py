@@ -0,0 +1,54 @@
+from .fake_wordpress import post_record, term_record, user_record
+
+def test_user_posts_are_paginated_lazily(offline_api, fake_wordpress):
+	'''
+	Only the pages holding the items accessed are requested, each once.
+	'''
+	fake_wordpress.records["users"] = [user_record(7)]
+	fake_wordpress.records["posts"] = [post_record(id, author=7 if id % 2 else 8) for id in range(1, 601)]
+	user = offline_api.user(id=7)
+	request_count = len(fake_wordpress.requests)
+
+	posts = user.posts
+	assert len(posts) == 300
+	assert len(fake_wordpress.requests) == request_count + 1
+
+	assert [p.s.id for p in posts[150:205]] == list(range(301, 411, 2))
+	requested_pages = sorted(params["page"] for method, url, params in fake_wordpress.requests[request_count + 1:])
+	assert requested_pages == ["2", "3"]
+	assert posts[-1].s.id == 599
+
+	request_count = len(fake_wordpress.requests)
+	assert [p.s.id for p in posts[0:300]] == list(range(1, 600, 2)) # every page was read before
+	assert len(fake_wordpress.requests) == request_count
+
+def test_collections_read_the_site_again(offline_api, fake_wordpress):
+	'''
+	A new collection sees new posts; cached collections share their pages through the response cache.
+	'''
+	fake_wordpress.records["users"] = [user_record(7)]
+	fake_wordpress.records["posts"] = [post_record(id, author=7) for id in range(1, 151)]
+	user = offline_api.user(id=7)
+
+	assert len(user.posts) == 150 and len(user.posts.cached()) == 150
+	fake_wordpress.records["posts"].append(post_record(151, author=7))
+	assert len(user.posts) == 151
+
+	request_count = len(fake_wordpress.requests)
+	assert len(user.posts.cached()) == 150 # until the response cache is cleared
+	assert [p.s.id for p in user.posts.cached()[0:100]] == list(range(1, 101))
+	assert len(fake_wordpress.requests) == request_count
+
+def test_category_posts_iteration(offline_api, fake_wordpress):
+	'''
+	Iterating reads every page once.
+	'''
+	fake_wordpress.records["categories"] = [term_record(3, "News")]
+	fake_wordpress.records["posts"] = [post_record(id, categories=[3] if id <= 250 else [4]) for id in range(1, 301)]
+	category = offline_api.category(id=3)
+	request_count = len(fake_wordpress.requests)
+
+	assert [p.s.id for p in category.posts()] == list(range(1, 251))
+	requests = fake_wordpress.requests[request_count:]
+	assert sorted(params["page"] for method, url, params in requests) == ["1", "2", "3"]
+	assert all(params["categories"] == "3" for method, url, params in requests)
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from ..entities import Post, Page, Media, Category, Tag, Comment, User
+from .fake_wordpress import post_record, media_record, term_record, user_record, comment_record
+
+def dated_posts(count):
+	start = datetime(2019, 1, 1)
+	return [post_record(id, categories=[1 + id % 2], date=(start + timedelta(hours=id)).isoformat()) for id in range(1, count + 1)]
+
+def test_slice_maps_to_offset_requests(offline_api, fake_wordpress):
+	'''
+	A slice is read with the fewest offset/per_page requests covering it exactly.
+	'''
+	fake_wordpress.records["posts"] = dated_posts(1000)
+
+	query = offline_api.posts.filter(categories=[1]).order_by("-date")
+	assert len(fake_wordpress.requests) == 0 # nothing evaluated yet
+
+	posts = query[200:450]
+
+	assert [p.s.id for p in posts] == list(range(600, 100, -2))
+	windows = sorted((int(params.get("offset", 0)), int(params["per_page"])) for method, url, params in fake_wordpress.requests)
+	assert windows == [(200, 100), (300, 100), (400, 50)]
+	assert all(params["categories"] == "1" and params["orderby"] == "date" and params["order"] == "desc"
+			   for method, url, params in fake_wordpress.requests)
+
+def test_slices_without_offset_read_pages(offline_api, fake_wordpress):
+	'''
+	Media requests don't send 'offset'; slices read the pages covering the range.
+	'''
+	fake_wordpress.records["media"] = [media_record(id) for id in range(1, 251)]
+
+	media = offline_api.query(Media)
+	assert media[0].s.id == 1
+	assert [m.s.id for m in media[98:103]] == list(range(99, 104))
+	assert all("offset" not in params for method, url, params in fake_wordpress.requests)
+
+def test_slices_are_cached_only_on_request(offline_api, fake_wordpress):
+	fake_wordpress.records["posts"] = dated_posts(30)
+	query = offline_api.posts.order_by("id")
+	assert query[0].s.id == 1
+
+	fake_wordpress.records["posts"].insert(0, post_record(0, date="2018-01-01T00:00:00"))
+	assert query[0].s.id == 0 # read again
+
+	cached = query.cached()
+	assert cached[0:2] == query[0:2]
+	request_count = len(fake_wordpress.requests)
+	fake_wordpress.records["posts"].pop(0)
+	assert [p.s.id for p in cached[0:2]] == [0, 1]
+	assert len(fake_wordpress.requests) == request_count
+	assert query.filter(categories=[1]).is_cached is False and cached.order_by("-id").is_cached
+
+def test_query_sets_are_immutable(offline_api, fake_wordpress):
+	fake_wordpress.records["posts"] = dated_posts(30)
+
+	everything = offline_api.posts.order_by("date")
+	odd = everything.filter(categories=[2])
+
+	assert everything.filters == dict()
+	assert len(odd) == 15
+	assert len(everything) == 30
+	assert odd[-1].s.id == 29
+	assert everything[0].s.id == 1
+	assert [p.s.id for p in odd] == list(range(1, 30, 2))
+	with pytest.raises(ValueError):
+		everything.filter(colour="red")
+
+def named(record, id, field="name"):
+	record[field] = "Name {0:02d}".format(id % 7) # a different order than the IDs
+	return record
+
+@pytest.mark.parametrize("class_object, endpoint, record, field", [
+	(Post, "posts", lambda id: named(post_record(id), id, "slug"), "slug"),
+	(Page, "pages", lambda id: named(post_record(id, endpoint="pages"), id, "slug"), "slug"),
+	(Media, "media", lambda id: named(media_record(id), id, "slug"), "slug"),
+	(Category, "categories", lambda id: named(term_record(id, "x"), id), "name"),
+	(Tag, "tags", lambda id: named(term_record(id, "x", taxonomy="post_tag"), id), "name"),
+	(User, "users", lambda id: named(user_record(id), id), "name"),
+	(Comment, "comments", lambda id: named(comment_record(id, post=1), id, "date"), "date"),
+])
+def test_order_by_every_class(offline_api, fake_wordpress, class_object, endpoint, record, field):
+	fake_wordpress.records[endpoint] = [record(id) for id in range(1, 11)]
+
+	entities = list(offline_api.query(class_object).order_by("-" + field)[0:10])
+	assert [getattr(e.s, field) for e in entities] == sorted([getattr(e.s, field) for e in entities], reverse=True)
+	method, url, params = fake_wordpress.requests[-1]
+	assert params["orderby"] == field and params["order"] == "desc"
+
+def test_counts_download_no_entities(offline_api, fake_wordpress):
+	'''
+	Count queries ask for one ID only (or use HEAD requests), and several run together.
+	'''
+	fake_wordpress.records["posts"] = dated_posts(30)
+	fake_wordpress.records["comments"] = []
+
+	pr = offline_api.PostRequest()
+	pr.categories = [2]
+	counts = offline_api.counts({"odd":offline_api.posts.filter(categories=[1]), "even":pr, "comments":offline_api.comments})
+
+	assert counts == {"odd":15, "even":15, "comments":0}
+	for method, url, params in fake_wordpress.requests:
+		assert method == "GET" and params["per_page"] == "1" and params["_fields"] == "id" and "_embed" not in params
+
+	offline_api.head_requests_for_counts = True
+	assert len(offline_api.posts) == 30
+	assert fake_wordpress.requests[-1][0] == "HEAD"
+
+def test_request_can_be_used_after_a_count(offline_api, fake_wordpress):
+	'''
+	Counting with a request doesn't change it; getting the entities afterwards sends a full request.
+	'''
+	fake_wordpress.records["posts"] = dated_posts(30)
+	offline_api.head_requests_for_counts = True
+
+	pr = offline_api.PostRequest()
+	pr.categories = [2]
+	assert pr.get(count=True) == 15
+	assert pr.per_page is None and "_fields" not in pr.parameters and pr.http_method == "GET"
+
+	assert sorted(p.s.id for p in pr.get()) == list(range(1, 20, 2)) # first page of 10
+	method, url, params = fake_wordpress.requests[-1]
+	assert method == "GET" and "per_page" not in params and "_fields" not in params
+
+def test_compiled_request_reuses_parameters(offline_api, fake_wordpress):
+	'''
+	A compiled request keeps its prepared parameters and only changes the ones given to 'execute'.
+	'''
+	fake_wordpress.records["posts"] = dated_posts(30)
+
+	pr = offline_api.PostRequest()
+	pr.categories = [2]
+	pr.per_page = 5
+	compiled = pr.compile()
+
+	assert [p.s.id for p in compiled.execute(page=2)] == [11, 13, 15, 17, 19]
+	assert [p.s.id for p in compiled.execute(include=[4, 6, 7])] == [7]
+	entities, total = compiled.execute(per_page=None, search="number 1", with_total=True)
+	assert total == 6 and [p.s.id for p in entities] == [1, 11, 13, 15, 17, 19]
+
+	params = [p for method, url, p in fake_wordpress.requests]
+	assert all(p["categories"] == "2" for p in params)
+	assert params[1]["include"] == "4,6,7" and "include" not in params[2] and "per_page" not in params[2]
+
+	compiled.execute(page=2, cached=True)
+	compiled.execute(page=2, cached=True)
+	assert len(fake_wordpress.requests) == 4
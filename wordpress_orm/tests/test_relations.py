@@ -0,0 +1,288 @@
+import json
+import time
+import functools
+
+import pytest
+
+from .. import exc
+from ..entities import Category, Tag, User, comment_tree
+from .fake_wordpress import post_record, term_record, user_record, media_record, comment_record
+
+def test_post_categories_fetched_in_one_request(offline_api, fake_wordpress):
+	'''
+	All uncached categories of a post are fetched with a single 'include=' request.
+	'''
+	fake_wordpress.records["categories"] = [term_record(id, "Category {0}".format(id)) for id in range(1, 11)]
+	fake_wordpress.records["posts"] = [post_record(1, categories=[2, 4, 6, 8, 9, 10])]
+
+	offline_api.category(id=4) # already in the cache
+	post = offline_api.post(id=1)
+	request_count = len(fake_wordpress.requests)
+
+	categories = post.categories
+
+	assert [c.s.id for c in categories] == [2, 4, 6, 8, 9, 10]
+	assert [c.s.name for c in categories] == ["Category {0}".format(id) for id in [2, 4, 6, 8, 9, 10]]
+	assert all(isinstance(c, Category) for c in categories)
+	assert len(fake_wordpress.requests) == request_count + 1
+	assert fake_wordpress.requests[-1][2]["include"] == "2,6,8,9,10"
+	assert fake_wordpress.requests[-1][2]["per_page"] == "100"
+
+def test_prefetch_relations_for_a_list_of_posts(offline_api, fake_wordpress):
+	'''
+	Prefetching makes one request per related type, after which the relations need no requests.
+	'''
+	fake_wordpress.records["users"] = [user_record(id, name="Author {0}".format(id)) for id in range(1, 4)]
+	fake_wordpress.records["media"] = [media_record(id) for id in range(100, 110)]
+	fake_wordpress.records["categories"] = [term_record(id, "Category {0}".format(id)) for id in range(1, 5)]
+	fake_wordpress.records["tags"] = [term_record(id, "Tag {0}".format(id), taxonomy="post_tag") for id in range(10, 15)]
+	fake_wordpress.records["posts"] = [post_record(id, author=1 + id % 3, featured_media=100 + id % 4,
+												   categories=[1 + id % 4], tags=[10, 11 + id % 4])
+									   for id in range(1, 21)]
+	fake_wordpress.records["comments"] = [comment_record(id, post=1 + id % 5) for id in range(1, 31)]
+
+	pr = offline_api.PostRequest()
+	pr.per_page = 20
+	posts = pr.get(embed=False)
+	request_count = len(fake_wordpress.requests)
+
+	offline_api.prefetch(posts, "author", "featured_media", "categories", "tags", "comments")
+
+	assert len(fake_wordpress.requests) == request_count + 5
+	endpoints = sorted(url.split("/")[-1] for method, url, params in fake_wordpress.requests[request_count:])
+	assert endpoints == ["categories", "comments", "media", "tags", "users"]
+
+	request_count = len(fake_wordpress.requests)
+	post = posts[4] # id=5
+	assert post.author.s.id == 3
+	assert post.featured_media.s.id == 101
+	assert [c.s.id for c in post.categories] == [2]
+	assert [t.s.id for t in post.tags] == [10, 12]
+	assert sorted(c.s.id for c in post.comments) == [4, 9, 14, 19, 24, 29]
+	assert posts[-1].comments == []
+	assert len(fake_wordpress.requests) == request_count
+
+def test_embedded_terms_are_attached_to_posts(offline_api, fake_wordpress):
+	'''
+	Embedded categories and tags are cached under their own classes and attached to the post.
+	'''
+	categories = [term_record(1, "News"), term_record(6, "Blog")]
+	tags = [term_record(6, "Sorghum", taxonomy="post_tag")] # IDs may overlap between taxonomies
+	fake_wordpress.records["categories"] = categories
+	fake_wordpress.records["tags"] = tags
+	fake_wordpress.records["posts"] = [post_record(1, categories=[6, 1], tags=[6],
+												   embedded={"wp:term":[categories, tags]})]
+
+	post = offline_api.PostRequest().get()[0]
+	request_count = len(fake_wordpress.requests)
+
+	assert [c.s.name for c in post.categories] == ["Blog", "News"]
+	assert [t.s.name for t in post.tags] == ["Sorghum"]
+	assert isinstance(post.tags[0], Tag)
+	assert len(fake_wordpress.requests) == request_count
+
+	# embedded objects only have some of the fields, a lookup reads the full record into the same entity
+	assert offline_api.category(id=6) is post.categories[0]
+	assert offline_api.tag(id=6) is post.tags[0]
+	assert len(fake_wordpress.requests) == request_count + 2
+
+def test_embedded_relations_are_attached_to_pages(offline_api, fake_wordpress):
+	'''
+	A page's embedded author, featured media and parent need no further requests after a listing.
+	'''
+	parent = post_record(1, endpoint="pages")
+	page = post_record(2, author=7, featured_media=100, endpoint="pages",
+					   embedded={"author":[user_record(7)], "wp:featuredmedia":[media_record(100)], "up":[parent]})
+	page["parent"] = 1
+	fake_wordpress.records["pages"] = [page]
+	fake_wordpress.records["media"] = [media_record(100)]
+
+	page = offline_api.PageRequest().get()[0]
+	request_count = len(fake_wordpress.requests)
+
+	assert page.author.s.id == 7
+	assert page.featured_media.s.id == 100
+	assert page.parent.s.id == 1
+	assert len(fake_wordpress.requests) == request_count
+	assert offline_api.media(id=100) is page.featured_media
+
+def test_embedded_author_is_attached_to_media(offline_api, fake_wordpress):
+	image = media_record(100, author=7)
+	image["_embedded"] = {"author":[user_record(7)]}
+	fake_wordpress.records["media"] = [image]
+	fake_wordpress.records["users"] = [user_record(7)]
+
+	image = offline_api.MediaRequest().get()[0]
+	request_count = len(fake_wordpress.requests)
+
+	assert image.author.s.id == 7
+	assert len(fake_wordpress.requests) == request_count
+	assert offline_api.user(id=7) is image.author
+
+def test_embedded_objects_are_not_cached_as_full_entities(offline_api, fake_wordpress):
+	'''
+	A post embedded in a comment has no content; looking the post up reads the full record into the same entity.
+	'''
+	fake_wordpress.records["posts"] = [post_record(1, categories=[3])]
+	embedded_post = {k:v for k, v in post_record(1).items() if k in ["id", "date", "slug", "type", "link", "title", "excerpt", "author"]}
+	comment = comment_record(1, post=1)
+	comment["_embedded"] = {"up":[embedded_post]}
+	fake_wordpress.records["comments"] = [comment]
+
+	comment = offline_api.CommentRequest().get()[0]
+	partial_post = comment.post
+	assert partial_post.s.content is None and len(fake_wordpress.requests) == 1
+
+	post = offline_api.post(id=1)
+	assert post is partial_post and post.s.content is not None and post.s.categories == [3]
+	assert offline_api.PostRequest().get()[0] is post
+	assert offline_api.wordpress_object_cache.get(class_name="Post", key=1) is post
+
+def test_relations_resolved_from_the_cache(offline_api, fake_wordpress):
+	'''
+	Authors shared by pages, media and comments are fetched once; 'media.post' returns the attached post.
+	'''
+	fake_wordpress.records["users"] = [user_record(7)]
+	fake_wordpress.records["posts"] = [post_record(1, author=7)]
+	fake_wordpress.records["pages"] = [post_record(id, author=7, endpoint="pages") for id in range(2, 5)]
+	fake_wordpress.records["media"] = [media_record(100, author=7, post=1)]
+	fake_wordpress.records["comments"] = [comment_record(200, post=1, author=7)]
+
+	pages = offline_api.PageRequest().get(embed=False)
+	media = offline_api.MediaRequest().get(embed=False)
+	comment = offline_api.CommentRequest().get(embed=False)[0]
+	request_count = len(fake_wordpress.requests)
+
+	authors = [p.author for p in pages] + [media[0].author, comment.author]
+	assert all(author.s.name == "Ada Lovelace" for author in authors)
+	assert all(author.resolve() is authors[0].resolve() for author in authors) # all proxies, created before the first fetch
+	assert media[0].post.s.title == "Item number 1"
+	assert comment.post is media[0].post # cached
+	assert len(fake_wordpress.requests) == request_count + 2 # one user, one post
+
+def test_concurrent_lookups_make_one_request(offline_api, fake_wordpress):
+	'''
+	Threads resolving the same uncached entity at the same time share a single request.
+	'''
+	fake_wordpress.records["users"] = [user_record(7)]
+	respond = fake_wordpress.respond
+	def slow_respond(*args):
+		time.sleep(0.05)
+		return respond(*args)
+	fake_wordpress.respond = slow_respond
+
+	results = offline_api.run_concurrently([functools.partial(offline_api.fetch_by_ids, User, [7]) for _ in range(4)])
+
+	assert all(result[7] is results[0][7] for result in results)
+	assert len(fake_wordpress.requests) == 1
+
+def test_comments_loaded_for_many_posts(offline_api, fake_wordpress):
+	'''
+	Comments of several posts are read with one query across all pages and attached to each post.
+	'''
+	fake_wordpress.records["posts"] = [post_record(id) for id in range(1, 5)]
+	fake_wordpress.records["comments"] = [comment_record(id, post=1 + id % 3) for id in range(1, 251)]
+
+	posts = offline_api.PostRequest().get(embed=False)
+	request_count = len(fake_wordpress.requests)
+
+	comments_by_post = offline_api.CommentRequest().get_for_posts(posts)
+
+	requests = fake_wordpress.requests[request_count:]
+	assert len(requests) == 3 # 250 comments, 100 per page
+	assert sorted(params["page"] for method, url, params in requests) == ["1", "2", "3"]
+	assert all(params["post"] == ",".join(str(p.s.id) for p in posts) for method, url, params in requests)
+	assert sorted(c.s.id for c in comments_by_post[2]) == list(range(1, 251, 3))
+	assert posts[0].comments is comments_by_post[posts[0].s.id]
+	assert [p.s.id for p in posts if p.comments == []] == [4]
+	assert len(fake_wordpress.requests) == request_count + 3
+
+def test_comment_tree(offline_api, fake_wordpress):
+	'''
+	Replies are organized under their parent comments.
+	'''
+	fake_wordpress.records["posts"] = [post_record(1)]
+	fake_wordpress.records["comments"] = [comment_record(1, post=1), comment_record(2, post=1, parent=1),
+										  comment_record(3, post=1), comment_record(4, post=1, parent=2),
+										  comment_record(5, post=1, parent=1)]
+
+	post = offline_api.post(id=1)
+	top_level = comment_tree(post.comments)
+	request_count = len(fake_wordpress.requests)
+
+	assert [c.s.id for c in top_level] == [1, 3]
+	assert [c.s.id for c in top_level[0].replies] == [2, 5]
+	assert [c.s.id for c in top_level[0].replies[0].replies] == [4]
+	assert top_level[0].replies[0].replies[0].parent is top_level[0].replies[0]
+	assert len(fake_wordpress.requests) == request_count
+
+def test_selective_embedding_and_no_links(offline_api, fake_wordpress):
+	'''
+	A list of link relations is sent as '_embed=rel1,rel2'; 'links=False' leaves out "_links".
+	'''
+	fake_wordpress.records["posts"] = [post_record(1, author=7, embedded={"author":[user_record(7)], "replies":[[]]})]
+
+	post = offline_api.PostRequest().get(embed=["author"], links=False)[0]
+
+	params = fake_wordpress.requests[-1][2]
+	assert params["_embed"] == "author"
+	assert "_links" not in params["_fields"].split(",")
+	assert "_embedded" in params["_fields"].split(",")
+	assert "_links" not in json.loads(post.json)
+	assert list(json.loads(post.json)["_embedded"]) == ["author"]
+	assert post.author.s.id == 7
+
+def test_relation_proxies_fetch_only_unknown_fields(offline_api, fake_wordpress):
+	'''
+	A relation's ID is read without a request; the entity is fetched when another field is used.
+	'''
+	fake_wordpress.records["users"] = [user_record(7)]
+	fake_wordpress.records["categories"] = [term_record(id, "Category {0}".format(id)) for id in range(1, 4)]
+	fake_wordpress.records["posts"] = [post_record(1, author=7, categories=[1, 2, 3])]
+
+	post = offline_api.PostRequest().get(embed=False)[0]
+	request_count = len(fake_wordpress.requests)
+
+	assert post.author.s.id == 7
+	assert isinstance(post.author, User)
+	assert [c.s.id for c in post.categories] == [1, 2, 3]
+	assert len(fake_wordpress.requests) == request_count
+
+	assert post.author.s.slug == "ada-lovelace"
+	assert post.categories[2].s.name == "Category 3"
+	assert post.categories[0].s.name == "Category 1" # fetched together with the first category used
+	assert len(fake_wordpress.requests) == request_count + 2
+	assert post.author is offline_api.user(id=7) # now cached
+
+def test_relation_proxies_can_be_prefetched(offline_api, fake_wordpress):
+	fake_wordpress.records["users"] = [user_record(7), user_record(8)]
+	fake_wordpress.records["posts"] = [post_record(id, author=7 + id % 2) for id in range(1, 4)]
+	fake_wordpress.records["comments"] = [comment_record(id, post=1 + id % 3) for id in range(1, 7)]
+
+	comments = offline_api.CommentRequest().get(embed=False)
+	posts = [comment.post for comment in comments] # proxies
+	assert posts[0] == offline_api.post(id=2) and offline_api.post(id=2) == posts[0]
+	assert posts[0] == posts[3] and posts[0] != posts[1]
+	assert len({posts[0], offline_api.post(id=2)}) == 1 and offline_api.post(id=2) in set(posts)
+	request_count = len(fake_wordpress.requests)
+
+	offline_api.prefetch(posts, "author")
+	assert len(fake_wordpress.requests) == request_count + 2 # the other posts, then their authors
+	assert [p.author.s.id for p in posts] == [7, 8, 8, 7, 8, 8]
+	assert len(fake_wordpress.requests) == request_count + 2
+
+def test_missing_author_of_a_proxy(offline_api, fake_wordpress):
+	'''
+	A missing author is reported with 'UserNotFound' when its proxy is first used.
+	'''
+	fake_wordpress.records["users"] = []
+	fake_wordpress.records["posts"] = [post_record(1, author=7)]
+
+	post = offline_api.PostRequest().get(embed=False)[0]
+	assert post.author.s.id == 7
+	with pytest.raises(exc.UserNotFound):
+		post.author.s.name
+
+	offline_api.lazy_relations = False
+	with pytest.raises(exc.UserNotFound):
+		post.author
@@ -0,0 +1,39 @@
+
+import json
+import types
+
+from ..entities.post import Post
+from ..json_stream import iter_json_records
+from .fake_wordpress import post_record
+
+def test_iter_json_records_across_chunk_boundaries():
+	'''
+	Records are reassembled correctly however the response body is split into chunks.
+	'''
+	records = [{"id":1, "title":"a \"quoted\" [bracket] {brace}", "tags":[1, 2]},
+			   {"id":2, "title":"back\\slash", "meta":{"nested":[{}, []]}},
+			   {"id":3, "title":"café"}]
+	body = json.dumps(records, ensure_ascii=False).encode("utf-8")
+	for size in [1, 2, 3, 7, 64, len(body)]:
+		chunks = [body[i:i+size] for i in range(0, len(body), size)]
+		assert list(iter_json_records(chunks)) == records
+
+def test_iter_json_records_single_object_and_empty_array():
+	assert list(iter_json_records([b'{"id":', b' 4}'])) == [{"id":4}]
+	assert list(iter_json_records([b" [ ", b"] "])) == []
+
+def test_stream_yields_posts(offline_api, fake_wordpress):
+	'''
+	A streamed request returns a generator yielding the same posts as a buffered request.
+	'''
+	fake_wordpress.records["posts"] = [post_record(id) for id in range(1, 26)]
+
+	pr = offline_api.PostRequest()
+	pr.per_page = 25
+	posts = pr.get(stream=True)
+
+	assert isinstance(posts, types.GeneratorType)
+	first = next(posts)
+	assert isinstance(first, Post) and first.s.id == 1
+	assert [p.s.id for p in posts] == list(range(2, 26))
+	assert pr.total == 25
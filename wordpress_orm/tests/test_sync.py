@@ -0,0 +1,44 @@
+from ..entities import Post, Category
+from ..cache import WPORMCacheObjectNotFoundError
+from .fake_wordpress import post_record, term_record, rendered
+
+import pytest
+
+def hour(n):
+	return "2019-01-{0:02d}T{1:02d}:00:00".format(1 + n // 24, n % 24)
+
+def test_sync_reads_only_changes(offline_api, fake_wordpress):
+	fake_wordpress.records["posts"] = [post_record(id, date=hour(id), categories=[1 + id % 3]) for id in range(1, 151)]
+	fake_wordpress.records["categories"] = [term_record(id, "Topic {0}".format(id)) for id in range(1, 4)]
+
+	first = offline_api.sync([Post, Category])
+	assert len(first["Post"]["changed"]) == 150 and first["Post"]["deleted"] == []
+	post10 = offline_api.post(id=10)
+
+	# edit a post, delete one, publish one, rename a category
+	fake_wordpress.records["posts"][9] = post_record(10, date=hour(10), modified=hour(300), categories=[2])
+	fake_wordpress.records["posts"][9]["title"] = rendered("Edited")
+	del fake_wordpress.records["posts"][19]
+	fake_wordpress.records["posts"].append(post_record(151, date=hour(301), categories=[1]))
+	fake_wordpress.records["categories"][0]["slug"] = "renamed"
+	fake_wordpress.requests.clear()
+
+	second = offline_api.sync([Post, Category])
+
+	assert {10, 151} <= set(p.s.id for p in second["Post"]["changed"]) <= {10, 150, 151}
+	assert second["Post"]["deleted"] == [20]
+	post_requests = [params for method, url, params in fake_wordpress.requests if url.endswith("posts")]
+	assert all(params.get("_fields") == "id" or "modified_after" in params for params in post_requests)
+
+	assert offline_api.post(id=10) is post10 # updated in place
+	assert post10.s.title == "Edited" and post10.s.categories == [2]
+	with pytest.raises(WPORMCacheObjectNotFoundError):
+		offline_api.wordpress_object_cache.get(class_name="Post", key=20)
+	assert offline_api.category(slug="renamed").s.id == 1
+
+	# the snapshot of posts was updated too
+	request_count = len(fake_wordpress.requests)
+	ids = [p.s.id for p in offline_api.posts.order_by("-date")[0:3]]
+	assert ids == [151, 150, 149]
+	assert 20 not in [p.s.id for p in offline_api.posts.filter(categories=[3])]
+	assert len(fake_wordpress.requests) == request_count
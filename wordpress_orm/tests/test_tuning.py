@@ -0,0 +1,66 @@
+from ..tuning import BulkRead
+from .fake_wordpress import post_record
+
+def test_tuner_converges_on_the_fastest_setting(offline_api):
+	'''
+	Each read tries an unmeasured neighbour of the best setting, until the best one has no better neighbour.
+	'''
+	tuner = offline_api.page_tuner
+	def throughput(per_page, workers): # entities per second, the host is fastest with 50 per page and 4 requests at a time
+		return 1000 - abs(per_page - 50) * 5 - abs(workers - 4) * 40
+
+	settings = list()
+	for n in range(30):
+		setting = tuner.setting("posts")
+		settings.append(setting)
+		read = BulkRead()
+		read.add(500)
+		tuner.record("posts", setting, read, 500 / throughput(*setting))
+
+	assert settings[0] == (100, 8)
+	assert settings[-5:] == [(50, 4)] * 5
+	assert len(set(settings)) < 12 # not every setting was tried
+	assert tuner.setting("media") == (100, 8) # remembered per endpoint
+
+def test_tuner_avoids_errors_and_large_responses(offline_api):
+	tuner = offline_api.page_tuner
+	read = BulkRead()
+	read.error()
+	tuner.record("posts", (100, 8), read, 1.0)
+	assert tuner.setting("posts") in [(50, 8), (100, 4)]
+
+	read = BulkRead()
+	read.add(100, size=100 * 60000) # 60 kB per entity
+	tuner.record("media", (100, 8), read, 1.0)
+	assert tuner.setting("media") == (50, 8) # responses of 100 would exceed 4 MB
+
+def test_adaptive_bulk_reads(offline_api, fake_wordpress):
+	fake_wordpress.records["posts"] = [post_record(id, paragraphs=1) for id in range(1, 251)]
+	offline_api.adaptive_paging = True
+
+	assert len(offline_api.PostRequest().get_all()) == 250
+	assert set(params["per_page"] for method, url, params in fake_wordpress.requests) == {"100"}
+	tuning = offline_api.page_tuner.endpoints[offline_api.base_url + "posts"]
+	assert list(tuning.throughput) == [(100, 8)] and tuning.bytes_per_entity > 0
+
+	# the next read tries another setting, and pages failing with a server error are read again
+	respond = fake_wordpress.respond
+	failed = list()
+	def overloaded(method, url, params):
+		if params and str(params.get("page")) == "3" and len(failed) == 0:
+			failed.append(params)
+			return fake_wordpress.make_response(method, url, params, status=503, payload={"code":"overloaded"})
+		return respond(method, url, params)
+	fake_wordpress.respond = overloaded
+	fake_wordpress.requests.clear()
+
+	posts = offline_api.PostRequest().get_all()
+	assert sorted(p.s.id for p in posts) == list(range(1, 251))
+	setting = (int(failed[0]["per_page"]), 8)
+	assert setting == (50, 8) and tuning.throughput[setting] == 0
+	assert offline_api.PostRequest().get_all(embed=False) is not None
+	assert len(tuning.throughput) == 3
+
+	pr = offline_api.PostRequest()
+	pr.per_page = 10 # set by the caller, not tuned
+	assert len(pr.get_all()) == 250 and len(tuning.throughput) == 3
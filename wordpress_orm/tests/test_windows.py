@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from .fake_wordpress import post_record
+
+def dated_posts(count, same_second=0):
+	start = datetime(2019, 1, 1)
+	posts = [post_record(id, categories=[1 + id % 2], paragraphs=1, date=(start + timedelta(hours=id)).isoformat())
+			 for id in range(1, count + 1)]
+	# several posts published in the same second can't be told apart by date
+	posts += [post_record(id, paragraphs=1, date="2019-02-01T12:00:00") for id in range(count + 1, count + same_second + 1)]
+	return posts
+
+def test_date_windows_avoid_deep_pages(offline_api, fake_wordpress):
+	'''
+	Every entity is read once, and no request reads deeper than the window size into its results.
+	'''
+	fake_wordpress.records["posts"] = dated_posts(1000, same_second=250)
+
+	posts = offline_api.PostRequest().get_all_by_date(window_size=200)
+
+	assert sorted(p.s.id for p in posts) == list(range(1, 1251))
+	dates = [p.s.date for p in posts]
+	assert dates == sorted(dates, reverse=True)
+	pages = [params for method, url, params in fake_wordpress.requests if params.get("per_page") == "100"]
+	assert all("offset" not in params and "after" in params and "before" in params for params in pages)
+	assert max(int(params["page"]) for params in pages) == 3 # the 250 posts of the same second
+	assert len(pages) <= 20
+	counts = [params for method, url, params in fake_wordpress.requests if params.get("per_page") == "1"]
+	assert all(params["_fields"] == "id,date" and "_embed" not in params for params in counts)
+
+def test_date_windows_keep_the_filters(offline_api, fake_wordpress):
+	fake_wordpress.records["posts"] = dated_posts(300)
+
+	pr = offline_api.PostRequest()
+	pr.categories = [1]
+	pr.order = "asc"
+	posts = pr.get_all_by_date(window_size=50)
+
+	assert [p.s.id for p in posts] == list(range(2, 301, 2))
+	assert all(params["categories"] == "1" for method, url, params in fake_wordpress.requests)
+
+	# entities published while the windows are read are not missed
+	pr = offline_api.PostRequest()
+	original = fake_wordpress.filter
+	def publishing(records, params):
+		if params.get("per_page") == "100" and len(fake_wordpress.records["posts"]) == 300:
+			fake_wordpress.records["posts"] += [post_record(id, paragraphs=1, date="2019-01-05T00:30:00") for id in range(301, 421)]
+		return original(records, params)
+	fake_wordpress.filter = publishing
+	assert sorted(p.s.id for p in pr.get_all_by_date(window_size=500)) == list(range(1, 421))
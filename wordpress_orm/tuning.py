@@ -0,0 +1,192 @@
+'''
+Adaptive page sizes and concurrency for bulk reads.
+
+How many entities to request per page, and how many pages to request at a time, depends on
+the endpoint and the host: a page of 100 posts with embedded content can take seconds to
+render, while 100 users come back at once, and a busy host may answer errors under too many
+parallel requests. When 'api.adaptive_paging' is True, 'get_all' and 'get_all_by_date' choose
+'per_page' and the number of parallel requests with the 'WPORMPageTuner' of the API. It times
+every bulk read and tries the neighbouring settings of the best one seen so far, one read at
+a time, converging on the setting with the highest throughput (entities per second) for each endpoint.
+'''
+
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+import requests
+
+logger = logging.getLogger(__name__.split(".")[0]) # package name
+
+# 'per_page' values tried (100 is the most WordPress allows)
+page_sizes = [10, 20, 50, 100]
+
+def is_server_error(request, error):
+	'''
+	Returns True if the exception raised by the request comes from an overloaded or failing server (HTTP 5xx, timeout, connection error).
+	'''
+	if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+		return True
+	return request.response is not None and request.response.status_code >= 500
+
+class EndpointTuning:
+	'''
+	The measurements of the bulk reads of one endpoint.
+	'''
+	def __init__(self):
+		self.throughput = dict()     # key = (per_page, workers), value = entities per second (0 after server errors)
+		self.bytes_per_entity = None # average size of an entity in the responses
+
+	def __repr__(self):
+		return "<{0} at {1}, throughput={2}, bytes_per_entity={3}>".format(self.__class__.__name__, hex(id(self)),
+																		   self.throughput, self.bytes_per_entity)
+
+class BulkRead:
+	'''
+	Measurement of one bulk read, see 'WPORMPageTuner.measure'.
+	'''
+	def __init__(self):
+		self.entities = 0
+		self.sized_entities = 0 # entities read in responses of known size
+		self.bytes = 0
+		self.errors = 0
+		self._lock = threading.Lock()
+
+	def add(self, count, size=None):
+		'''
+		Counts a page of results.
+
+		count : number of entities on the page
+		size  : size of the response (bytes), if known
+		'''
+		with self._lock:
+			self.entities += count
+			if size is not None:
+				self.sized_entities += count
+				self.bytes += size
+
+	def error(self):
+		with self._lock:
+			self.errors += 1
+
+class WPORMPageTuner:
+	'''
+	Chooses the page size and the number of parallel requests of bulk reads for each endpoint, from the measured throughput.
+
+	The settings are (per_page, workers) pairs, with 'per_page' one of 'page_sizes' and 'workers'
+	a power of two up to 'api.max_workers'. Reads start with the largest of both; afterwards each
+	read uses a neighbouring setting of the best one that has not been measured yet, or the best
+	one when all have been. Server errors give a setting a throughput of 0, and pages whose
+	responses would exceed 'max_response_bytes' are not tried.
+	'''
+	def __init__(self, api, max_response_bytes=4000000):
+		'''
+		api                : the API object
+		max_response_bytes : largest response size (bytes) to ask for, estimated from the size of the entities read before
+		'''
+		self.api = api
+		self.max_response_bytes = max_response_bytes
+		self.clock = time.perf_counter
+		self._lock = threading.Lock()
+		self.initialize()
+
+	def initialize(self):
+		'''
+		Internal method to set up the tuner from scratch (forgetting every measurement).
+		'''
+		self.endpoints = dict() # key = endpoint URL, value = EndpointTuning
+
+	def worker_counts(self):
+		'''
+		Returns the numbers of parallel requests tried, e.g. [1, 2, 4, 8] if 'api.max_workers' is 8.
+		'''
+		counts = [1]
+		while counts[-1] * 2 <= self.api.max_workers:
+			counts.append(counts[-1] * 2)
+		if counts[-1] < self.api.max_workers:
+			counts.append(self.api.max_workers)
+		return counts
+
+	def allowed_page_sizes(self, tuning):
+		'''
+		Returns the 'per_page' values whose responses are expected to fit in 'max_response_bytes'.
+		'''
+		if tuning.bytes_per_entity is None:
+			return page_sizes
+		sizes = [n for n in page_sizes if n * tuning.bytes_per_entity <= self.max_response_bytes]
+		return sizes or page_sizes[:1]
+
+	def best(self, tuning):
+		'''
+		Returns the setting with the highest measured throughput among those allowed, or the initial setting.
+		'''
+		sizes = self.allowed_page_sizes(tuning)
+		workers = self.worker_counts()
+		measured = {s:t for s, t in tuning.throughput.items() if s[0] in sizes and s[1] in workers}
+		if len(measured) == 0:
+			return (sizes[-1], workers[-1])
+		return max(measured, key=lambda s: measured[s])
+
+	def setting(self, url):
+		'''
+		Returns the (per_page, workers) setting to use for the next bulk read of the endpoint.
+		'''
+		with self._lock:
+			tuning = self.endpoints.setdefault(url, EndpointTuning())
+			per_page, workers = best = self.best(tuning)
+			sizes = self.allowed_page_sizes(tuning)
+			counts = self.worker_counts()
+			if best not in tuning.throughput:
+				return best
+			i, j = sizes.index(per_page), counts.index(workers)
+			for a, b in [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]:
+				if 0 <= a < len(sizes) and 0 <= b < len(counts) and (sizes[a], counts[b]) not in tuning.throughput:
+					return (sizes[a], counts[b]) # not measured yet
+			return best
+
+	def record(self, url, setting, read, seconds):
+		'''
+		Records the result of a bulk read made with the given (per_page, workers) setting.
+
+		read    : the 'BulkRead' measurement
+		seconds : duration of the read
+		'''
+		with self._lock:
+			tuning = self.endpoints.setdefault(url, EndpointTuning())
+			if read.errors > 0:
+				throughput = 0
+			elif read.entities == 0:
+				return # nothing was read
+			else:
+				throughput = read.entities / max(seconds, 1e-6)
+			previous = tuning.throughput.get(setting, None)
+			tuning.throughput[setting] = throughput if previous is None or throughput == 0 else (previous + throughput) / 2
+			if read.sized_entities > 0:
+				size = read.bytes / read.sized_entities
+				tuning.bytes_per_entity = size if tuning.bytes_per_entity is None else (tuning.bytes_per_entity + size) / 2
+		logger.debug("Bulk read of {0} with per_page={1}, {2} workers: {3} entities in {4:.2f} s, {5} errors.".format(url, setting[0], setting[1],
+																												read.entities, seconds, read.errors))
+
+	@contextmanager
+	def measure(self, url, setting):
+		'''
+		Context manager that times a bulk read and records it; yields a 'BulkRead' to count the pages read and the server errors.
+
+		A read interrupted by an exception is only recorded if server errors were counted.
+		'''
+		read = BulkRead()
+		start = self.clock()
+		completed = False
+		try:
+			yield read
+			completed = True
+		finally:
+			if completed or read.errors > 0:
+				self.record(url, setting, read, self.clock() - start)
+
+	def clear(self):
+		'''
+		Forget every measurement.
+		'''
+		self.initialize()
@@ -0,0 +1,134 @@
+'''
+Reading a whole collection in date windows.
+
+WordPress reads a page of results with an SQL query that skips the rows of every page before
+it, so the server time for 'page=200' (or a large 'offset') grows with the page number and
+reading all the pages of a large archive, even in parallel, is held up by the last ones. Here
+the collection is split into date ranges ('after'/'before') of at most 'window_size' entities,
+sized with count requests (one ID each), and the first few pages of every range are read in
+parallel; no request reaches deeper than 'window_size' entities into its results.
+'''
+
+import logging
+import functools
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__.split(".")[0]) # package name
+
+one_second = timedelta(seconds=1) # resolution of WordPress dates
+
+def record_date(record):
+	'''
+	Returns the 'date' of a record (or of an entity, when answered from a local snapshot) as a datetime.
+	'''
+	value = record["date"] if isinstance(record, dict) else record.s.date
+	return datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+
+def record_id(record):
+	return record["id"] if isinstance(record, dict) else record.s.id
+
+def window_parameters(start, stop):
+	'''
+	Returns the request parameters that select the entities dated from 'start' up to (not including) 'stop'.
+	'''
+	# WordPress excludes the dates given to both 'after' and 'before'
+	return {"after":(start - one_second).isoformat(), "before":stop.isoformat()}
+
+def plan_windows(compiled, window_size, max_workers=None):
+	'''
+	Returns the date windows covering every entity matching a request, oldest first.
+
+	Each window is a tuple (start, stop, number of entities); windows hold at most 'window_size'
+	entities, except where more than that share the same second. The range between the oldest and
+	newest entity is halved until every part is small enough (the parts of each round are counted in
+	parallel), then neighbouring parts are joined while they fit in one window.
+
+	compiled    : 'CompiledRequest' of the query
+	window_size : largest number of entities in a window
+	max_workers : maximum number of requests made in parallel, default: 'api.max_workers'
+	'''
+	api = compiled.api
+	probe = compiled.variant(class_object=dict, _embed=None, _fields="id,date", page=None, offset=None, per_page=1, orderby="date")
+
+	def count(start, stop):
+		records, total = probe.execute(with_total=True, **window_parameters(start, stop))
+		return total or 0
+
+	(newest, total), (oldest, _) = api.run_concurrently([functools.partial(probe.execute, with_total=True, order=order)
+														 for order in ["desc", "asc"]])
+	if len(newest) == 0 or len(oldest) == 0:
+		return list()
+	windows = [(record_date(oldest[0]), record_date(newest[0]) + one_second, total or 0)]
+
+	while True:
+		oversized = [w for w in windows if w[2] > window_size and w[1] - w[0] > one_second]
+		if len(oversized) == 0:
+			break
+		parts = dict() # key = oversized window, value = its two halves
+		for start, stop, n in oversized:
+			middle = start + timedelta(seconds=int((stop - start).total_seconds()) // 2)
+			parts[(start, stop, n)] = [(start, middle), (middle, stop)]
+		halves = [half for window in oversized for half in parts[window]]
+		counts = dict(zip(halves, api.run_concurrently([functools.partial(count, start, stop) for start, stop in halves], max_workers=max_workers)))
+
+		split = list()
+		for window in windows:
+			if window in parts:
+				split.extend(half + (counts[half],) for half in parts[window] if counts[half] > 0)
+			else:
+				split.append(window)
+		windows = split
+
+	# neighbouring windows that fit in one are joined (the dates between them hold no entities)
+	joined = [windows[0]]
+	for start, stop, n in windows[1:]:
+		if joined[-1][2] + n <= window_size:
+			joined[-1] = (joined[-1][0], stop, joined[-1][2] + n)
+		else:
+			joined.append((start, stop, n))
+	return joined
+
+def get_in_windows(compiled, window_size, max_workers=None):
+	'''
+	Returns every entity matching a request, read in date windows (see 'plan_windows'), ordered by date.
+
+	The pages of all the windows are requested in parallel. A window that gained entities since it
+	was counted has its additional pages read afterwards; an entity is returned once even if it moved
+	between windows while they were read.
+
+	compiled    : 'CompiledRequest' of the query; its 'per_page' is used for every page, its 'order' ("desc" by default) for the result
+	window_size : largest number of entities in a window
+	max_workers : maximum number of requests made in parallel, default: 'api.max_workers'
+	'''
+	api = compiled.api
+	windows = plan_windows(compiled, window_size, max_workers=max_workers)
+	if compiled.parameters.get("order", "desc") == "desc":
+		windows.reverse()
+	pages = compiled.variant(orderby="date", offset=None)
+	per_page = int(pages.parameters.get("per_page", 10))
+
+	def read(window_pages):
+		calls = [functools.partial(pages.execute, with_total=True, page=page, **window_parameters(start, stop))
+				 for index, (start, stop, n) in enumerate(windows) for page in window_pages[index]]
+		results = iter(api.run_concurrently(calls, max_workers=max_workers))
+		return [[next(results) for page in window_pages[index]] for index in range(len(windows))]
+
+	planned = [range(1, -(-n // per_page) + 1) for start, stop, n in windows]
+	results = read(planned)
+	totals = [max([n] + [total for entities, total in window_results if total is not None])
+			  for (start, stop, n), window_results in zip(windows, results)]
+	extra = [range(len(p) + 1, -(-total // per_page) + 1) for p, total in zip(planned, totals)]
+	if any(len(e) > 0 for e in extra):
+		logger.debug("Entities were added while reading date windows; reading {0} more pages.".format(sum(len(e) for e in extra)))
+		results = [r + e for r, e in zip(results, read(extra))]
+
+	entities = list()
+	seen = set()
+	for window_results in results:
+		for page_entities, total in window_results:
+			for entity in page_entities:
+				if record_id(entity) not in seen:
+					seen.add(record_id(entity))
+					entities.append(entity)
+	logger.debug("Read {0} entities in {1} date windows.".format(len(entities), len(windows)))
+	return entities